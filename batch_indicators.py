@@ -0,0 +1,69 @@
+# === Batched Indicators (numpy) ===
+# Same math as the scalar helpers in mtf_signals.py, but evaluated for many
+# symbols at once on (n_symbols x n_bars) matrices. Only the latest value of
+# each indicator is produced, which is all the signal pipeline looks at.
+# Rows must share the same bar count; snapshots() groups them for you.
+import numpy as np
+
+def ema_last(closes, period):
+    val = closes[:, :period].mean(axis=1)
+    mult = 2 / (period + 1)
+    for j in range(period, closes.shape[1]):
+        val = (closes[:, j] - val) * mult + val
+    return val
+
+def sma_last(closes, period):
+    return closes[:, -period:].mean(axis=1)
+
+def rsi_first(closes, period=14):
+    # mirrors mtf_signals.rsi: only the first period + 1 prices are used
+    diff = np.diff(closes[:, :period + 1], axis=1)
+    ag = np.clip(diff, 0, None).mean(axis=1)
+    al = np.clip(-diff, 0, None).mean(axis=1)
+    return 100 - 100 / (1 + ag / (al + 1e-10))
+
+def bollinger_last(closes, period=20, sd=2):
+    mid = sma_last(closes, period)
+    std = closes[:, -period:].std(axis=1)
+    return mid + sd * std, mid, mid - sd * std
+
+def atr_last(highs, lows, closes, period=14):
+    h, l, pc = highs[:, 1:], lows[:, 1:], closes[:, :-1]
+    tr = np.maximum(h - l, np.maximum(np.abs(h - pc), np.abs(l - pc)))
+    val = tr[:, :period].mean(axis=1)
+    for j in range(period, tr.shape[1]):
+        val = (val * (period - 1) + tr[:, j]) / period
+    return val
+
+# === SNAPSHOTS ===
+def _snapshot_block(rows):
+    # rows: equal-length [[start, o, h, l, c, v], ...] per symbol
+    m = np.asarray(rows, dtype=float)
+    highs, lows, closes = m[:, :, 2], m[:, :, 3], m[:, :, 4]
+    bb_up, bb_mid, bb_low = bollinger_last(closes)
+    cols = {
+        'close': closes[:, -1],
+        'ema9': ema_last(closes, 9),
+        'ema21': ema_last(closes, 21),
+        'sma20': sma_last(closes, 20),
+        'rsi': rsi_first(closes),
+        'macd': ema_last(closes, 12) - ema_last(closes, 26),
+        'bb_up': bb_up,
+        'bb_mid': bb_mid,
+        'bb_low': bb_low,
+        'atr': atr_last(highs, lows, closes),
+        'volume': m[:, -1, 5],
+    }
+    cols = {k: v.tolist() for k, v in cols.items()}
+    return [{k: cols[k][i] for k in cols} for i in range(len(rows))]
+
+def snapshots(series, min_bars=30):
+    # series: {symbol: kline rows, oldest first} -> {symbol: tf_snapshot-style dict}
+    groups = {}
+    for sym, rows in series.items():
+        if len(rows) >= min_bars:
+            groups.setdefault(len(rows), []).append(sym)
+    out = {}
+    for syms in groups.values():
+        out.update(zip(syms, _snapshot_block([series[s] for s in syms])))
+    return out
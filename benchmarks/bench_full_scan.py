@@ -0,0 +1,67 @@
+# === Full-universe Scan Benchmark ===
+# Scaling curve of full_scan.scan_venue against symbol count. The venue is
+# replaced by an in-process fake that sleeps LATENCY seconds per request and
+# serves random-walk klines, so the numbers show the scan's own overhead plus
+# network-bound concurrency, not exchange speed.
+#   python benchmarks/bench_full_scan.py [latency_s] [out.json]
+import json
+import os
+import random
+import sys
+from time import sleep, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import full_scan
+from candle_store import INTERVAL_MS
+from exchanges import VENUES
+
+SIZES = [50, 100, 200, 400, 800]
+LATENCY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.08
+VENUE = "Bybit"
+
+def fake_venue(n):
+    symbols = [f"SYM{i}USDT" for i in range(n)]
+
+    def universe(session, limit=None):
+        sleep(LATENCY)
+        return symbols[:limit]
+
+    def klines(session, symbol, tf, limit=200):
+        sleep(LATENCY)
+        rng = random.Random(f"{symbol}{tf}")
+        step = INTERVAL_MS[tf]
+        start = int(time() * 1000) // step * step - (limit - 1) * step
+        price, rows = 100.0, []
+        for i in range(limit):
+            o = price
+            price *= 1 + rng.gauss(0, 0.01)
+            rows.append([start + i * step, o, max(o, price) * 1.002, min(o, price) * 0.998, price, rng.uniform(500, 5000)])
+        return rows
+
+    return {"universe": universe, "klines": klines}
+
+def run():
+    original = VENUES[VENUE]
+    results = []
+    try:
+        for n in SIZES:
+            VENUES[VENUE] = fake_venue(n)
+            full_scan._cache = full_scan.CandleCache()
+            _, symbols, signals, cold = full_scan.scan_venue(VENUE)
+            _, _, _, warm = full_scan.scan_venue(VENUE)
+            results.append({"symbols": n, "cold_s": round(cold, 2), "warm_s": round(warm, 2),
+                            "warm_symbols_per_s": round(n / warm, 1), "signals": len(signals)})
+    finally:
+        VENUES[VENUE] = original
+
+    print(f"\nlatency {LATENCY * 1000:.0f} ms/request, {full_scan.WORKERS} workers, {len(full_scan.INTERVALS)} timeframes")
+    print(f"{'symbols':>8} {'cold s':>8} {'warm s':>8} {'sym/s':>8} {'signals':>8}")
+    for r in results:
+        print(f"{r['symbols']:>8} {r['cold_s']:>8} {r['warm_s']:>8} {r['warm_symbols_per_s']:>8} {r['signals']:>8}")
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as f:
+            json.dump({"latency": LATENCY, "workers": full_scan.WORKERS, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+# === Indicator Micro-benchmarks ===
+# Times every bot's own ema / sma / RSI / Bollinger / MACD / ATR at growing
+# series lengths. The list-based bots call them compute_rsi,
+# calculate_bollinger_bands, calculate_macd and calculate_atr; the
+# multi-timeframe bots call them rsi, bollinger, macd and atr. Results are
+# keyed by the list-based names so both families line up.
+import random
+from time import perf_counter
+
+from bots import BOTS, load_bot
+
+SIZES = [200, 10_000, 1_000_000]
+MIN_SECONDS = 0.2     # repeat fast calls until this much time was spent
+MAX_SECONDS = 30      # skip a size whose extrapolated single run exceeds this
+
+INDICATORS = {
+    "ema": (("ema",), lambda f, d: f(d["close"], 21)),
+    "sma": (("sma",), lambda f, d: f(d["close"], 20)),
+    "compute_rsi": (("compute_rsi", "rsi"), lambda f, d: f(d["close"])),
+    "calculate_bollinger_bands": (("calculate_bollinger_bands", "bollinger"), lambda f, d: f(d["close"])),
+    "calculate_macd": (("calculate_macd", "macd"), lambda f, d: f(d["close"])),
+    "calculate_atr": (("calculate_atr", "atr"), lambda f, d: f(d["high"], d["low"], d["close"])),
+}
+
+def series(n, seed=1):
+    rng = random.Random(seed)
+    price, close, high, low = 100.0, [], [], []
+    for _ in range(n):
+        o = price
+        price *= 1 + rng.gauss(0, 0.01)
+        close.append(price)
+        high.append(max(o, price) * 1.002)
+        low.append(min(o, price) * 0.998)
+    return {"close": close, "high": high, "low": low}
+
+def time_call(call):
+    best, spent, runs = float("inf"), 0.0, 0
+    while spent < MIN_SECONDS or runs < 3:
+        t0 = perf_counter()
+        call()
+        dt = perf_counter() - t0
+        best, spent, runs = min(best, dt), spent + dt, runs + 1
+        if dt > MIN_SECONDS:
+            break
+    return best
+
+def run(sizes=SIZES, bots=None, log=print):
+    data = {n: series(n) for n in sizes}
+    results = {}
+    for name in bots or BOTS:
+        mod = load_bot(name)
+        for key, (aliases, call) in INDICATORS.items():
+            fn = next((getattr(mod, a) for a in aliases if hasattr(mod, a)), None)
+            if fn is None:
+                continue
+            prev_n = prev_t = None
+            for n in sizes:
+                if prev_t is not None and prev_t * n / prev_n > MAX_SECONDS:
+                    results[f"{name}:{key}:{n}"] = None
+                    continue
+                prev_n, prev_t = n, time_call(lambda: call(fn, data[n]))
+                results[f"{name}:{key}:{n}"] = round(prev_t, 9)
+                log(f"  {name:<20} {key:<27} {n:>9} bars  {prev_t * 1000:>10.3f} ms")
+    return results
+
+if __name__ == "__main__":
+    import sys
+    run([int(x) for x in sys.argv[1].split(",")] if len(sys.argv) > 1 else SIZES)
@@ -0,0 +1,104 @@
+# === Multiprocess Indicator Benchmark ===
+# Indicator + signal pass of parallel_scan.py against the in-process batch
+# pass full_scan.py uses, on random-walk candles (no network involved):
+#   scan          one full-universe cycle, N symbols x 3 timeframes x 200 bars
+#   walk-forward  every 1h bar of a multi-month history, backtest style
+# Each process count must reproduce the in-process signals exactly.
+#   python benchmarks/bench_parallel.py [symbols] [out.json]
+import json
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_indicators
+import mtf_signals
+import parallel_scan
+from candle_store import INTERVAL_MS
+
+INTERVALS = ['15m', '1h', '4h']
+MAIN_TF = '1h'
+SYMBOLS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+BARS = 200
+HISTORY_SYMBOLS = 40
+HISTORY_HOURS = 24 * 60
+END_MS = 1_760_000_000_000 // INTERVAL_MS['4h'] * INTERVAL_MS['4h']
+
+def klines(symbol, tf, bars):
+    rng = random.Random(f"{symbol}{tf}")
+    step = INTERVAL_MS[tf]
+    start = END_MS - bars * step
+    price, rows = 100.0, []
+    for i in range(bars):
+        o = price
+        price *= 1 + rng.gauss(0, 0.01)
+        rows.append([start + i * step, o, max(o, price) * 1.002, min(o, price) * 0.998, price, rng.uniform(500, 5000)])
+    return rows
+
+def universe(n, hours=None):
+    bars = {tf: BARS if hours is None else hours * INTERVAL_MS['1h'] // INTERVAL_MS[tf] for tf in INTERVALS}
+    return {f"SYM{i}USDT": {tf: klines(f"SYM{i}USDT", tf, bars[tf]) for tf in INTERVALS} for i in range(n)}
+
+def in_process(series):
+    # the full_scan.py path
+    snaps = {tf: batch_indicators.snapshots({s: f[tf] for s, f in series.items()}) for tf in INTERVALS}
+    out = []
+    for sym in series:
+        sig = mtf_signals.evaluate_snapshots(sym, {tf: snaps[tf][sym] for tf in INTERVALS}, MAIN_TF)
+        if sig:
+            out.append(sig)
+    return out
+
+def same(a, b):
+    strip = lambda sigs: [{k: v for k, v in s.items() if k != 'Time'} for s in sigs]
+    return strip(a) == strip(b)
+
+def timed(fn):
+    started = perf_counter()
+    out = fn()
+    return out, perf_counter() - started
+
+def warm(n):
+    # pool start-up is paid once per run, not per cycle
+    if n > 1:
+        parallel_scan.pool(n).submit(int).result()
+
+def run():
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores} | ({cores // 2} if cores > 4 else set()))
+    results = {"cores": cores, "scan": [], "walk_forward": []}
+
+    series = universe(SYMBOLS)
+    baseline, base_s = timed(lambda: in_process(series))
+    print(f"\n🧮 scan: {SYMBOLS} symbols x {len(INTERVALS)} timeframes x {BARS} bars, {cores} core(s)")
+    print(f"{'procs':>6} {'seconds':>8} {'speedup':>8} {'signals':>8} {'match':>6}")
+    print(f"{'inline':>6} {base_s:>8.2f} {1:>8.2f} {len(baseline):>8} {'-':>6}")
+    for n in counts:
+        warm(n)
+        sigs, secs = timed(lambda: parallel_scan.scan(series, INTERVALS, MAIN_TF, n))
+        ok = same(sigs, baseline)
+        print(f"{n:>6} {secs:>8.2f} {base_s / secs:>8.2f} {len(sigs):>8} {'✅' if ok else '❌':>6}")
+        results["scan"].append({"processes": n, "seconds": round(secs, 3), "signals": len(sigs), "match": ok})
+
+    history = universe(HISTORY_SYMBOLS, HISTORY_HOURS)
+    print(f"\n🔁 walk-forward: {HISTORY_SYMBOLS} symbols x {HISTORY_HOURS} 1h bars")
+    print(f"{'procs':>6} {'seconds':>8} {'bars/s':>8} {'signals':>8} {'match':>6}")
+    reference = None
+    for n in counts:
+        warm(n)
+        sigs, secs = timed(lambda: parallel_scan.walk_forward(history, INTERVALS, MAIN_TF, BARS, processes=n))
+        reference = sigs if reference is None else reference
+        ok = same(sigs, reference)
+        rate = HISTORY_SYMBOLS * HISTORY_HOURS / secs
+        print(f"{n:>6} {secs:>8.2f} {rate:>8.0f} {len(sigs):>8} {'✅' if ok else '❌':>6}")
+        results["walk_forward"].append({"processes": n, "seconds": round(secs, 3), "signals": len(sigs), "match": ok})
+    parallel_scan.shutdown()
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,101 @@
+# === Report Sink Benchmark ===
+# Startup and per-scan cost of every report_sinks.py sink, with bybitbot's
+# own PDF layout for the pdf sink:
+#   startup   fresh interpreter: import the bot's report path + first write,
+#             so lazy imports (fpdf, pyarrow) are paid here
+#   per scan  average write of one scan (top 20 signals) over a simulated day
+# Sinks whose optional package is missing are reported as skipped.
+#   python benchmarks/bench_reports.py [scans] [out.json]
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from bots import ROOT, load_bot
+
+KINDS = ["jsonl", "csv", "parquet", "html", "pdf"]
+SCANS = int(sys.argv[1]) if len(sys.argv) > 1 else 96
+SIGNALS = 20
+
+def signals(n, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        entry = rng.uniform(0.01, 100)
+        side = rng.choice(["LONG", "SHORT"])
+        out.append({"Symbol": f"SYM{i}USDT", "Side": side, "Type": rng.choice(["Trend", "Swing"]),
+                    "Score": round(rng.uniform(40, 100), 1), "Entry": round(entry, 6),
+                    "TP": round(entry * 1.02, 6), "SL": round(entry * 0.99, 6), "Trail": round(entry * 0.998, 6),
+                    "Margin": "20x", "Market": "Bybit", "Liq": round(entry * 0.95, 6), "BB Slope": "Up",
+                    "RSI": round(rng.uniform(20, 80), 2), "MACD": round(rng.gauss(0, 1), 4),
+                    "Time": "2026-01-01 00:00 UTC+3", "trend_info": {"1h": "bullish", "4h": "neutral"}})
+    return out
+
+STARTUP = """
+import sys, time
+t = time.perf_counter()
+sys.path[:0] = [{root!r}, {bench!r}]
+from bots import load_bot
+import report_sinks
+bot = load_bot("bybitbot.py")
+r = report_sinks.ReportSinks("bench", layout=bot.signal_pdf, render=lambda pdf, s: pdf.add_signals(s), kinds=[{kind!r}])
+ok = bool(r.write({sigs!r}))
+print(time.perf_counter() - t if ok else -1)
+"""
+
+def startup(kind, workdir):
+    code = STARTUP.format(root=ROOT, bench=os.path.dirname(os.path.abspath(__file__)), kind=kind, sigs=signals(SIGNALS))
+    out = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True)
+    lines = out.stdout.strip().splitlines()
+    secs = float(lines[-1]) if lines else -1
+    return secs if secs >= 0 else None
+
+def per_scan(kind, bot, workdir):
+    import report_sinks
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        r = report_sinks.ReportSinks("bench", layout=bot.signal_pdf, render=lambda pdf, s: pdf.add_signals(s), kinds=[kind])
+        sigs = signals(SIGNALS)
+        now = datetime(2026, 1, 1)
+        started = perf_counter()
+        for i in range(SCANS):
+            if not r.write(sigs, now + timedelta(minutes=15 * i)):
+                return None, None
+        secs = (perf_counter() - started) / SCANS
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk("reports") for f in fs)
+        return secs, size
+    finally:
+        os.chdir(cwd)
+
+def run():
+    bot = load_bot("bybitbot.py")
+    results = {}
+    print(f"\n🗂️ report sinks: {SCANS} scans x {SIGNALS} signals")
+    print(f"{'sink':>8} {'startup ms':>11} {'per scan ms':>12} {'bytes/scan':>11}")
+    for kind in KINDS:
+        workdir = tempfile.mkdtemp(prefix="report-bench-")
+        try:
+            start = startup(kind, workdir)
+            secs, size = per_scan(kind, bot, workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if start is None or secs is None:
+            print(f"{kind:>8} {'skipped (optional package missing)':>36}")
+            results[kind] = None
+            continue
+        print(f"{kind:>8} {start * 1000:>11.1f} {secs * 1000:>12.2f} {size // SCANS:>11}")
+        results[kind] = {"startup_ms": round(start * 1000, 1), "scan_ms": round(secs * 1000, 3),
+                         "bytes_per_scan": size // SCANS}
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,128 @@
+# === End-to-end Scan Benchmark ===
+# Runs one main() cycle of every bot against the local stand-in serving the
+# fixture file. Each bot gets its own throwaway working directory and state
+# files (PDFs, candles.db, universe / funding / regime caches, dedup and
+# termux cache land there) and freshly imported repo modules, so no variant
+# starts warm from an earlier one's state. The loop is stopped at its first
+# wait for the next candle; anything shorter (per-symbol throttles) is kept,
+# since it is part of what a scan costs.
+import contextlib
+import http.client
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from time import perf_counter
+
+from bots import BOTS, ROOT, load_bot
+import fixtures
+from http_replay import STATE_ENV
+from stand_in import StandIn, redirect
+
+LONG_SLEEP = 60       # sleeps at least this long mean the cycle is over
+
+class _CycleDone(Exception):
+    pass
+
+def _stop_long_sleeps(secs):
+    if secs >= LONG_SLEEP:
+        raise _CycleDone
+    time.sleep(secs)
+
+def _wait(self, countdown=False):
+    raise _CycleDone
+
+def _patch_scheduler():
+    import scheduler
+    scheduler.CandleScheduler.wait = _wait
+    scheduler.CandleScheduler.should_shed = lambda self: False
+
+def _patch_bot(mod, stand_in):
+    if hasattr(mod, "sleep"):
+        mod.sleep = _stop_long_sleeps
+    if hasattr(mod, "_connection"):
+        # termux-bot talks http.client directly; one plain connection per thread
+        local = threading.local()
+        port = stand_in.server_address[1]
+
+        def connection():
+            if getattr(local, "conn", None) is None:
+                local.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            return local.conn
+        mod._connection = connection
+        mod._local = local
+
+def _state_dir():
+    workdir = tempfile.mkdtemp(prefix="scan-bench-")
+    for var, name in STATE_ENV.items():
+        os.environ[var] = os.path.join(workdir, name)
+    os.environ["TERMUX_BOT_CACHE"] = os.path.join(workdir, "termux-cache")
+    os.environ["REPORT_DIR"] = os.path.join(workdir, "reports")
+    os.chdir(workdir)
+    return workdir
+
+def _fresh_modules():
+    # the repo modules read their state paths from the environment at import,
+    # so they are dropped and the bot imports them again
+    for name, m in list(sys.modules.items()):
+        path = getattr(m, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == ROOT:
+            del sys.modules[name]
+
+def run_bot(filename, stand_in, argv=None):
+    _state_dir()
+    _fresh_modules()
+    mod = load_bot(filename, argv)
+    _patch_scheduler()
+    _patch_bot(mod, stand_in)
+    before = sum(stand_in.hits.values())
+    status = "ok"
+    out = io.StringIO()
+    t0 = perf_counter()
+    try:
+        with contextlib.redirect_stdout(out):
+            mod.main()
+    except _CycleDone:
+        pass
+    except Exception as e:
+        status = f"error: {type(e).__name__}: {e}"
+    secs = perf_counter() - t0
+    return {"seconds": round(secs, 3), "requests": sum(stand_in.hits.values()) - before, "status": status}
+
+@contextlib.contextmanager
+def sandbox():
+    # throwaway cwd and state files, no webhooks, no waiting for the next candle;
+    # run_bot then gives every bot a directory of its own
+    for var in ("DISCORD_WEBHOOK_URL", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+        os.environ.pop(var, None)
+    _patch_scheduler()
+    cwd = os.getcwd()
+    try:
+        yield _state_dir()
+    finally:
+        os.chdir(cwd)
+
+def run_all(server, variants, log=print):
+    # server: anything with .url, .server_address and .hits (StandIn, mock_exchange.MockExchange)
+    results = {}
+    with redirect(server.url):
+        for filename, argv in variants:
+            key = filename + (" " + " ".join(argv) if argv else "")
+            results[key] = run_bot(filename, server, argv)
+            r = results[key]
+            log(f"  {key:<26} {r['seconds']:>8.2f}s  {r['requests']:>5} requests  {r['status']}")
+    return results
+
+def run(fixture_path=fixtures.DEFAULT_PATH, bots=None, log=print):
+    fixture = fixtures.ensure(fixture_path)
+    variants = [(b, None) for b in (bots or BOTS)]
+    if bots is None:
+        variants.append(("multi_scanner.py", ["--full"]))
+    with sandbox(), StandIn(fixture) as stand_in:
+        return run_all(stand_in, variants, log)
+
+if __name__ == "__main__":
+    import sys
+    run(bots=sys.argv[1:] or None)
@@ -0,0 +1,38 @@
+# === Bot Loader ===
+# The bot scripts have hyphenated names and run their loops under
+# __main__, so they are loaded by path here without starting anything.
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+BOTS = [
+    "binance-bot.py",
+    "binance-signal.py",
+    "binancebot.py",
+    "bybit-bot-v1.py",
+    "bybit-bot-v2.py",
+    "bybit-bot-v3.py",
+    "bybit-bot-v4.py",
+    "bybit-bot-v5.py",
+    "bybitbot.py",
+    "signal_generator.py",
+    "termux-bot.py",
+    "multi_scanner.py",
+]
+
+def load_bot(filename, argv=None):
+    # argv is what the bot sees at import time (some read flags like --pdf then)
+    name = "bench_" + filename[:-3].replace("-", "_")
+    saved = sys.argv
+    sys.argv = [filename] + list(argv or [])
+    try:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    finally:
+        sys.argv = saved
+    return mod
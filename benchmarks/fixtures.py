@@ -0,0 +1,180 @@
+# === Exchange Fixtures ===
+# One gzip JSON file holding the raw Bybit v5 and Binance USDT-M responses a
+# scan needs: tickers, instruments/exchangeInfo, klines per (symbol, interval)
+# and Bybit orderbooks. Bodies are stored exactly as the exchange sent them;
+# stand_in.py slices klines down to whatever limit a bot asks for.
+#   python benchmarks/fixtures.py record [path] [n_symbols]   # live capture
+#   python benchmarks/fixtures.py synth  [path] [n_symbols]   # offline, seeded
+#   python benchmarks/fixtures.py archive scan.jsonl.gz [path]  # from an http_replay recording
+import gzip
+import json
+import os
+import random
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import http_replay
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(HERE, "fixtures", "exchanges.json.gz")
+N_SYMBOLS = 120       # a little above the bots' 100-symbol caps
+BARS = 200
+BOOK_DEPTH = 50
+BYBIT_INTERVALS = {"15": 15, "60": 60, "240": 240}
+BINANCE_INTERVALS = {"15m": 15, "1h": 60, "4h": 240}
+END_MS = 1760000400000  # fixed 4h-aligned close so synthetic files are byte-stable
+SEED = 7
+
+def load(path=DEFAULT_PATH):
+    with gzip.open(path, "rt") as f:
+        return json.load(f)
+
+def save(fixture, path=DEFAULT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with gzip.GzipFile(path, "wb", mtime=0) as f:
+        f.write(json.dumps(fixture, separators=(",", ":")).encode())
+    return path
+
+def ensure(path=DEFAULT_PATH, n_symbols=N_SYMBOLS):
+    if not os.path.exists(path):
+        save(synthetic(n_symbols), path)
+    return load(path)
+
+# === SYNTHETIC ===
+def _walk(rng, start, minutes, price, vol):
+    rows = []
+    step = minutes * 60000
+    for i in range(BARS):
+        o = price
+        price *= 1 + rng.gauss(0, vol * (minutes / 60) ** 0.5)
+        h = max(o, price) * (1 + abs(rng.gauss(0, vol / 3)))
+        l = min(o, price) * (1 - abs(rng.gauss(0, vol / 3)))
+        rows.append((start + i * step, o, h, l, price, rng.uniform(1e3, 1e6)))
+    return rows
+
+def _fmt(x):
+    return f"{x:.6g}"
+
+def synthetic(n_symbols=N_SYMBOLS, seed=SEED):
+    rng = random.Random(seed)
+    symbols = [f"C{i:04d}USDT" for i in range(n_symbols)]
+    bybit = {"klines": {}, "orderbook": {}}
+    binance = {"klines": {}}
+    by_tickers, bn_tickers, instruments, exchange_info = [], [], [], []
+    for sym in symbols:
+        price = 10 ** rng.uniform(-3, 4)
+        vol = rng.uniform(0.004, 0.02)
+        bybit["klines"][sym], binance["klines"][sym] = {}, {}
+        for (by_tf, minutes), bn_tf in zip(BYBIT_INTERVALS.items(), BINANCE_INTERVALS):
+            rows = _walk(rng, END_MS - BARS * minutes * 60000, minutes, price, vol)
+            bybit["klines"][sym][by_tf] = [[str(t), _fmt(o), _fmt(h), _fmt(l), _fmt(c), _fmt(v), _fmt(v * c)]
+                                           for t, o, h, l, c, v in reversed(rows)]
+            binance["klines"][sym][bn_tf] = [[t, _fmt(o), _fmt(h), _fmt(l), _fmt(c), _fmt(v), t + minutes * 60000 - 1,
+                                              _fmt(v * c), 100, _fmt(v / 2), _fmt(v * c / 2), "0"]
+                                             for t, o, h, l, c, v in rows]
+        last = rows[-1][4]
+        high, low = max(r[2] for r in rows[-6:]), min(r[3] for r in rows[-6:])
+        turnover = rng.uniform(1e5, 1e9)
+        bybit["orderbook"][sym] = {"retCode": 0, "retMsg": "OK", "result": {
+            "s": sym,
+            "b": [[_fmt(last * (1 - 0.0005 * (i + 1))), _fmt(rng.uniform(1, 1000))] for i in range(BOOK_DEPTH)],
+            "a": [[_fmt(last * (1 + 0.0005 * (i + 1))), _fmt(rng.uniform(1, 1000))] for i in range(BOOK_DEPTH)],
+            "ts": END_MS, "u": 1}}
+        by_tickers.append({"symbol": sym, "lastPrice": _fmt(last), "highPrice24h": _fmt(high),
+                           "lowPrice24h": _fmt(low), "turnover24h": _fmt(turnover),
+                           "volume24h": _fmt(turnover / last), "price24hPcnt": _fmt(last / rows[-7][4] - 1),
+                           "fundingRate": _fmt(rng.gauss(0, 1e-4)), "openInterest": _fmt(rng.uniform(1e3, 1e7))})
+        bn_tickers.append({"symbol": sym, "lastPrice": _fmt(last), "highPrice": _fmt(high), "lowPrice": _fmt(low),
+                           "quoteVolume": _fmt(turnover), "volume": _fmt(turnover / last),
+                           "priceChangePercent": _fmt((last / rows[-7][4] - 1) * 100)})
+        instruments.append({"symbol": sym, "contractType": "LinearPerpetual", "status": "Trading",
+                            "baseCoin": sym[:-4], "quoteCoin": "USDT",
+                            "priceFilter": {"tickSize": "0.0001"}, "lotSizeFilter": {"qtyStep": "0.001"}})
+        exchange_info.append({"symbol": sym, "contractType": "PERPETUAL", "status": "TRADING",
+                              "baseAsset": sym[:-4], "quoteAsset": "USDT"})
+    bybit["tickers"] = {"retCode": 0, "retMsg": "OK", "result": {"category": "linear", "list": by_tickers}}
+    bybit["instruments"] = {"retCode": 0, "retMsg": "OK", "result": {"category": "linear", "list": instruments,
+                                                                     "nextPageCursor": ""}}
+    binance["ticker24hr"] = bn_tickers
+    binance["exchangeInfo"] = {"timezone": "UTC", "serverTime": END_MS, "symbols": exchange_info}
+    return {"meta": {"source": "synthetic", "seed": seed, "symbols": n_symbols, "bars": BARS},
+            "bybit": bybit, "binance": binance}
+
+# === LIVE CAPTURE ===
+def record(n_symbols=N_SYMBOLS):
+    s = requests.Session()
+    get = lambda url: s.get(url, timeout=10).json()
+    bybit = {"tickers": get("https://api.bybit.com/v5/market/tickers?category=linear"),
+             "instruments": get("https://api.bybit.com/v5/market/instruments-info?category=linear&limit=1000"),
+             "klines": {}, "orderbook": {}}
+    tickers = [t for t in bybit["tickers"]["result"]["list"] if t["symbol"].endswith("USDT")]
+    tickers.sort(key=lambda t: float(t["turnover24h"]), reverse=True)
+    for t in tickers[:n_symbols]:
+        sym = t["symbol"]
+        bybit["klines"][sym] = {tf: get(f"https://api.bybit.com/v5/market/kline?category=linear&symbol={sym}"
+                                        f"&interval={tf}&limit={BARS}")["result"]["list"] for tf in BYBIT_INTERVALS}
+        bybit["orderbook"][sym] = get(f"https://api.bybit.com/v5/market/orderbook?category=linear&symbol={sym}&limit={BOOK_DEPTH}")
+    keep = set(bybit["klines"])
+    bybit["instruments"]["result"]["list"] = [i for i in bybit["instruments"]["result"]["list"] if i["symbol"] in keep]
+
+    binance = {"ticker24hr": get("https://fapi.binance.com/fapi/v1/ticker/24hr"),
+               "exchangeInfo": get("https://fapi.binance.com/fapi/v1/exchangeInfo"), "klines": {}}
+    tickers = sorted((t for t in binance["ticker24hr"] if t["symbol"].endswith("USDT")),
+                     key=lambda t: float(t["quoteVolume"]), reverse=True)
+    for t in tickers[:n_symbols]:
+        sym = t["symbol"]
+        binance["klines"][sym] = {tf: get(f"https://fapi.binance.com/fapi/v1/klines?symbol={sym}&interval={tf}&limit={BARS}")
+                                  for tf in BINANCE_INTERVALS}
+    keep = set(binance["klines"])
+    binance["exchangeInfo"]["symbols"] = [i for i in binance["exchangeInfo"]["symbols"] if i["symbol"] in keep]
+    return {"meta": {"source": "recorded", "symbols": n_symbols, "bars": BARS}, "bybit": bybit, "binance": binance}
+
+# === FROM A RECORDED SCAN ===
+def from_archive(archive):
+    # the longest kline response per (symbol, interval) wins, so later stand-in slices can serve any limit
+    bybit = {"tickers": {"retCode": 0, "result": {"list": []}}, "instruments": {"retCode": 0, "result": {"list": []}},
+             "klines": {}, "orderbook": {}}
+    binance = {"ticker24hr": [], "exchangeInfo": {"symbols": []}, "klines": {}}
+    _, entries = http_replay.load(archive)
+    for e in entries:
+        if e["method"] != "GET" or e["status"] != 200:
+            continue
+        url = urlsplit(e["url"])
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        body = json.loads(http_replay.content(e))
+        if url.path == "/v5/market/kline" and body.get("retCode") == 0:
+            rows = body["result"]["list"]
+            slot = bybit["klines"].setdefault(q["symbol"], {})
+            if len(rows) > len(slot.get(q["interval"], [])):
+                slot[q["interval"]] = rows
+        elif url.path == "/v5/market/tickers" and "symbol" not in q:
+            bybit["tickers"] = body
+        elif url.path == "/v5/market/orderbook":
+            bybit["orderbook"][q["symbol"]] = body
+        elif url.path == "/v5/market/instruments-info":
+            bybit["instruments"] = body
+        elif url.path == "/fapi/v1/klines":
+            slot = binance["klines"].setdefault(q["symbol"], {})
+            if len(body) > len(slot.get(q["interval"], [])):
+                slot[q["interval"]] = body
+        elif url.path == "/fapi/v1/ticker/24hr" and "symbol" not in q:
+            binance["ticker24hr"] = body
+        elif url.path == "/fapi/v1/exchangeInfo":
+            binance["exchangeInfo"] = body
+    return {"meta": {"source": "archive", "archive": os.path.basename(archive),
+                     "symbols": len(bybit["klines"]) + len(binance["klines"])},
+            "bybit": bybit, "binance": binance}
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "synth"
+    if mode == "archive":
+        path = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_PATH
+        print(f"💾 fixture from {sys.argv[2]} written to {save(from_archive(sys.argv[2]), path)}")
+        sys.exit()
+    path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    n = int(sys.argv[3]) if len(sys.argv) > 3 else N_SYMBOLS
+    fixture = record(n) if mode == "record" else synthetic(n)
+    print(f"💾 {mode} fixture with {n} symbols written to {save(fixture, path)}")
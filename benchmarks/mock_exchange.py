@@ -0,0 +1,370 @@
+# === Mock Exchange Server ===
+# Local stand-in for the Bybit v5 and Binance fapi market endpoints the bots
+# use, backed by synthetic random-walk markets instead of a fixture file, so
+# universes of any size (10k+ symbols) can be served. Latency, error rate and
+# rate limits are configurable:
+#   - latency: base + uniform jitter per request
+#   - errors: a share of requests answered 502/503
+#   - Binance: request weight per minute, X-MBX-USED-WEIGHT-1M on every
+#     response, 429 + Retry-After once the budget is spent
+#   - Bybit: requests per fixed window, X-Bapi-Limit-Status headers,
+#     403 "access too frequent" once exceeded
+# Which requests fail and how long each one takes is a hash of the seed, the
+# URL and how often that URL was asked for, so runs reproduce regardless of
+# thread scheduling.
+#   python benchmarks/mock_exchange.py serve --symbols 10000 --latency 0.05
+#   python benchmarks/mock_exchange.py bench bybitbot.py --symbols 2000 --error-rate 0.02
+import argparse
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep, time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+HISTORY = 250         # bars kept per (symbol, interval); larger limits are clamped
+BYBIT_MINUTES = {"1": 1, "3": 3, "5": 5, "15": 15, "30": 30, "60": 60, "120": 120, "240": 240, "360": 360,
+                 "720": 720, "D": 1440}
+BINANCE_MINUTES = {"1m": 1, "3m": 3, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "2h": 120, "4h": 240, "6h": 360,
+                   "12h": 720, "1d": 1440}
+BOOK_STEP = 0.0005
+
+def _unit(*parts):
+    # deterministic 0..1 from any key
+    return zlib.crc32("|".join(map(str, parts)).encode()) / 2 ** 32
+
+def binance_kline_weight(limit):
+    return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+
+# === MARKET ===
+class Market:
+    def __init__(self, n_symbols=500, seed=1):
+        self.seed = seed
+        self.symbols = [f"M{i:05d}USDT" for i in range(n_symbols)]
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def params(self, symbol):
+        # start price spread over 1e-3..1e4, hourly vol 0.4%..2%, 24h turnover 1e5..1e9
+        u = _unit(self.seed, symbol)
+        return {"price": 10 ** (-3 + 7 * u), "vol": 0.004 + 0.016 * _unit(self.seed, symbol, "vol"),
+                "turnover": 10 ** (5 + 4 * _unit(self.seed, symbol, "turnover"))}
+
+    def bars(self, symbol, minutes, limit, now=None):
+        # -> [(start_ms, o, h, l, c, v)], oldest first, the last one still open
+        step = minutes * 60000
+        current = int((now or time()) * 1000) // step
+        key = (symbol, minutes)
+        with self._lock:
+            s = self.series.get(key)
+            if s is None:
+                p = self.params(symbol)
+                rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), minutes])
+                s = self.series[key] = {"rng": rng, "end": current - HISTORY, "vol": p["vol"] * (minutes / 60) ** 0.5,
+                                        "close": np.empty(0, np.float32), "wick": np.empty(0, np.float32),
+                                        "volume": np.empty(0, np.float32), "last": p["price"]}
+            grow = min(current - s["end"], HISTORY)
+            if grow > 0:
+                rng = s["rng"]
+                closes = s["last"] * np.exp(np.cumsum(rng.normal(0, s["vol"], grow)))
+                s["close"] = np.concatenate([s["close"], closes.astype(np.float32)])[-HISTORY - 1:]
+                s["wick"] = np.concatenate([s["wick"], np.abs(rng.normal(0, s["vol"] / 3, grow)).astype(np.float32)])[-HISTORY - 1:]
+                s["volume"] = np.concatenate([s["volume"], rng.uniform(1e3, 1e6, grow).astype(np.float32)])[-HISTORY - 1:]
+                s["last"], s["end"] = float(closes[-1]), current
+            close, wick, volume = s["close"].tolist(), s["wick"].tolist(), s["volume"].tolist()
+        last = len(close) - 1
+        out = []
+        for i in range(last - min(limit, last) + 1, last + 1):
+            o, c = close[i - 1], close[i]
+            out.append(((current - last + i) * step, o, max(o, c) * (1 + wick[i]), min(o, c) * (1 - wick[i]), c, volume[i]))
+        return out
+
+    def ticker(self, symbol):
+        p = self.params(symbol)
+        last = self.series.get((symbol, 60), {}).get("last", p["price"])
+        span = p["vol"] * 24 ** 0.5
+        return {"last": last, "high": last * (1 + span), "low": last * (1 - span), "turnover": p["turnover"]}
+
+def _fmt(x):
+    return f"{x:.6g}"
+
+# === ROUTES ===
+def bybit_kline(ex, q):
+    minutes = BYBIT_MINUTES.get(q.get("interval"))
+    if q.get("symbol") not in ex.market.index or minutes is None:
+        return 200, {"retCode": 10001, "retMsg": "params error", "result": {}}
+    rows = ex.market.bars(q["symbol"], minutes, min(int(q.get("limit", 200)), 1000))
+    lst = [[str(t), _fmt(o), _fmt(h), _fmt(l), _fmt(c), _fmt(v), _fmt(v * c)] for t, o, h, l, c, v in reversed(rows)]
+    return 200, {"retCode": 0, "retMsg": "OK", "result": {"category": "linear", "symbol": q["symbol"], "list": lst}}
+
+def bybit_tickers(ex, q):
+    syms = [q["symbol"]] if "symbol" in q else ex.market.symbols
+    lst = []
+    for s in syms:
+        if s not in ex.market.index:
+            continue
+        t = ex.market.ticker(s)
+        lst.append({"symbol": s, "lastPrice": _fmt(t["last"]), "highPrice24h": _fmt(t["high"]),
+                    "lowPrice24h": _fmt(t["low"]), "turnover24h": _fmt(t["turnover"]),
+                    "volume24h": _fmt(t["turnover"] / t["last"]), "price24hPcnt": "0",
+                    "fundingRate": _fmt((_unit(ex.market.seed, s, "funding") - 0.5) * 2e-4),
+                    "openInterest": _fmt(t["turnover"] / t["last"] / 10)})
+    return 200, {"retCode": 0, "retMsg": "OK", "result": {"category": "linear", "list": lst}}
+
+def bybit_orderbook(ex, q):
+    if q.get("symbol") not in ex.market.index:
+        return 200, {"retCode": 10001, "retMsg": "params error", "result": {}}
+    last, n = ex.market.ticker(q["symbol"])["last"], min(int(q.get("limit", 25)), 500)
+    size = lambda side, i: _fmt(1 + 999 * _unit(ex.market.seed, q["symbol"], side, i))
+    return 200, {"retCode": 0, "retMsg": "OK", "result": {
+        "s": q["symbol"],
+        "b": [[_fmt(last * (1 - BOOK_STEP * (i + 1))), size("b", i)] for i in range(n)],
+        "a": [[_fmt(last * (1 + BOOK_STEP * (i + 1))), size("a", i)] for i in range(n)],
+        "ts": int(time() * 1000), "u": 1}}
+
+def bybit_instruments(ex, q):
+    # cursor pagination like the real endpoint: default 500, max 1000 per page
+    limit = min(int(q.get("limit", 500)), 1000)
+    start = int(q.get("cursor") or 0)
+    page = ex.market.symbols[start:start + limit]
+    cursor = str(start + limit) if start + limit < len(ex.market.symbols) else ""
+    lst = [{"symbol": s, "contractType": "LinearPerpetual", "status": "Trading", "baseCoin": s[:-4],
+            "quoteCoin": "USDT", "priceFilter": {"tickSize": "0.0001"},
+            "lotSizeFilter": {"qtyStep": "0.001", "minOrderQty": "0.001"}} for s in page]
+    return 200, {"retCode": 0, "retMsg": "OK", "result": {"category": "linear", "list": lst, "nextPageCursor": cursor}}
+
+def binance_klines(ex, q):
+    minutes = BINANCE_MINUTES.get(q.get("interval"))
+    if q.get("symbol") not in ex.market.index or minutes is None:
+        return 400, {"code": -1121, "msg": "Invalid symbol."}
+    rows = ex.market.bars(q["symbol"], minutes, min(int(q.get("limit", 500)), 1500))
+    step = minutes * 60000
+    return 200, [[t, _fmt(o), _fmt(h), _fmt(l), _fmt(c), _fmt(v), t + step - 1, _fmt(v * c), 100,
+                  _fmt(v / 2), _fmt(v * c / 2), "0"] for t, o, h, l, c, v in rows]
+
+def binance_ticker(ex, q):
+    out = []
+    for s in ([q["symbol"]] if "symbol" in q else ex.market.symbols):
+        if s not in ex.market.index:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}
+        t = ex.market.ticker(s)
+        out.append({"symbol": s, "lastPrice": _fmt(t["last"]), "highPrice": _fmt(t["high"]), "lowPrice": _fmt(t["low"]),
+                    "quoteVolume": _fmt(t["turnover"]), "volume": _fmt(t["turnover"] / t["last"]),
+                    "priceChangePercent": "0"})
+    return 200, out[0] if "symbol" in q else out
+
+def binance_premium_index(ex, q):
+    out = []
+    funding_ms = 8 * 3600 * 1000
+    for s in ([q["symbol"]] if "symbol" in q else ex.market.symbols):
+        if s not in ex.market.index:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}
+        last = ex.market.ticker(s)["last"]
+        out.append({"symbol": s, "markPrice": _fmt(last), "indexPrice": _fmt(last),
+                    "lastFundingRate": _fmt((_unit(ex.market.seed, s, "funding") - 0.5) * 2e-4),
+                    "nextFundingTime": (int(time() * 1000) // funding_ms + 1) * funding_ms,
+                    "time": int(time() * 1000)})
+    return 200, out[0] if "symbol" in q else out
+
+def binance_exchange_info(ex, q):
+    return 200, {"timezone": "UTC", "serverTime": int(time() * 1000), "symbols": [
+        {"symbol": s, "contractType": "PERPETUAL", "status": "TRADING", "baseAsset": s[:-4], "quoteAsset": "USDT",
+         "filters": [{"filterType": "PRICE_FILTER", "tickSize": "0.0001"},
+                     {"filterType": "LOT_SIZE", "stepSize": "0.001", "minQty": "0.001"},
+                     {"filterType": "MIN_NOTIONAL", "notional": "5"}]} for s in ex.market.symbols]}
+
+# path -> (handler, venue, weight(query))
+ROUTES = {
+    "/v5/market/kline": (bybit_kline, "bybit", None),
+    "/v5/market/tickers": (bybit_tickers, "bybit", None),
+    "/v5/market/orderbook": (bybit_orderbook, "bybit", None),
+    "/v5/market/instruments-info": (bybit_instruments, "bybit", None),
+    "/fapi/v1/klines": (binance_klines, "binance", lambda q: binance_kline_weight(int(q.get("limit", 500)))),
+    "/fapi/v1/ticker/24hr": (binance_ticker, "binance", lambda q: 1 if "symbol" in q else 40),
+    "/fapi/v1/exchangeInfo": (binance_exchange_info, "binance", lambda q: 1),
+    "/fapi/v1/premiumIndex": (binance_premium_index, "binance", lambda q: 1 if "symbol" in q else 10),
+}
+
+# === RATE LIMITS ===
+class BinanceWeight:
+    def __init__(self, per_minute=2400):
+        self.per_minute = per_minute
+        self.minute = None
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self, weight, now):
+        # -> (allowed, used, retry_after_s)
+        with self._lock:
+            minute = int(now // 60)
+            if minute != self.minute:
+                self.minute, self.used = minute, 0
+            if self.used + weight > self.per_minute:
+                return False, self.used, 60 - now % 60
+            self.used += weight
+            return True, self.used, 0
+
+class BybitWindow:
+    def __init__(self, limit=600, window=5):
+        self.limit = limit
+        self.window = window
+        self.start = None
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def spend(self, now):
+        # -> (allowed, remaining, reset_ms)
+        with self._lock:
+            if self.start is None or now - self.start >= self.window:
+                self.start, self.count = now, 0
+            reset = int((self.start + self.window) * 1000)
+            if self.count >= self.limit:
+                return False, 0, reset
+            self.count += 1
+            return True, self.limit - self.count, reset
+
+# === SERVER ===
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        data = body if isinstance(body, bytes) else json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(self.path.split("?")[0], status)
+
+    def do_GET(self):
+        ex = self.server
+        url = urlsplit(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        route = ROUTES.get(url.path)
+        if route is None:
+            return self._send(404, {"code": -1, "msg": f"mock exchange has no {url.path}"})
+        handler, venue, weight = route
+        nth = ex.nth(self.path)
+        delay = ex.latency + ex.jitter * _unit(ex.market.seed, self.path, nth, "latency")
+        if delay:
+            sleep(delay)
+        now = time()
+
+        headers = []
+        if venue == "binance":
+            ok, used, retry = ex.binance.spend(weight(q), now)
+            headers.append(("X-MBX-USED-WEIGHT-1M", str(used)))
+            if not ok:
+                return self._send(429, {"code": -1003, "msg": "Too many requests; current limit of IP is "
+                                        f"{ex.binance.per_minute} requests per minute."},
+                                  headers + [("Retry-After", str(int(retry) + 1))])
+        else:
+            ok, remaining, reset = ex.bybit.spend(now)
+            headers += [("X-Bapi-Limit", str(ex.bybit.limit)), ("X-Bapi-Limit-Status", str(remaining)),
+                        ("X-Bapi-Limit-Reset-Timestamp", str(reset))]
+            if not ok:
+                return self._send(403, b"access too frequent", headers)
+
+        if _unit(ex.market.seed, self.path, nth, "error") < ex.error_rate:
+            status = 502 if _unit(ex.market.seed, self.path, nth, "kind") < 0.5 else 503
+            return self._send(status, b"<html><body>upstream unavailable</body></html>", headers)
+        status, body = handler(ex, q)
+        self._send(status, body, headers)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(200, {"ok": True})
+
+class MockExchange(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, symbols=500, latency=0.0, jitter=0.0, error_rate=0.0, binance_weight=2400,
+                 bybit_limit=600, bybit_window=5, seed=1, port=0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.market = Market(symbols, seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.binance = BinanceWeight(binance_weight)
+        self.bybit = BybitWindow(bybit_limit, bybit_window)
+        self.hits = {}
+        self.statuses = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def nth(self, path):
+        with self._lock:
+            n = self._seen[path] = self._seen.get(path, 0) + 1
+            return n
+
+    def count(self, path, status):
+        with self._lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Local Bybit v5 / Binance fapi mock for load and latency tests")
+    ap.add_argument("mode", choices=["serve", "bench"])
+    ap.add_argument("bots", nargs="*", help="bench: bot scripts to run one cycle of (default: all)")
+    ap.add_argument("--symbols", type=int, default=500)
+    ap.add_argument("--latency", type=float, default=0.0, help="base seconds per request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra uniform 0..jitter seconds")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of 502/503 answers")
+    ap.add_argument("--binance-weight", type=int, default=2400, help="request weight per minute")
+    ap.add_argument("--bybit-limit", type=int, default=600, help="requests per --bybit-window seconds")
+    ap.add_argument("--bybit-window", type=float, default=5)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--port", type=int, default=0)
+    ap.add_argument("--json", help="bench: write results here")
+    args = ap.parse_args()
+
+    ex = MockExchange(args.symbols, args.latency, args.jitter, args.error_rate, args.binance_weight,
+                      args.bybit_limit, args.bybit_window, args.seed, args.port)
+    if args.mode == "serve":
+        print(f"🧪 Mock exchange with {args.symbols} symbols on {ex.url} (Ctrl+C to stop)")
+        print(f"   point bots at it with benchmarks.stand_in.redirect('{ex.url}')")
+        try:
+            ex.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    import bench_scan
+    from bots import BOTS
+    with bench_scan.sandbox(), ex:
+        results = {}
+        for bot in args.bots or BOTS:
+            before = dict(ex.statuses)
+            r = bench_scan.run_all(ex, [(bot, None)], log=lambda *a: None)[bot]
+            codes = {k: v - before.get(k, 0) for k, v in ex.statuses.items() if v - before.get(k, 0)}
+            r.update(statuses=codes, requests_per_s=round(r["requests"] / r["seconds"], 1) if r["seconds"] else None)
+            results[bot] = r
+            print(f"  {bot:<22} {r['seconds']:>8.2f}s  {r['requests']:>6} req  {r['requests_per_s'] or 0:>7} req/s  "
+                  f"{codes}  {r['status']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
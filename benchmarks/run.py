@@ -0,0 +1,71 @@
+# === Benchmark Runner ===
+# Runs the scan and indicator benchmarks and stores one JSON per commit under
+# benchmarks/results/, so two commits can be compared:
+#   python benchmarks/run.py                    # everything, incl. 1M bars
+#   python benchmarks/run.py --quick            # skip the 1M-bar sizes
+#   python benchmarks/run.py --scan | --micro   # one half only
+#   python benchmarks/run.py compare old.json new.json
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import bench_indicators
+import bench_scan
+from bots import ROOT
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REGRESSION = 1.10     # flag anything at least 10% slower
+
+def commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "") if sha else "unknown"
+    except OSError:
+        return "unknown"
+
+def run(args):
+    result = {"commit": commit(), "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "python": platform.python_version(), "machine": platform.machine()}
+    if "--micro" not in args:
+        print("🏁 End-to-end scans (one main() cycle per bot):")
+        result["scan"] = bench_scan.run()
+    if "--scan" not in args:
+        sizes = [n for n in bench_indicators.SIZES if n < 1_000_000 or "--quick" not in args]
+        print("🧮 Indicator micro-benchmarks:")
+        result["indicators"] = bench_indicators.run(sizes)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+    print(f"💾 Results saved to {path}")
+
+def _flatten(result):
+    flat = {f"scan:{k}": v["seconds"] for k, v in result.get("scan", {}).items() if v["status"] == "ok"}
+    flat.update({f"micro:{k}": v for k, v in result.get("indicators", {}).items() if v is not None})
+    return flat
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    a, b = _flatten(old), _flatten(new)
+    print(f"{old['commit']} -> {new['commit']}")
+    worse = 0
+    for key in sorted(k for k in a.keys() & b.keys() if a[k]):
+        ratio = b[key] / a[key]
+        mark = "🔺" if ratio >= REGRESSION else "🔻" if ratio <= 1 / REGRESSION else "  "
+        worse += ratio >= REGRESSION
+        print(f"{mark} {key:<60} {a[key]:>12.6f} {b[key]:>12.6f}  x{ratio:.2f}")
+    print(f"{worse} regression(s) of {REGRESSION - 1:.0%} or more")
+    return worse
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["compare"]:
+        sys.exit(1 if compare(sys.argv[2], sys.argv[3]) else 0)
+    run(sys.argv[1:])
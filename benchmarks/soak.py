@@ -0,0 +1,134 @@
+# === Soak Test ===
+# Runs one looping bot for many cycles against mock_exchange.py with the
+# wait for the next candle removed, so a week of 15m cycles (672) runs back
+# to back. The mock runs as a separate process, so only the bot's own memory
+# is measured. RSS is sampled after every cycle. The least-squares slope over
+# the second half, projected to a week, has to stay under --max-growth-mb.
+# --trace adds memwatch.py's tracemalloc snapshots and prints the source
+# lines that grew most between them.
+#   python benchmarks/soak.py bybitbot.py --cycles 672 --symbols 500
+#   python benchmarks/soak.py multi_scanner.py --full --cycles 200 --trace
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from time import perf_counter
+
+import numpy as np
+
+from bench_scan import _CycleDone, _patch_bot, sandbox
+from bots import load_bot
+from stand_in import redirect
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WEEK_CYCLES = 7 * 24 * 4
+LIMIT_SCALE = 1000    # cycles run back to back, so venue rate limits are stretched to match
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_mock(symbols, port):
+    proc = subprocess.Popen([sys.executable, os.path.join(HERE, "mock_exchange.py"), "serve",
+                             "--symbols", str(symbols), "--port", str(port),
+                             "--binance-weight", str(2400 * LIMIT_SCALE), "--bybit-limit", str(600 * LIMIT_SCALE)],
+                            stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("mock exchange did not start")
+
+def _stretch_limits():
+    import rate_limiter
+    for lim in rate_limiter.LIMITERS.values():
+        lim.limit *= LIMIT_SCALE
+        lim.capacity *= LIMIT_SCALE
+        lim.rate *= LIMIT_SCALE
+        lim.tokens = lim.capacity
+
+def _log(*args):
+    print(*args, file=sys.stderr)
+
+def run(bot, argv, cycles, symbols, trace=False, log=_log):
+    import memwatch
+    import scheduler
+    watch = memwatch.MemoryWatch(enabled=trace)
+    samples = []
+    started = perf_counter()
+
+    def cycle_done(*args, **kwargs):
+        report = watch.end_cycle()
+        samples.append((watch.cycle, watch.stats["rss_kb"], round(perf_counter() - started, 2)))
+        if report and watch.findings:
+            log(report)
+        if watch.cycle % max(cycles // 10, 1) == 0:
+            log(f"  cycle {watch.cycle}/{cycles}: RSS {watch.stats['rss_kb'] / 1024:.1f} MB")
+        if watch.cycle >= cycles:
+            raise _CycleDone
+
+    port = _free_port()
+    proc = start_mock(symbols, port)
+    try:
+        with sandbox(), redirect(f"http://127.0.0.1:{port}"), open(os.devnull, "w") as devnull:
+            scheduler.CandleScheduler.wait = cycle_done
+            mod = load_bot(bot, argv)
+            _patch_bot(mod, type("Mock", (), {"server_address": ("127.0.0.1", port)}))
+            if hasattr(mod, "sleep"):
+                # binance-signal sleeps 900 s itself instead of using the scheduler
+                mod.sleep = lambda secs: cycle_done() if secs >= 60 else time.sleep(secs)
+            _stretch_limits()
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                mod.main()
+            except _CycleDone:
+                pass
+            finally:
+                sys.stdout = stdout
+    finally:
+        proc.terminate()
+        proc.wait()
+    return summarize(samples)
+
+def summarize(samples):
+    cycles = np.array([s[0] for s in samples], dtype=float)
+    rss = np.array([s[1] for s in samples], dtype=float) / 1024
+    half = len(samples) // 2
+    slope = float(np.polyfit(cycles[half:], rss[half:], 1)[0]) if len(samples) - half >= 2 else 0.0
+    return {"cycles": len(samples), "seconds": samples[-1][2] if samples else 0,
+            "rss_first_mb": round(rss[0], 1), "rss_half_mb": round(rss[half], 1), "rss_last_mb": round(rss[-1], 1),
+            "rss_peak_mb": round(rss.max(), 1), "slope_kb_per_cycle": round(slope * 1024, 2),
+            "projected_week_mb": round(slope * WEEK_CYCLES, 1)}
+
+def main():
+    ap = argparse.ArgumentParser(description="Memory soak test of one looping bot against the mock exchange")
+    ap.add_argument("bot")
+    ap.add_argument("--full", action="store_true", help="pass --full (multi_scanner full-universe mode)")
+    ap.add_argument("--cycles", type=int, default=WEEK_CYCLES)
+    ap.add_argument("--symbols", type=int, default=500)
+    ap.add_argument("--max-growth-mb", type=float, default=16, help="allowed projected RSS growth per week")
+    ap.add_argument("--trace", action="store_true", help="tracemalloc snapshots via memwatch")
+    ap.add_argument("--json", help="write the summary here")
+    args = ap.parse_args()
+
+    print(f"🧪 Soak: {args.bot} for {args.cycles} cycles against a {args.symbols}-symbol mock exchange")
+    result = run(args.bot, ["--full"] if args.full else [], args.cycles, args.symbols, args.trace)
+    ok = result["projected_week_mb"] <= args.max_growth_mb
+    print(f"🧠 RSS {result['rss_first_mb']} → {result['rss_half_mb']} → {result['rss_last_mb']} MB "
+          f"(peak {result['rss_peak_mb']}) over {result['cycles']} cycles in {result['seconds']:.0f}s")
+    print(f"{'✅' if ok else '❌'} second-half slope {result['slope_kb_per_cycle']} KB/cycle, "
+          f"projected {result['projected_week_mb']} MB/week (limit {args.max_growth_mb} MB)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "result": result, "ok": ok}, f, indent=2)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
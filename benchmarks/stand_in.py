@@ -0,0 +1,150 @@
+# === Local Exchange Stand-in ===
+# Serves a fixtures.py file over HTTP on 127.0.0.1 with the same paths and
+# response shapes as Bybit v5 and Binance fapi, so bots run unmodified.
+# redirect() points requests (and anything else going through
+# requests.Session) at the stand-in; webhook posts are swallowed.
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+UPSTREAMS = ("https://api.bybit.com", "https://fapi.binance.com")
+SINKS = ("https://discord.com", "https://api.telegram.org")
+
+def _bybit(result, code=0, msg="OK"):
+    return 200, {"retCode": code, "retMsg": msg, "result": result, "time": 0}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.server.count(url.path)
+        route = self.server.routes.get(url.path)
+        if route is None:
+            return self._send(404, {"code": -1, "msg": f"no fixture route for {url.path}"})
+        self._send(*route(self.server.fixture, q))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count("POST " + urlsplit(self.path).path)
+        self._send(200, {"ok": True})
+
+# === ROUTES ===
+def bybit_kline(fx, q):
+    rows = fx["bybit"]["klines"].get(q.get("symbol"), {}).get(q.get("interval"))
+    if rows is None:
+        return _bybit({"category": "linear", "symbol": q.get("symbol"), "list": []}, 10001, "params error")
+    return _bybit({"category": "linear", "symbol": q["symbol"], "list": rows[:int(q.get("limit", 200))]})
+
+def bybit_tickers(fx, q):
+    result = dict(fx["bybit"]["tickers"]["result"])
+    if "symbol" in q:
+        result["list"] = [t for t in result["list"] if t["symbol"] == q["symbol"]]
+    return _bybit(result)
+
+def bybit_orderbook(fx, q):
+    book = fx["bybit"]["orderbook"].get(q.get("symbol"))
+    if book is None:
+        return _bybit({}, 10001, "params error")
+    n = int(q.get("limit", 25))
+    res = book["result"]
+    return _bybit(dict(res, b=res["b"][:n], a=res["a"][:n]))
+
+def bybit_instruments(fx, q):
+    return 200, fx["bybit"]["instruments"]
+
+def binance_klines(fx, q):
+    rows = fx["binance"]["klines"].get(q.get("symbol"), {}).get(q.get("interval"))
+    if rows is None:
+        return 400, {"code": -1121, "msg": "Invalid symbol."}
+    return 200, rows[-int(q.get("limit", 500)):]
+
+def binance_ticker(fx, q):
+    data = fx["binance"]["ticker24hr"]
+    if "symbol" in q:
+        return 200, next((t for t in data if t["symbol"] == q["symbol"]), {})
+    return 200, data
+
+def binance_premium_index(fx, q):
+    # derived from the 24h tickers: fixtures predate funding, so the rate is flat
+    data = [{"symbol": t["symbol"], "markPrice": t["lastPrice"], "lastFundingRate": "0.00010000",
+             "nextFundingTime": 0, "time": 0} for t in fx["binance"]["ticker24hr"]]
+    if "symbol" in q:
+        return 200, next((t for t in data if t["symbol"] == q["symbol"]), {})
+    return 200, data
+
+def binance_exchange_info(fx, q):
+    return 200, fx["binance"]["exchangeInfo"]
+
+ROUTES = {
+    "/v5/market/kline": bybit_kline,
+    "/v5/market/tickers": bybit_tickers,
+    "/v5/market/orderbook": bybit_orderbook,
+    "/v5/market/instruments-info": bybit_instruments,
+    "/fapi/v1/klines": binance_klines,
+    "/fapi/v1/ticker/24hr": binance_ticker,
+    "/fapi/v1/exchangeInfo": binance_exchange_info,
+    "/fapi/v1/premiumIndex": binance_premium_index,
+}
+
+# === SERVER ===
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixture, routes=ROUTES, port=0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.fixture = fixture
+        self.routes = routes
+        self.hits = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, key):
+        with self._lock:
+            self.hits[key] = self.hits.get(key, 0) + 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+@contextmanager
+def redirect(base_url, upstreams=UPSTREAMS, sinks=SINKS):
+    original = requests.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        for host in upstreams:
+            if url.startswith(host):
+                url = base_url + url[len(host):]
+        for host in sinks:
+            if url.startswith(host):
+                url = base_url + "/sink"
+        return original(self, method, url, *args, **kwargs)
+
+    requests.Session.request = request
+    try:
+        yield
+    finally:
+        requests.Session.request = original
@@ -1,8 +1,13 @@
 import requests
-from fpdf import FPDF
 from datetime import datetime, timedelta, timezone
 from time import sleep
-import pytz
+
+import rate_limiter
+import scoring
+from diversify import ReturnsMatrix
+from memwatch import MemoryWatch
+from precision import Precision
+from ranking import TopK
 
 # === CONFIGURATION ===
 RISK_PCT = 0.15
@@ -20,6 +25,11 @@ TELEGRAM_CHAT_ID = "5852301284"
 
 tz_utc3 = timezone(timedelta(hours=3))
 
+# main-timeframe returns of every analyzed symbol, see diversify.py
+returns = ReturnsMatrix("1h")
+# prices and sizes snapped to each contract's tick size / lot step, see precision.py
+ticks = Precision("binance")
+
 # === DISCORD NOTIFY ===
 def send_discord(message):
     if not DISCORD_WEBHOOK_URL:
@@ -46,7 +56,7 @@ def send_telegram(message):
 def get_candles(sym, interval):
     url = f"https://fapi.binance.com/fapi/v1/klines?symbol={sym}&interval={interval}&limit=200"
     try:
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+        response = rate_limiter.get(url, headers={'User-Agent': 'Mozilla/5.0'})
         data = response.json()
         return [{
             'high': float(c[2]),
@@ -119,6 +129,8 @@ def analyze(symbol):
         if len(candles) < 30:
             return None
         closes = [c['close'] for c in candles]
+        if tf == '1h':
+            returns.observe(symbol, closes)
         volumes = [c['volume'] for c in candles]
         highs = [c['high'] for c in candles]
         lows = [c['low'] for c in candles]
@@ -172,17 +184,11 @@ def analyze(symbol):
     liq = round(entry * (1 - 1 / LEVERAGE) if side == 'LONG' else entry * (1 + 1 / LEVERAGE), 6)
     margin = round((ACCOUNT_BALANCE * RISK_PCT) / LEVERAGE, 6)
 
-    score = 0
-    score += 0.3 if tf['macd'] > 0 else 0
-    score += 0.2 if tf['rsi'] < 30 or tf['rsi'] > 70 else 0
-    score += 0.3 if bb_dir != "No" else 0.1
-    score += 0.2 if trend == "Trend" else 0.1
-
     return {
         'Symbol': symbol,
         'Side': side,
         'Type': trend,
-        'Score': round(score * 100, 1),
+        'Score': None,
         'Entry': round(entry, 6),
         'TP': tp,
         'SL': sl,
@@ -191,12 +197,18 @@ def analyze(symbol):
         'Market': price,
         'Liq': liq,
         'BB Slope': bb_dir,
+        'RSI': tf['rsi'],
+        'MACD': tf['macd'],
         'Time': datetime.now(tz_utc3).strftime("%Y-%m-%d %H:%M UTC+3")
     }
 
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py
+    return scoring.score_mtf(signals)
+
 def get_usdt_symbols():
     try:
-        r = requests.get("https://fapi.binance.com/fapi/v1/ticker/24hr", headers={'User-Agent': 'Mozilla/5.0'})
+        r = rate_limiter.get("https://fapi.binance.com/fapi/v1/ticker/24hr", headers={'User-Agent': 'Mozilla/5.0'})
         data = r.json()
         tickers = [i for i in data if i['symbol'].endswith("USDT")]
         top_by_volume = sorted(tickers, key=lambda x: float(x['quoteVolume']), reverse=True)
@@ -206,20 +218,21 @@ def get_usdt_symbols():
         return []
 
 def main():
+    mem = MemoryWatch()
     while True:
         print("\n🔍 Scanning Binance USDT Futures for filtered signals...\n")
         syms = get_usdt_symbols()
+        ranker = TopK(20, key=lambda x: x['Score'])
         signals = []
 
         for sym in syms:
             sig = analyze(sym)
             if sig:
                 signals.append(sig)
-            sleep(0.3)
+        ranker.extend(compute_scores(ticks.round_signals(signals)))
 
-        if signals:
-            signals.sort(key=lambda x: x['Score'], reverse=True)
-            top5 = signals[:5]
+        if ranker:
+            top5 = returns.diversified(ranker.top(), 5)
 
             for s in top5:
                 print(f"""
@@ -246,6 +259,11 @@ def main():
         else:
             print("⚠️ No valid signals found")
 
+        print(rate_limiter.report())
+        print(returns.report())
+        mem_report = mem.end_cycle()
+        if mem_report:
+            print(mem_report)
         print("♻️ Rescanning in 15 minutes...\n")
         sleep(900)
 
@@ -1,9 +1,15 @@
 import requests
-from fpdf import FPDF
 from datetime import datetime, timedelta, timezone
-from time import sleep
-import pytz
-import sys
+
+import rate_limiter
+import scoring
+from diversify import ReturnsMatrix
+from memwatch import MemoryWatch
+from precision import Precision
+from ranking import TopK
+from report_sinks import ReportSinks
+from scheduler import CandleScheduler
+from tiering import SymbolTiers
 
 # === CONFIGURATION ===
 RISK_PCT = 0.015
@@ -22,6 +28,11 @@ TELEGRAM_CHAT_ID = "5852301284"
 
 tz_utc3 = timezone(timedelta(hours=3))
 
+# main-timeframe returns of every analyzed symbol, see diversify.py
+returns = ReturnsMatrix("1h")
+# prices and sizes snapped to each contract's tick size / lot step, see precision.py
+ticks = Precision("binance")
+
 # === NOTIFICATIONS ===
 def send_discord(message):
     if not DISCORD_WEBHOOK_URL:
@@ -45,34 +56,39 @@ def send_telegram(message):
         pass
 
 # === PDF GENERATOR ===
-class SignalPDF(FPDF):
-    def header(self):
-        self.set_font("Arial", "B", 10)
-        self.cell(0, 10, "Binance Futures Multi-TF Signals", 0, 1, "C")
+def signal_pdf():
+    from fpdf import FPDF  # only paid for when the pdf sink is on
+
+    class SignalPDF(FPDF):
+        def header(self):
+            self.set_font("Arial", "B", 10)
+            self.cell(0, 10, "Binance Futures Multi-TF Signals", 0, 1, "C")
+
+        def add_signals(self, signals):
+            self.set_font("Courier", size=8)
+            for s in signals:
+                self.set_text_color(0, 0, 0)
+                self.set_font("Courier", "B", 8)
+                self.cell(0, 5, f"==================== {s['Symbol']} ====================", ln=1)
 
-    def add_signals(self, signals):
-        self.set_font("Courier", size=8)
-        for s in signals:
-            self.set_text_color(0, 0, 0)
-            self.set_font("Courier", "B", 8)
-            self.cell(0, 5, f"==================== {s['Symbol']} ====================", ln=1)
+                self.set_font("Courier", "", 8)
+                self.set_text_color(0, 0, 139)
+                self.cell(0, 4, f"TYPE: {s['Type']}    SIDE: {s['Side']}     SCORE: {s['Score']}%", ln=1)
 
-            self.set_font("Courier", "", 8)
-            self.set_text_color(0, 0, 139)
-            self.cell(0, 4, f"TYPE: {s['Type']}    SIDE: {s['Side']}     SCORE: {s['Score']}%", ln=1)
+                self.set_text_color(34, 139, 34)
+                self.cell(0, 4, f"ENTRY: {s['Entry']}   TP: {s['TP']}         SL: {s['SL']}", ln=1)
 
-            self.set_text_color(34, 139, 34)
-            self.cell(0, 4, f"ENTRY: {s['Entry']}   TP: {s['TP']}         SL: {s['SL']}", ln=1)
+                self.set_text_color(139, 0, 0)
+                self.cell(0, 4, f"MARKET: {s['Market']}  BB: {s['BB Slope']}    Trail: {s['Trail']}", ln=1)
 
-            self.set_text_color(139, 0, 0)
-            self.cell(0, 4, f"MARKET: {s['Market']}  BB: {s['BB Slope']}    Trail: {s['Trail']}", ln=1)
+                self.set_text_color(0, 100, 100)
+                self.cell(0, 4, f"MARGIN: {s['Margin']}  LIQ: {s['Liq']}    TIME: {s['Time']}", ln=1)
 
-            self.set_text_color(0, 100, 100)
-            self.cell(0, 4, f"MARGIN: {s['Margin']}  LIQ: {s['Liq']}    TIME: {s['Time']}", ln=1)
+                self.set_text_color(0, 0, 0)
+                self.cell(0, 4, "=" * 57, ln=1)
+                self.ln(1)
 
-            self.set_text_color(0, 0, 0)
-            self.cell(0, 4, "=" * 57, ln=1)
-            self.ln(1)
+    return SignalPDF
 
 # === FORMATTER ===
 def format_signal_block(s):
@@ -90,7 +106,7 @@ def format_signal_block(s):
 def get_candles(symbol, interval):
     url = f"https://fapi.binance.com/fapi/v1/klines?symbol={symbol}&interval={interval}&limit=200"
     try:
-        data = requests.get(url).json()
+        data = rate_limiter.get(url).json()
         return [{
             'high': float(c[2]),
             'low': float(c[3]),
@@ -146,12 +162,14 @@ def classify_trend(e9,e21,s20):
     return "Scalp"
 
 # === SIGNAL LOGIC ===
-def analyze(symbol):
+def analyze(symbol, tiers=None):
     data = {}
     for tf in INTERVALS:
         candles = get_candles(symbol, tf)
         if len(candles)<30: return None
         closes = [c['close'] for c in candles]
+        if tf == '1h':
+            returns.observe(symbol, closes)
         highs = [c['high'] for c in candles]
         lows = [c['low'] for c in candles]
         vols = [c['volume'] for c in candles]
@@ -170,6 +188,9 @@ def analyze(symbol):
         }
 
     tf60 = data['1h']
+    if tiers is not None and tf60['close']:
+        # real ATR% replaces the 24h-range proxy in the tier ranking
+        tiers.observe_atr(symbol, tf60['atr'] / tf60['close'])
     if (tf60['volume']<MIN_VOLUME or tf60['atr']/tf60['close']<MIN_ATR_PCT or
         not (RSI_ZONE[0]<tf60['rsi']<RSI_ZONE[1])):
         return None
@@ -202,17 +223,11 @@ def analyze(symbol):
     except:
         margin=1
 
-    score = 0
-    score += 0.3 if tf['macd']>0 else 0
-    score += 0.2 if tf['rsi']<30 or tf['rsi']>70 else 0
-    score += 0.3 if bb_dir!="No" else 0.1
-    score += 0.2 if trend=="Trend" else 0.1
-
     return {
         'Symbol': symbol,
         'Side': side,
         'Type': trend,
-        'Score': round(score*100,1),
+        'Score': None,
         'Entry': round(entry,6),
         'TP': tp,
         'SL': sl,
@@ -221,42 +236,67 @@ def analyze(symbol):
         'Market': price,
         'Liq': liq,
         'BB Slope': bb_dir,
+        'RSI': tf['rsi'],
+        'MACD': tf['macd'],
         'Time': datetime.now(tz_utc3).strftime("%Y-%m-%d %H:%M UTC+3")
     }
 
+# === SCORING ===
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py
+    return scoring.score_mtf(signals)
+
 # === FETCH BINANCE SYMBOLS ===
-def get_usdt_symbols():
+def get_usdt_tickers():
+    # whole USDT-M universe with turnover and 24h range, one request
     try:
-        data = requests.get("https://fapi.binance.com/fapi/v1/ticker/24hr").json()
-        tickers = [i for i in data if i['symbol'].endswith("USDT") and not i['symbol'].endswith("BUSD")]
-        tickers.sort(key=lambda x: float(x['quoteVolume']), reverse=True)
-        return [t['symbol'] for t in tickers[:MAX_SYMBOLS]]
+        data = rate_limiter.get("https://fapi.binance.com/fapi/v1/ticker/24hr").json()
+        return [{
+            'symbol': t['symbol'],
+            'turnover': float(t['quoteVolume']),
+            'range_pct': (float(t['highPrice']) - float(t['lowPrice'])) / float(t['lastPrice'])
+        } for t in data if t['symbol'].endswith("USDT") and float(t['lastPrice']) > 0]
     except:
         return []
 
 # === MAIN LOOP ===
 def main():
+    sched = CandleScheduler()
+    mem = MemoryWatch()
+    reports = ReportSinks("binance_signals", layout=signal_pdf, render=lambda pdf, sigs: pdf.add_signals(sigs), tz=tz_utc3)
+    tiers = SymbolTiers(budget=MAX_SYMBOLS)
     while True:
+        sched.start_scan()
         print("\n🔍 Scanning Binance USDT Futures for filtered signals...\n")
-        symbols = get_usdt_symbols()
-        signals = [analyze(s) for s in symbols]
-        signals = [s for s in signals if s]
-
-        if signals:
-            signals.sort(key=lambda x: x['Score'], reverse=True)
-            top5 = signals[:5]
+        symbols = tiers.plan(get_usdt_tickers())
+        ranker = TopK(20, key=lambda x: x['Score'])
+        signals = []
+        for i, s in enumerate(symbols):
+            if sched.should_shed():
+                sched.shed(len(symbols) - i)
+                print(f"⏰ Scan budget used up, shedding {len(symbols) - i} lowest-priority symbols")
+                break
+            sig = analyze(s, tiers)
+            tiers.record(s, sig)
+            if sig:
+                signals.append(sig)
+        # symbols not due this cycle still compete with their last result
+        signals.extend(tiers.cached())
+        ranker.extend(compute_scores(ticks.round_signals(signals)))
+        sched.end_scan()
+        print(tiers.report())
+
+        if ranker:
+            top5 = returns.diversified(ranker.top(), 5)
             blocks = [format_signal_block(s) for s in top5]
             agg_msg = "\n".join(blocks)
 
             for blk in blocks:
                 print(blk)
 
-            pdf = SignalPDF()
-            pdf.add_page()
-            pdf.add_signals(signals[:20])
-            fname=f"binance_signals_{datetime.now(tz_utc3).strftime('%H%M')}.pdf"
-            pdf.output(fname)
-            print(f"📄 PDF saved: {fname}")
+            # top 20 to every sink in REPORT_SINKS
+            for fname in reports.write(ranker.top(20)):
+                print(f"📄 Report saved: {fname}")
 
             send_discord("📊 **Top 5 Binance Signals**\n\n" + agg_msg)
             send_telegram("📊 *Top 5 Binance Signals*\n\n" + agg_msg)
@@ -264,13 +304,15 @@ def main():
         else:
             print("⚠️ No valid signals found\n")
 
-        wait = 900
-        print("⏳ Rescanning in 15 minutes...")
-        for i in range(wait,0,-1):
-            sys.stdout.write(f"\r⏱️  Next scan in {i//60:02d}:{i%60:02d}")
-            sys.stdout.flush()
-            sleep(1)
-        print()
+        print(sched.report())
+        print(rate_limiter.report())
+        print(returns.report())
+        print(reports.report())
+        mem_report = mem.end_cycle()
+        if mem_report:
+            print(mem_report)
+        print("⏳ Rescanning after the next 15m candle close...")
+        sched.wait(countdown=True)
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,23 @@
 import requests
 from datetime import datetime, timezone, timedelta
-from fpdf import FPDF
+
+import candle_store
+import funding
+import market_regime
+import outcome_tracker
+import precision
+import report_sinks
+import rolling
+import scoring
+import universe
+from ranking import TopK
 
 # === CONFIG ===
 RISK_AMOUNT = 2
 LEVERAGE = 20
 TP_PERCENT = 0.25
 SL_PERCENT = 0.10
+VENUE = "bybit"
 
 # === INDICATORS ===
 def ema(values, period):
@@ -44,51 +55,13 @@ def calculate_macd(values, fast=12, slow=26, signal=9):
     return macd_line, signal_line, histogram
 
 def calculate_bollinger_bands(values, period=20, std_dev=2):
-    sma_vals = sma(values, period)
-    bands = []
-    for i in range(len(values)):
-        if i < period - 1:
-            bands.append((None, None, None))
-        else:
-            mean = sma_vals[i]
-            std = (sum((x - mean) ** 2 for x in values[i + 1 - period:i + 1]) / period) ** 0.5
-            upper = mean + std_dev * std
-            lower = mean - std_dev * std
-            bands.append((upper, mean, lower))
-    return bands
+    return rolling.bollinger_bands(values, period, std_dev)
 
 # === TREND ===
-def detect_market_trend(symbol):
-    def fetch_closes(symbol, tf_code):
-        url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={symbol}&interval={tf_code}&limit=60"
-        try:
-            r = requests.get(url, timeout=5)
-            data = r.json().get("result", {}).get("list", [])
-            return [float(x[4]) for x in data[::-1]]
-        except:
-            return []
-
-    trend_info = {}
-    timeframes = [('60', '1h'), ('240', '4h'), ('15', '15m')]
-    for tf_code, label in timeframes:
-        closes = fetch_closes(symbol, tf_code)
-        if len(closes) < 50:
-            trend_info[label] = 'neutral'
-            continue
-        ema9 = ema(closes, 9)[-1]
-        ema21 = ema(closes, 21)[-1]
-        ma200 = sma(closes, 50)[-1]
-        close = closes[-1]
-
-        if close > ma200 and ema9 > ema21:
-            trend_info[label] = 'bullish'
-        elif close < ma200 and ema9 < ema21:
-            trend_info[label] = 'bearish'
-        else:
-            trend_info[label] = 'neutral'
-    return trend_info
-
-def is_trade_allowed(side, trend_info):
+# BTC / ETH trend votes and breadth, computed once per candle close for the whole scan
+market = market_regime.MarketRegime(VENUE)
+
+def is_trade_allowed(side, trend_info, context=None):
     trend_votes = list(trend_info.values())
     bull = trend_votes.count('bullish')
     bear = trend_votes.count('bearish')
@@ -96,49 +69,21 @@ def is_trade_allowed(side, trend_info):
         return False
     if bear > bull and side == 'LONG':
         return False
-    return True
+    return market_regime.is_trade_allowed(side, context)
 
 # === SIGNAL SCORING ===
-def compute_score(s):
-    score = 0
-    trend_info = detect_market_trend(s['symbol'])
-    bull = list(trend_info.values()).count('bullish')
-    bear = list(trend_info.values()).count('bearish')
-
-    score += 20 if bull == 3 or bear == 3 else 10 if bull == 2 or bear == 2 else 0
-
-    if s['side'] == 'LONG' and 50 < s['rsi'] < 65:
-        score += 10
-    elif s['side'] == 'SHORT' and 35 < s['rsi'] < 50:
-        score += 10
-
-    if s['macd_hist']:
-        if s['macd_hist'] > 0 and s['side'] == 'LONG':
-            score += 10
-        elif s['macd_hist'] < 0 and s['side'] == 'SHORT':
-            score += 10
-
-    if s["bb_breakout"] == "YES":
-        score += 5
-    if s.get("vol_spike"):
-        score += 10
-
-    score += s["confidence"] * 0.4
-
-    rr = TP_PERCENT / SL_PERCENT
-    score += 10 if rr >= 2 else 5 if rr >= 1.5 else 0
-
-    if trend_info['1h'] == trend_info['4h'] == trend_info['15m'] == s['trend']:
-        score += 10
-
-    return round(score, 2)
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py; funding / open
+    # interest come from one bulk call per funding interval, see funding.py
+    funding.enrich(signals, VENUE)
+    return scoring.score_signals(signals, "v1", TP_PERCENT / SL_PERCENT)
 
 # === SIGNAL GENERATION ===
-def build_signal(name, condition, confidence, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes):
+def build_signal(name, condition, confidence, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike, context):
     if not condition:
         return None
     side = "long" if name != "Short Reversal" else "short"
-    if not is_trade_allowed(side.upper(), trend_info): return None
+    if not is_trade_allowed(side.upper(), trend_info, context): return None
     entry = close
     liquidation = entry * (1 - 1 / LEVERAGE) if side == "long" else entry * (1 + 1 / LEVERAGE)
     sl_price = max(entry * (1 - SL_PERCENT), liquidation * 1.05) if side == "long" else min(entry * (1 + SL_PERCENT), liquidation * 0.95)
@@ -164,13 +109,15 @@ def build_signal(name, condition, confidence, regime, trend_info, close, symbol,
         "forecast_pnl": forecast_pnl,
         "strategy": name,
         "timestamp": (datetime.now(timezone.utc) + timedelta(hours=3)).strftime("%Y-%m-%d %H:%M UTC+3"),
-        "vol_spike": volumes[-1] > sum(volumes[-20:]) / 20 * 1.5
+        "vol_spike": vol_spike,
+        "trend_info": trend_info,
+        "breadth": context["breadth"],
+        "market_bias": context["bias"]
     }
-    signal["score"] = compute_score(signal)
     return signal
 
 # === ANALYSIS ENGINE ===
-def analyze(symbol, tf="60"):
+def analyze(symbol, tf="60", context=None):
     data = fetch_ohlcv(symbol, tf)
     if len(data) < 60: return []
     highs = [x[0] for x in data]
@@ -186,7 +133,10 @@ def analyze(symbol, tf="60"):
     rsi = compute_rsi(closes)
     bb_upper, bb_mid, bb_lower = zip(*calculate_bollinger_bands(closes))
     macd_line, macd_signal, macd_hist = calculate_macd(closes)
-    trend_info = detect_market_trend(symbol)
+    vol_spike = volumes[-1] > sum(volumes[-20:]) / 20 * 1.5
+    context = context or market.context()
+    trend_info = context["trend"]
+    market.observe(symbol, close, ma200[-1])
 
     regime = "trend" if ma20[-1] > ma200[-1] else (
         "mean_reversion" if rsi < 35 or rsi > 65 else "scalp"
@@ -194,39 +144,48 @@ def analyze(symbol, tf="60"):
 
     signals = []
     if regime == "trend":
-        sig = build_signal("Trend", ema9[-1] > ema21[-1], 90, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
+        sig = build_signal("Trend", ema9[-1] > ema21[-1], 90, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike, context)
         if sig: signals.append(sig)
 
     if regime == "mean_reversion":
-        sig = build_signal("Mean-Reversion", rsi < 40 or close < ma20[-1], 85, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
+        sig = build_signal("Mean-Reversion", rsi < 40 or close < ma20[-1], 85, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike, context)
         if sig: signals.append(sig)
 
-    if regime == "scalp" and volumes[-1] > sum(volumes[-20:]) / 20 * 1.5:
-        sig = build_signal("Scalp Breakout", True, 80, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
+    if regime == "scalp" and vol_spike:
+        sig = build_signal("Scalp Breakout", True, 80, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike, context)
         if sig: signals.append(sig)
 
     if rsi > 65 and close > bb_upper[-1]:
-        sig = build_signal("Short Reversal", True, 75, "reversal", trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
+        sig = build_signal("Short Reversal", True, 75, "reversal", trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike, context)
         if sig: signals.append(sig)
 
     return signals
 
 # === FETCH DATA FROM BYBIT ===
 def fetch_ohlcv(symbol, interval='60', limit=100):
-    url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={symbol}&interval={interval}&limit={limit}"
+    # warm start: bars already in candle_store from an earlier run are not downloaded again
+    missing = candle_store.missing_bars(VENUE, symbol, interval, limit)
+    url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={symbol}&interval={interval}&limit={missing}"
     try:
         r = requests.get(url, timeout=5)
         data = r.json().get("result", {}).get("list", [])
-        return [[float(x[2]), float(x[3]), float(x[4]), float(x[5]), float(x[1])] for x in data[::-1]]
+        rows = [[int(x[0]), float(x[1]), float(x[2]), float(x[3]), float(x[4]), float(x[5])] for x in data[::-1]]
+        candle_store.save_candles(VENUE, symbol, interval, rows)
+        if missing < limit:
+            rows = candle_store.load_candles(VENUE, symbol, interval, limit=limit)
+        return [[h, l, c, v, o] for _, o, h, l, c, v in rows]
     except Exception as e:
         print(f"[ERROR] {symbol}: {e}")
         return []
 
+symbol_universe = universe.Universe(VENUE)
+# prices and sizes snapped to each contract's tick size / lot step
+ticks = precision.Precision(VENUE, symbol_universe)
+
 def get_symbols(limit=100):
     try:
-        r = requests.get("https://api.bybit.com/v5/market/instruments-info?category=linear", timeout=5)
-        data = r.json().get("result", {}).get("list", [])
-        return [s['symbol'] for s in data if s['symbol'].endswith('USDT')][:limit]
+        # cached instrument list, highest 24h turnover first, see universe.py
+        return symbol_universe.ranked(limit)
     except Exception as e:
         print(f"[ERROR] Symbols: {e}")
         return []
@@ -248,10 +207,11 @@ def format_signal(s, i=None):
     return "\n".join([
         head,
         "-" * 60,
-        f"Entry        : {s['entry']:.8f}",
-        f"SL / TP      : {s['sl']:.8f} / {s['tp']:.8f}",
-        f"Liquidation  : {s['liquidation']:.8f}",
-        f"Position Size: {s['position_size']} qty (1 USDT @ {LEVERAGE}x)",
+        f"Entry        : {ticks.fmt(s['symbol'], s['entry'])}",
+        f"SL / TP      : {ticks.fmt(s['symbol'], s['sl'])} / {ticks.fmt(s['symbol'], s['tp'])}",
+        f"Liquidation  : {ticks.fmt(s['symbol'], s['liquidation'])}",
+        f"Position Size: {s['position_size']} qty (1 USDT @ {LEVERAGE}x)"
+        + (" ⚠️ below the venue minimum order" if s.get('unplaceable') else ""),
         f"Forecast PnL : {s['forecast_pnl']}% | Confidence: {s['confidence']}%",
         f"Trend        : {s['trend']} | Regime: {s['regime']} | RSI: {s['rsi']}",
         f"MACD Hist    : {s['macd_hist']} | BB Breakout: {s['bb_breakout']}",
@@ -261,6 +221,8 @@ def format_signal(s, i=None):
     ])
 
 def save_pdf(all_signals, top5):
+    from fpdf import FPDF  # only paid for when the pdf sink is on
+
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=14)
@@ -281,25 +243,45 @@ def save_pdf(all_signals, top5):
     pdf.output("top_signals.pdf")
     print("✅ PDF saved successfully as 'top_signals.pdf'")
 
+# the other REPORT_SINKS; the PDF above keeps its own two-section layout
+reports = report_sinks.ReportSinks("bybit_v1")
+
 # === MAIN ===
 def main():
     print("📊 Scanning Bybit Futures Signals...\n")
+    outcome_tracker.resolve_open_signals()
+    # Realized TP/SL history per strategy nudges the score before ranking
+    stats = outcome_tracker.realized_stats()
+    ranker = TopK(20, key=lambda x: (x['score'] * 0.7 + x['forecast_pnl'] * 0.3),
+                  accept=lambda s: s['rsi'] > 45 and s['regime'] in ['trend', 'scalp', 'mean_reversion'])
     all_signals = []
+    # one market context for the whole scan, even if it crosses a 15m close
+    context = market.context()
     for symbol in get_symbols():
-        all_signals.extend(analyze(symbol))
-
+        all_signals.extend(analyze(symbol, context=context))
+    # the whole scan is scored in one pass, then nudged by realized outcomes
+    for s in compute_scores(ticks.round_signals(all_signals)):
+        s['score'] = outcome_tracker.adjust_score(s, stats)
+        ranker.push(s)
+
+    print(market.report())
+    print(symbol_universe.report())
+    print(ticks.report())
     if not all_signals:
         print("❌ No signals found.")
         return
 
-    filtered = [s for s in all_signals if s['rsi'] > 45 and s['regime'] in ['trend', 'scalp', 'mean_reversion']]
-    top5 = sorted(filtered, key=lambda x: (x['score'] * 0.7 + x['forecast_pnl'] * 0.3), reverse=True)[:5]
+    outcome_tracker.record_signals(VENUE, all_signals)
+    top5 = ranker.top(5)
 
     for i, s in enumerate(top5, 1):
         print(format_signal(s, i))
         print()
 
-    save_pdf(all_signals, top5)
+    if reports.wants("pdf"):
+        save_pdf(all_signals, top5)
+    for path in reports.write(all_signals):
+        print(f"✅ Report saved as '{path}'")
 
 if __name__ == "__main__":
     main()
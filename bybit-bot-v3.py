@@ -1,7 +1,14 @@
 import requests
 from datetime import datetime, timezone, timedelta
-from fpdf import FPDF
-from tabulate import tabulate
+
+import funding
+import market_regime
+import precision
+import report_sinks
+import rolling
+import scoring
+import universe
+from ranking import TopK
 
 RISK_AMOUNT = 2
 LEVERAGE = 20
@@ -47,18 +54,7 @@ def calculate_macd(values, fast=12, slow=26, signal=9):
     return macd_line, signal_line, histogram
 
 def calculate_bollinger_bands(values, period=20, std_dev=2):
-    sma_vals = sma(values, period)
-    bands = []
-    for i in range(len(values)):
-        if i < period - 1:
-            bands.append((None, None, None))
-        else:
-            mean = sma_vals[i]
-            std = (sum((x - mean) ** 2 for x in values[i + 1 - period:i + 1]) / period) ** 0.5
-            upper = mean + std_dev * std
-            lower = mean - std_dev * std
-            bands.append((upper, mean, lower))
-    return bands
+    return rolling.bollinger_bands(values, period, std_dev)
 
 def calculate_atr(highs, lows, closes, period=14):
     trs = [max(h - l, abs(h - c), abs(l - c)) for h, l, c in zip(highs[1:], lows[1:], closes[:-1])]
@@ -77,6 +73,7 @@ def zscore(series, period=20):
     std = (sum((x - mean) ** 2 for x in series[-period:]) / period) ** 0.5
     return (series[-1] - mean) / std if std != 0 else 0
 
+
 # === Order Book Metrics ===
 def fetch_orderbook_strength(symbol):
     try:
@@ -97,71 +94,23 @@ def fetch_orderbook_strength(symbol):
         return {"buy_volume": 0, "sell_volume": 0, "imbalance": 0, "bias": "neutral"}
 
 # === Trend Detection ===
-def detect_market_trend(symbol):
-    def fetch_closes(symbol, tf_code):
-        url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={symbol}&interval={tf_code}&limit=60"
-        try:
-            r = requests.get(url, timeout=5)
-            data = r.json().get("result", {}).get("list", [])
-            return [float(x[4]) for x in data[::-1]]
-        except:
-            return []
-
-    trend_info = {}
-    timeframes = [('60', '1h'), ('240', '4h'), ('15', '15m')]
-    for tf_code, label in timeframes:
-        closes = fetch_closes(symbol, tf_code)
-        if len(closes) < 50:
-            trend_info[label] = 'neutral'
-            continue
-        ema9 = ema(closes, 9)[-1]
-        ema21 = ema(closes, 21)[-1]
-        ma200 = sma(closes, 50)[-1]
-        close = closes[-1]
-        if close > ma200 and ema9 > ema21:
-            trend_info[label] = 'bullish'
-        elif close < ma200 and ema9 < ema21:
-            trend_info[label] = 'bearish'
-        else:
-            trend_info[label] = 'neutral'
-    return trend_info
-
-def is_trade_allowed(side, trend_info):
+# BTC / ETH trend votes and breadth, computed once per candle close for the whole scan
+market = market_regime.MarketRegime("bybit")
+
+def is_trade_allowed(side, trend_info, context=None):
     trend_votes = list(trend_info.values())
     bull = trend_votes.count('bullish')
     bear = trend_votes.count('bearish')
     if bull > bear and side == 'SHORT': return False
     if bear > bull and side == 'LONG': return False
-    return True
+    return market_regime.is_trade_allowed(side, context)
 
 # === Score ===
-def compute_score(s, trend_info):
-    score = 0
-    bull = list(trend_info.values()).count('bullish')
-    bear = list(trend_info.values()).count('bearish')
-    score += 20 if bull == 3 or bear == 3 else 10 if bull == 2 or bear == 2 else 0
-
-    if s['side'] == 'LONG' and 50 < s['rsi'] < 65: score += 10
-    elif s['side'] == 'SHORT' and 35 < s['rsi'] < 50: score += 10
-
-    if s['macd_hist']:
-        if s['macd_hist'] > 0 and s['side'] == 'LONG': score += 10
-        elif s['macd_hist'] < 0 and s['side'] == 'SHORT': score += 10
-
-    if s["bb_breakout"] in ["UP", "DOWN"]: score += 5
-    if s.get("vol_spike"): score += 10
-    if s.get("atr_z") and abs(s["atr_z"]) > 1.5: score += 10
-    if s.get("atr") and s["atr"] > 0: score += 5
-    if s.get("orderbook_bias") == "buy" and s["side"] == "LONG": score += 10
-    if s.get("orderbook_bias") == "sell" and s["side"] == "SHORT": score += 10
-
-    score += s["confidence"] * 0.4
-    rr = TP_PERCENT / SL_PERCENT
-    score += 10 if rr >= 2 else 5 if rr >= 1.5 else 0
-
-    if trend_info.get('1h') == trend_info.get('4h') == trend_info.get('15m') == s['trend']:
-        score += 10
-    return round(score, 2)
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py; funding / open
+    # interest come from one bulk call per funding interval, see funding.py
+    funding.enrich(signals, "bybit")
+    return scoring.score_signals(signals, "v3", TP_PERCENT / SL_PERCENT)
 
 # === Data Fetching Helpers ===
 def fetch_ohlcv(symbol, interval='60', limit=100):
@@ -174,17 +123,20 @@ def fetch_ohlcv(symbol, interval='60', limit=100):
         print(f"[ERROR] {symbol}: {e}")
         return []
 
+symbol_universe = universe.Universe("bybit")
+# prices and sizes snapped to each contract's tick size / lot step
+ticks = precision.Precision("bybit", symbol_universe)
+
 def get_symbols(limit=100):
     try:
-        r = requests.get("https://api.bybit.com/v5/market/instruments-info?category=linear", timeout=5)
-        data = r.json().get("result", {}).get("list", [])
-        return [s['symbol'] for s in data if s['symbol'].endswith('USDT')][:limit]
+        # cached instrument list, highest 24h turnover first, see universe.py
+        return symbol_universe.ranked(limit)
     except Exception as e:
         print(f"[ERROR] Symbols: {e}")
         return []
 
 # === Main Signal Analysis ===
-def analyze(symbol, tf="60"):
+def analyze(symbol, tf="60", context=None):
     data = fetch_ohlcv(symbol, tf)
     if len(data) < 60: return []
 
@@ -202,8 +154,12 @@ def analyze(symbol, tf="60"):
     rsi = compute_rsi(closes)
     bb_upper, bb_mid, bb_lower = zip(*calculate_bollinger_bands(closes))
     macd_line, macd_signal, macd_hist = calculate_macd(closes)
-    trend_info = detect_market_trend(symbol)
+    context = context or market.context()
+    trend_info = context["trend"]
+    market.observe(symbol, close, ma200[-1])
     atr = calculate_atr(highs, lows, closes)
+    atr_z = zscore([x for x in atr if x], 20)
+    vol_spike = volumes[-1] > sum(volumes[-20:]) / 20 * 1.5
     bb_breakout = (
         "UP" if close > bb_upper[-1] else
         "DOWN" if close < bb_lower[-1] else
@@ -215,7 +171,7 @@ def analyze(symbol, tf="60"):
 
     def build(strategy, confidence, regime):
         side = "LONG" if strategy != "Short Reversal" else "SHORT"
-        if not is_trade_allowed(side, trend_info): return None
+        if not is_trade_allowed(side, trend_info, context): return None
         entry = close
         liquidation = entry * (1 - 1 / LEVERAGE) if side == "LONG" else entry * (1 + 1 / LEVERAGE)
         sl_price = max(entry * (1 - SL_PERCENT), liquidation * 1.05) if side == "LONG" else min(entry * (1 + SL_PERCENT), liquidation * 0.95)
@@ -231,12 +187,14 @@ def analyze(symbol, tf="60"):
             "forecast_pnl": round((TP_PERCENT * 100 * confidence) / 100, 2),
             "strategy": strategy,
             "timestamp": (datetime.now(timezone.utc) + timedelta(hours=3)).strftime("%Y-%m-%d %H:%M UTC+3"),
-            "vol_spike": volumes[-1] > sum(volumes[-20:]) / 20 * 1.5,
+            "vol_spike": vol_spike,
             "atr": round(atr_val, 4) if atr_val else None,
-            "atr_z": zscore([x for x in atr if x], 20),
-            "orderbook_bias": orderbook["bias"]
+            "atr_z": atr_z,
+            "orderbook_bias": orderbook["bias"],
+            "trend_info": trend_info,
+            "breadth": context["breadth"],
+            "market_bias": context["bias"]
         }
-        signal["score"] = compute_score(signal, trend_info)
         return signal
 
     regime = "trend" if ma20[-1] > ma200[-1] else "mean_reversion" if rsi < 35 or rsi > 65 else "scalp"
@@ -249,7 +207,7 @@ def analyze(symbol, tf="60"):
         sig = build("Mean-Reversion", 85, regime)
         if sig: signals.append(sig)
 
-    if regime == "scalp" and volumes[-1] > sum(volumes[-20:]) / 20 * 1.5:
+    if regime == "scalp" and vol_spike:
         sig = build("Scalp Breakout", 80, regime)
         if sig: signals.append(sig)
 
@@ -260,69 +218,79 @@ def analyze(symbol, tf="60"):
     return signals
 
 # === PDF Export ===
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font("Helvetica", "B", 12)
-        self.cell(0, 10, "Top Bybit Futures Trade Signals", border=False, ln=True, align="C")
-        self.ln(5)
-
-    def add_signal(self, s, index):
-        self.set_font("Helvetica", "B", 11)
-        self.cell(0, 10, f"{index}. {s['symbol']} ({s['side']}) - {s['strategy']}", ln=True)
-        self.set_font("Helvetica", "", 10)
-        details = [
-            f"Entry: {s['entry']:.4f}",
-            f"SL: {s['sl']:.4f} | TP: {s['tp']:.4f} | Size: {s['position_size']}",
-            f"RSI: {s['rsi']} | MACD Hist: {s['macd_hist']:.4f}",
-            f"BB Breakout: {s['bb_breakout']} | ATR: {s.get('atr', 'N/A')}",
-            f"Trend: {s['trend']} | Regime: {s['regime']}",
-            f"Vol Spike: {'Yes' if s['vol_spike'] else 'No'} | Orderbook Bias: {s['orderbook_bias']}",
-            f"ATR Z-Score: {s.get('atr_z', 0):.2f}",
-            f"Forecast PnL: {s['forecast_pnl']}% | Confidence: {s['confidence']}%",
-            f"Score: {s['score']} / 100",
-            f"Timestamp: {s['timestamp']}",
-        ]
-        for line in details:
-            self.multi_cell(0, 8, line)
-        self.ln(5)
-
-def export_signals_to_pdf(signals, filename="top_signals.pdf"):
-    pdf = PDFReport()
-    pdf.add_page()
+def report_pdf():
+    from fpdf import FPDF  # only paid for when the pdf sink is on
+
+    class PDFReport(FPDF):
+        def header(self):
+            self.set_font("Helvetica", "B", 12)
+            self.cell(0, 10, "Top Bybit Futures Trade Signals", border=False, ln=True, align="C")
+            self.ln(5)
+
+        def add_signal(self, s, index):
+            self.set_font("Helvetica", "B", 11)
+            self.cell(0, 10, f"{index}. {s['symbol']} ({s['side']}) - {s['strategy']}", ln=True)
+            self.set_font("Helvetica", "", 10)
+            details = [
+                f"Entry: {ticks.fmt(s['symbol'], s['entry'])}",
+                f"SL: {ticks.fmt(s['symbol'], s['sl'])} | TP: {ticks.fmt(s['symbol'], s['tp'])} | Size: {s['position_size']}",
+                f"RSI: {s['rsi']} | MACD Hist: {s['macd_hist']:.4f}",
+                f"BB Breakout: {s['bb_breakout']} | ATR: {s.get('atr', 'N/A')}",
+                f"Trend: {s['trend']} | Regime: {s['regime']}",
+                f"Vol Spike: {'Yes' if s['vol_spike'] else 'No'} | Orderbook Bias: {s['orderbook_bias']}",
+                f"ATR Z-Score: {s.get('atr_z', 0):.2f}",
+                f"Forecast PnL: {s['forecast_pnl']}% | Confidence: {s['confidence']}%",
+                f"Score: {s['score']} / 100",
+                f"Timestamp: {s['timestamp']}",
+            ]
+            for line in details:
+                self.multi_cell(0, 8, line)
+            self.ln(5)
+
+    return PDFReport
+
+def render_pdf(pdf, signals):
     for idx, sig in enumerate(signals, 1):
         pdf.add_signal(sig, idx)
-    pdf.output(filename)
-    print(f"\n✅ PDF exported: {filename}")
+
+reports = report_sinks.ReportSinks("bybit_v3", layout=report_pdf, render=render_pdf)
+
+def export_signals(signals):
+    for path in reports.write(signals):
+        print(f"\n✅ Report exported: {path}")
 
 # === MAIN ===
 def main():
     print("📊 Scanning Bybit Futures Signals...\n")
     all_signals = []
+    # blended key is computed once per signal when it is pushed
+    ranker = TopK(
+        20,
+        key=lambda x: (x['score'] * 0.7 + x['forecast_pnl'] * 0.3),
+        accept=lambda s: s['rsi'] > 45 and s['regime'] in ['trend', 'scalp', 'mean_reversion']
+    )
     symbols = get_symbols()
     print(f"🔍 Fetched {len(symbols)} symbols\n")
 
+    # one market context for the whole scan, even if it crosses a 15m close
+    context = market.context()
     for symbol in symbols:
-        signals = analyze(symbol)
+        signals = analyze(symbol, context=context)
         if signals:
             print(f"✅ {symbol}: {len(signals)} signal(s) generated")
         all_signals.extend(signals)
+    ranker.extend(compute_scores(ticks.round_signals(all_signals)))
 
     print(f"\n🧠 Total Signals Collected: {len(all_signals)}")
 
+    print(market.report())
+    print(symbol_universe.report())
+    print(ticks.report())
     if not all_signals:
         print("❌ No trade signals found.")
         return
 
-    # Filter and rank top 5 signals
-    filtered = [
-        s for s in all_signals 
-        if s['rsi'] > 45 and s['regime'] in ['trend', 'scalp', 'mean_reversion']
-    ]
-    top5 = sorted(
-        filtered, 
-        key=lambda x: (x['score'] * 0.7 + x['forecast_pnl'] * 0.3), 
-        reverse=True
-    )[:5]
+    top5 = ranker.top(5)
 
     if top5:
         print("\n🏆 Top 5 Signals:\n")
@@ -342,7 +310,7 @@ def main():
         print("\n⚠️ No top signals matched filter conditions.")
 
     # Export all signals (not just top 5)
-    export_signals_to_pdf(all_signals)
+    export_signals(all_signals)
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,12 @@
 # === Bybit Signal Bot with Fibonacci, Volume Confirmation, MA20 Limit Orders ===
 import requests
 from datetime import datetime, timezone, timedelta
-from fpdf import FPDF
+
+import precision
+import report_sinks
+import rolling
+import universe
+from ranking import TopK
 
 RISK_AMOUNT = 10
 LEVERAGE = 20
@@ -44,18 +49,7 @@ def calculate_macd(values, fast=12, slow=26, signal=9):
     return macd_line, signal_line, hist
 
 def calculate_bollinger_bands(values, period=20, std_dev=2):
-    sma_vals = sma(values, period)
-    bands = []
-    for i in range(len(values)):
-        if i < period - 1:
-            bands.append((None, None, None))
-        else:
-            mean = sma_vals[i]
-            std = (sum((x - mean) ** 2 for x in values[i + 1 - period:i + 1]) / period) ** 0.5
-            upper = mean + std_dev * std
-            lower = mean - std_dev * std
-            bands.append((upper, mean, lower))
-    return bands
+    return rolling.bollinger_bands(values, period, std_dev)
 
 def calculate_atr(highs, lows, closes, period=14):
     trs = [max(h - l, abs(h - c), abs(l - c)) for h, l, c in zip(highs[1:], lows[1:], closes[:-1])]
@@ -136,6 +130,7 @@ def analyze(symbol):
         return []
 
     entry = ma20[-1]
+    # 20-bar swing high / low
     fib = calculate_fib_levels(max(highs[-20:]), min(lows[-20:]), side)
     sl, tp = fib["sl"], fib["tp"]
     size = round(RISK_AMOUNT / abs(entry - sl), 4)
@@ -157,55 +152,65 @@ def analyze(symbol):
         "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     }]
 
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font("Helvetica", "B", 12)
-        self.cell(0, 10, "Top Bybit Signals", ln=True, align="C")
-        self.ln(5)
-
-    def add_signal(self, s, idx):
-        self.set_font("Helvetica", "B", 11)
-        self.cell(0, 10, f"{idx}. {s['symbol']} ({s['side']})", ln=True)
-        self.set_font("Helvetica", "", 10)
-        lines = [
-            f"Entry: {s['entry']} | TP: {s['tp']} | SL: {s['sl']}",
-            f"RSI: {s['rsi']} | MACD Hist: {s['macd_hist']}",
-            f"BB Breakout: {s['bb_breakout']} | Trend: {s['trend']}",
-            f"OB Bias: {s['orderbook_bias']} | Vol Spike: {'Yes' if s['volume_spike'] else 'No'}",
-            f"Size: {s['position_size']} | Score: {s['score']} | Time: {s['timestamp']}"
-        ]
-        for line in lines:
-            self.multi_cell(0, 8, line)
-        self.ln(3)
-
-def export_to_pdf(signals):
-    pdf = PDFReport()
-    pdf.add_page()
+def report_pdf():
+    from fpdf import FPDF  # only paid for when the pdf sink is on
+
+    class PDFReport(FPDF):
+        def header(self):
+            self.set_font("Helvetica", "B", 12)
+            self.cell(0, 10, "Top Bybit Signals", ln=True, align="C")
+            self.ln(5)
+
+        def add_signal(self, s, idx):
+            self.set_font("Helvetica", "B", 11)
+            self.cell(0, 10, f"{idx}. {s['symbol']} ({s['side']})", ln=True)
+            self.set_font("Helvetica", "", 10)
+            lines = [
+                f"Entry: {s['entry']} | TP: {s['tp']} | SL: {s['sl']}",
+                f"RSI: {s['rsi']} | MACD Hist: {s['macd_hist']}",
+                f"BB Breakout: {s['bb_breakout']} | Trend: {s['trend']}",
+                f"OB Bias: {s['orderbook_bias']} | Vol Spike: {'Yes' if s['volume_spike'] else 'No'}",
+                f"Size: {s['position_size']} | Score: {s['score']} | Time: {s['timestamp']}"
+            ]
+            for line in lines:
+                self.multi_cell(0, 8, line)
+            self.ln(3)
+
+    return PDFReport
+
+def render_pdf(pdf, signals):
     for i, sig in enumerate(signals, 1):
         pdf.add_signal(sig, i)
-    pdf.output("bybit_signals.pdf")
-    print("✅ PDF saved as bybit_signals.pdf")
+
+reports = report_sinks.ReportSinks("bybit_v4", layout=report_pdf, render=render_pdf)
+
+def export_signals(signals):
+    for path in reports.write(signals):
+        print(f"✅ Report saved as {path}")
+
+symbol_universe = universe.Universe("bybit")
+# prices and sizes snapped to each contract's tick size / lot step
+ticks = precision.Precision("bybit", symbol_universe)
 
 def get_symbols(limit=50):
     try:
-        url = "https://api.bybit.com/v5/market/instruments-info?category=linear"
-        data = requests.get(url).json()
-        return [s['symbol'] for s in data["result"]["list"] if s["symbol"].endswith("USDT")][:limit]
+        # cached instrument list, highest 24h turnover first, see universe.py
+        return symbol_universe.ranked(limit)
     except:
         return []
 
 def main():
     print("🔍 Scanning symbols...")
-    all_signals = []
+    ranker = TopK(20, key=lambda x: x['score'])
     for symbol in get_symbols():
         sigs = analyze(symbol)
         if sigs:
             print(f"✅ {symbol}: {len(sigs)} signal(s)")
-            all_signals.extend(sigs)
+            ranker.extend(ticks.round_signals(sigs))
 
-    all_signals = sorted(all_signals, key=lambda x: x['score'], reverse=True)[:5]
+    all_signals = ranker.top(5)
     if all_signals:
-        export_to_pdf(all_signals)
+        export_signals(all_signals)
     else:
         print("⚠️ No high-quality signals found.")
 
@@ -1,8 +1,14 @@
 import requests
-from fpdf import FPDF
 from datetime import datetime, timedelta, timezone
-from time import sleep
-import pytz
+
+import rate_limiter
+import scoring
+from diversify import ReturnsMatrix
+from memwatch import MemoryWatch
+from precision import Precision
+from ranking import TopK
+from report_sinks import ReportSinks
+from scheduler import CandleScheduler
 
 # === CONFIGURATION ===
 RISK_PCT = 0.15
@@ -18,6 +24,11 @@ DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/1392538366570135594/lwRH
 
 tz_utc3 = timezone(timedelta(hours=3))
 
+# main-timeframe returns of every analyzed symbol, see diversify.py
+returns = ReturnsMatrix("1h")
+# prices and sizes snapped to each contract's tick size / lot step, see precision.py
+ticks = Precision("bybit")
+
 # === DISCORD NOTIFY ===
 def send_discord(message):
     if not DISCORD_WEBHOOK_URL:
@@ -31,7 +42,7 @@ def send_discord(message):
 def get_candles(sym, interval):
     url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={sym}&interval={interval}&limit=200"
     try:
-        data = requests.get(url).json()
+        data = rate_limiter.get(url).json()
         return [{
             'high': float(c[2]),
             'low': float(c[3]),
@@ -104,6 +115,8 @@ def analyze(symbol):
         if len(candles) < 30:
             return None
         closes = [c['close'] for c in candles]
+        if tf == '60':
+            returns.observe(symbol, closes)
         volumes = [c['volume'] for c in candles]
         highs = [c['high'] for c in candles]
         lows = [c['low'] for c in candles]
@@ -157,17 +170,11 @@ def analyze(symbol):
     liq = round(entry * (1 - 1/LEVERAGE if side == 'LONG' else 1 + 1/LEVERAGE), 6)
     margin = round((ACCOUNT_BALANCE * RISK_PCT) / LEVERAGE, 6)
 
-    score = 0
-    score += 0.3 if tf['macd'] > 0 else 0
-    score += 0.2 if tf['rsi'] < 30 or tf['rsi'] > 70 else 0
-    score += 0.3 if bb_dir != "No" else 0.1
-    score += 0.2 if trend == "Trend" else 0.1
-
     return {
         'Symbol': symbol,
         'Side': side,
         'Type': trend,
-        'Score': round(score * 100, 1),
+        'Score': None,
         'Entry': round(entry, 6),
         'TP': tp,
         'SL': sl,
@@ -176,61 +183,73 @@ def analyze(symbol):
         'Market': price,
         'Liq': liq,
         'BB Slope': bb_dir,
+        'RSI': tf['rsi'],
+        'MACD': tf['macd'],
         'Time': datetime.now(tz_utc3).strftime("%Y-%m-%d %H:%M UTC+3")
     }
 
 # === PDF ===
-class SignalPDF(FPDF):
-    def header(self):
-        self.set_font("Arial", "B", 10)
-        self.cell(0, 10, "Bybit Futures Multi-TF Signals", 0, 1, "C")
-
-    def add_signals(self, signals):
-        for s in signals:
-            # Bold symbol header
-            self.set_font("Arial", "B", 8)
-            self.cell(0, 5, f"==================== {s['Symbol']} ====================", ln=1)
-
-            # TYPE
-            self.set_font("Arial", "", 8)
-            self.cell(45, 5, f"TYPE: {s['Type']}")
-
-            # Color-coded SIDE
-            if s['Side'] == "LONG":
-                self.set_text_color(0, 150, 0)  # green
-            else:
-                self.set_text_color(200, 0, 0)  # red
-            self.cell(40, 5, f"SIDE: {s['Side']}")
-
-            # Reset color for SCORE
-            self.set_text_color(0, 0, 0)
-            self.cell(0, 5, f"SCORE: {s['Score']}%", ln=1)
-
-            # Entry details
-            self.cell(65, 5, f"ENTRY: {s['Entry']}")
-            self.cell(65, 5, f"TP: {s['TP']}")
-            self.cell(0, 5, f"SL: {s['SL']}", ln=1)
-
-            # Market + BB direction + Trail
-            self.cell(65, 5, f"MARKET: {s['Market']}")
-            self.cell(65, 5, f"BB: {s['BB Slope']}")
-            self.cell(0, 5, f"TRAIL: {s['Trail']}", ln=1)
-
-            # Margin + Liq + Time
-            self.cell(65, 5, f"MARGIN: {s['Margin']}")
-            self.cell(65, 5, f"LIQ: {s['Liq']}")
-            self.cell(0, 5, f"TIME: {s['Time']}", ln=1)
-
-            # Footer separator
-            self.set_font("Arial", "B", 8)
-            self.cell(0, 5, "=" * 57, ln=1)
-            self.ln(2)
-
+def signal_pdf():
+    from fpdf import FPDF  # only paid for when the pdf sink is on
+
+    class SignalPDF(FPDF):
+        def header(self):
+            self.set_font("Arial", "B", 10)
+            self.cell(0, 10, "Bybit Futures Multi-TF Signals", 0, 1, "C")
+
+        def add_signals(self, signals):
+            for s in signals:
+                # Bold symbol header
+                self.set_font("Arial", "B", 8)
+                self.cell(0, 5, f"==================== {s['Symbol']} ====================", ln=1)
+
+                # TYPE
+                self.set_font("Arial", "", 8)
+                self.cell(45, 5, f"TYPE: {s['Type']}")
+
+                # Color-coded SIDE
+                if s['Side'] == "LONG":
+                    self.set_text_color(0, 150, 0)  # green
+                else:
+                    self.set_text_color(200, 0, 0)  # red
+                self.cell(40, 5, f"SIDE: {s['Side']}")
+
+                # Reset color for SCORE
+                self.set_text_color(0, 0, 0)
+                self.cell(0, 5, f"SCORE: {s['Score']}%", ln=1)
+
+                # Entry details
+                self.cell(65, 5, f"ENTRY: {s['Entry']}")
+                self.cell(65, 5, f"TP: {s['TP']}")
+                self.cell(0, 5, f"SL: {s['SL']}", ln=1)
+
+                # Market + BB direction + Trail
+                self.cell(65, 5, f"MARKET: {s['Market']}")
+                self.cell(65, 5, f"BB: {s['BB Slope']}")
+                self.cell(0, 5, f"TRAIL: {s['Trail']}", ln=1)
+
+                # Margin + Liq + Time
+                self.cell(65, 5, f"MARGIN: {s['Margin']}")
+                self.cell(65, 5, f"LIQ: {s['Liq']}")
+                self.cell(0, 5, f"TIME: {s['Time']}", ln=1)
+
+                # Footer separator
+                self.set_font("Arial", "B", 8)
+                self.cell(0, 5, "=" * 57, ln=1)
+                self.ln(2)
+
+    return SignalPDF
+
+
+# === SCORING ===
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py
+    return scoring.score_mtf(signals)
 
 # === MAIN ===
 def get_usdt_symbols():
     try:
-        r = requests.get("https://api.bybit.com/v5/market/tickers?category=linear")
+        r = rate_limiter.get("https://api.bybit.com/v5/market/tickers?category=linear")
         data = r.json()
         tickers = [i for i in data['result']['list'] if i['symbol'].endswith("USDT")]
         top_by_volume = sorted(tickers, key=lambda x: float(x['turnover24h']), reverse=True)
@@ -239,20 +258,29 @@ def get_usdt_symbols():
         return []
 
 def main():
+    sched = CandleScheduler()
+    mem = MemoryWatch()
+    reports = ReportSinks("bybit_v5", layout=signal_pdf, render=lambda pdf, sigs: pdf.add_signals(sigs), tz=tz_utc3)
     while True:
+        sched.start_scan()
         print("\n🔍 Scanning Bybit USDT Futures for filtered signals...\n")
         syms = get_usdt_symbols()
+        ranker = TopK(20, key=lambda x: x['Score'])
         signals = []
 
-        for sym in syms:
+        for i, sym in enumerate(syms):
+            if sched.should_shed():
+                sched.shed(len(syms) - i)
+                print(f"⏰ Scan budget used up, shedding {len(syms) - i} lowest-turnover symbols")
+                break
             sig = analyze(sym)
             if sig:
                 signals.append(sig)
-            sleep(0.3)
+        sched.end_scan()
+        ranker.extend(compute_scores(ticks.round_signals(signals)))
 
-        if signals:
-            signals.sort(key=lambda x: x['Score'], reverse=True)
-            top5 = signals[:5]
+        if ranker:
+            top5 = returns.diversified(ranker.top(), 5)
 
             for s in top5:
                 print(f"""
@@ -265,13 +293,10 @@ def main():
 =========================================================
 """)
 
-            pdf = SignalPDF()
-            pdf.add_page()
-            pdf.add_signals(signals[:20])
-            fname = f"signals_{datetime.now(tz_utc3).strftime('%H%M')}.pdf"
-            pdf.output(fname)
-            print(f"📄 PDF saved: {fname}")
-            print("♻️ Rescanning in 15 minutes...\n")
+            # top 20 to every sink in REPORT_SINKS
+            for fname in reports.write(ranker.top(20)):
+                print(f"📄 Report saved: {fname}")
+            print("♻️ Rescanning after the next 15m candle close...\n")
 
             # Discord Notification
             top_msg = "\n\n".join([
@@ -289,9 +314,16 @@ def main():
 
         else:
             print("⚠️ No valid signals found")
-            print("♻️ Rescanning in 15 minutes...\n")
-
-        sleep(900)
+            print("♻️ Rescanning after the next 15m candle close...\n")
+
+        print(sched.report())
+        print(rate_limiter.report())
+        print(returns.report())
+        print(reports.report())
+        mem_report = mem.end_cycle()
+        if mem_report:
+            print(mem_report)
+        sched.wait()
 
 if __name__ == "__main__":
     main()
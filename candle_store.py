@@ -0,0 +1,123 @@
+# === Local candle store (SQLite) ===
+# Every fetch_ohlcv / get_candles call can drop its raw klines here so later
+# stages (outcome tracking, warm starts, backtests) can read them back
+# without hitting the exchange again.
+import os
+import sqlite3
+import threading
+from time import time
+
+DB_PATH = os.environ.get("CANDLE_DB", "candles.db")
+
+# Bybit uses minute counts, Binance uses suffixed labels
+INTERVAL_MS = {
+    "1": 60_000, "1m": 60_000,
+    "5": 300_000, "5m": 300_000,
+    "15": 900_000, "15m": 900_000,
+    "30": 1_800_000, "30m": 1_800_000,
+    "60": 3_600_000, "1h": 3_600_000,
+    "240": 14_400_000, "4h": 14_400_000,
+    "D": 86_400_000, "1d": 86_400_000,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    venue TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (venue, symbol, interval, start)
+)
+"""
+
+_lock = threading.Lock()
+_conns = {}
+
+def connect(path=None):
+    path = path or DB_PATH
+    with _lock:
+        conn = _conns.get(path)
+        if conn is None:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            _conns[path] = conn
+        return conn
+
+# === WRITE ===
+def save_candles(venue, symbol, interval, rows, path=None):
+    # rows: [start_ms, open, high, low, close, volume], any order
+    if not rows:
+        return 0
+    conn = connect(path)
+    with _lock:
+        conn.executemany(
+            "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(venue, symbol, interval, int(r[0]), r[1], r[2], r[3], r[4], r[5]) for r in rows]
+        )
+        conn.commit()
+    return len(rows)
+
+# === READ ===
+def load_candles(venue, symbol, interval, since=None, limit=None, path=None):
+    conn = connect(path)
+    sql = "SELECT start, open, high, low, close, volume FROM candles WHERE venue=? AND symbol=? AND interval=?"
+    args = [venue, symbol, interval]
+    if since is not None:
+        sql += " AND start >= ?"
+        args.append(int(since))
+    if limit:
+        # newest N, returned oldest first like the exchange helpers
+        sql = f"SELECT * FROM ({sql} ORDER BY start DESC LIMIT ?) ORDER BY start"
+        args.append(int(limit))
+    else:
+        sql += " ORDER BY start"
+    with _lock:
+        return conn.execute(sql, args).fetchall()
+
+def load_many(venue, symbols, interval, since=None, path=None):
+    # one query for a whole batch of symbols, grouped per symbol, oldest first
+    if not symbols:
+        return {}
+    conn = connect(path)
+    marks = ",".join("?" * len(symbols))
+    sql = (f"SELECT symbol, start, open, high, low, close, volume FROM candles "
+           f"WHERE venue=? AND interval=? AND symbol IN ({marks})")
+    args = [venue, interval, *symbols]
+    if since is not None:
+        sql += " AND start >= ?"
+        args.append(int(since))
+    sql += " ORDER BY symbol, start"
+    out = {}
+    with _lock:
+        for row in conn.execute(sql, args):
+            out.setdefault(row[0], []).append(row[1:])
+    return out
+
+def missing_bars(venue, symbol, interval, limit, now_ms=None, path=None):
+    # how many of the newest `limit` bars still have to be downloaded: all of
+    # them unless the store holds an unbroken run up to a recent bar, in
+    # which case only the bars after it plus that bar (it may have been
+    # stored while still open)
+    step = INTERVAL_MS[interval]
+    current = (now_ms or int(time() * 1000)) // step * step
+    first = current - (limit - 1) * step
+    conn = connect(path)
+    with _lock:
+        last, count = conn.execute(
+            "SELECT MAX(start), COUNT(*) FROM candles WHERE venue=? AND symbol=? AND interval=? AND start >= ?",
+            (venue, symbol, interval, first)
+        ).fetchone()
+    if last is None or count != (last - first) // step + 1:
+        return limit
+    return min(int((current - last) // step) + 1, limit)
+
+def last_start(venue, symbol, interval, path=None):
+    conn = connect(path)
+    with _lock:
+        row = conn.execute(
+            "SELECT MAX(start) FROM candles WHERE venue=? AND symbol=? AND interval=?",
+            (venue, symbol, interval)
+        ).fetchone()
+    return row[0] if row else None
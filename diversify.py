@@ -0,0 +1,211 @@
+# === Correlation-aware Top-K ===
+# Five alts breaking out on the same side are usually one trade. This keeps
+# a rolling symbols x returns matrix (log returns of the last WINDOW closed
+# bars of the main timeframe, taken from candles the bot already fetched)
+# and picks the top K greedily: each pick is the best score after a penalty
+# for its highest side-adjusted correlation with the picks before it.
+# The co-moment matrix R @ R.T is updated incrementally: a new bar is one
+# outer-product add and one subtract over all symbols. Only rows whose
+# newest cells were missing (symbol skipped by tiering, new listing) are
+# recomputed in full, and everything is re-summed once every WINDOW bars
+# to keep float drift bounded, like rolling.RollingStats.
+#   returns.observe(symbol, closes)      from analyze(), any thread
+#   returns.diversified(candidates, k)   ranked candidates -> k picks
+import threading
+from time import time
+
+import numpy as np
+
+from candle_store import INTERVAL_MS
+from signal_schema import field
+
+WINDOW = 96          # closed bars per symbol (4 days of 1h)
+PENALTY = 40         # score points per unit of correlation with an earlier pick
+MIN_BARS = 24        # rows with fewer real returns than this are never penalized
+
+def side_sign(s):
+    return -1.0 if str(field(s, "side", "")).upper() == "SHORT" else 1.0
+
+class ReturnsMatrix:
+    def __init__(self, interval="1h", window=WINDOW, penalty=PENALTY):
+        self.step = INTERVAL_MS[interval]
+        self.window = window
+        self.penalty = penalty
+        self.index = {}                    # symbol -> row
+        self.symbols = []
+        self.R = np.zeros((0, window))     # return ring, column `head` holds bar `self.bar`
+        self.sx = np.zeros(0)
+        self.sxy = np.zeros((0, 0))
+        self.seen = np.zeros(0)            # newest bar with real data per row
+        self.real = np.zeros(0)            # real (not filled-in) returns per row
+        self.head = 0
+        self.bar = None
+        self.since_resum = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stats = {"bars": 0, "refreshed": 0, "rebuilds": 0, "pruned": 0, "swapped": 0}
+
+    # === INPUT ===
+    def observe(self, symbol, closes, now_ms=None):
+        # closes oldest first, the last one being the still-open bar
+        now_ms = now_ms or int(time() * 1000)
+        closed = np.array(closes, dtype=float)[-(self.window + 2):-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rets = np.diff(np.log(closed))
+        rets[~np.isfinite(rets)] = 0
+        with self.lock:
+            self.pending[symbol] = (rets, now_ms // self.step * self.step - self.step)
+
+    def _aligned(self, obs, bar):
+        # [n_obs, window] returns with the last column = bar; NaN where unknown
+        out = np.full((len(obs), self.window), np.nan)
+        for k, (rets, obs_bar) in enumerate(obs):
+            lag = (bar - obs_bar) // self.step
+            n = min(len(rets), self.window - lag)
+            if n > 0:
+                out[k, self.window - lag - n:self.window - lag] = rets[len(rets) - n:]
+        return out
+
+    # === UPDATE ===
+    def update(self, now_ms=None):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending and self.bar is None:
+            return
+        now_ms = now_ms or int(time() * 1000)
+        bar = max([b for _, b in pending.values()] + [now_ms // self.step * self.step - self.step])
+        for sym in pending:
+            if sym not in self.index:
+                self._add_row(sym)
+        rows = np.array([self.index[s] for s in pending], dtype=int)
+        obs = self._aligned(list(pending.values()), bar)
+        fresh = ~np.isnan(obs[:, -1])
+
+        previous = self.bar
+        lag = self.window if previous is None else (bar - previous) // self.step
+        if lag >= self.window:
+            self._rebuild(rows, obs, bar)
+        else:
+            for j in range(self.window - lag, self.window):
+                self._push(rows, obs[:, j])
+            self.bar = bar
+            # rows missing at some earlier bar had cells filled in; they get
+            # their real history back in one block
+            stale = fresh & (self.seen[rows] < previous)
+            self._refresh(rows[stale], obs[stale])
+        self.seen[rows[fresh]] = bar
+        self.real[rows] = np.maximum(self.real[rows], (~np.isnan(obs)).sum(axis=1))
+        self._prune()
+        if self.since_resum >= self.window:
+            self._resum()
+
+    def _add_row(self, sym):
+        self.index[sym] = len(self.symbols)
+        self.symbols.append(sym)
+        n = len(self.symbols)
+        self.R = np.vstack([self.R, np.zeros((1, self.window))])
+        self.sx = np.append(self.sx, 0.0)
+        sxy = np.zeros((n, n))
+        sxy[:-1, :-1] = self.sxy
+        self.sxy = sxy
+        self.seen = np.append(self.seen, -np.inf)
+        self.real = np.append(self.real, 0)
+
+    def _push(self, rows, values):
+        # one new bar: unobserved or unknown cells are filled in with 0
+        new = np.zeros(len(self.symbols))
+        new[rows] = np.nan_to_num(values)
+        self.head = (self.head + 1) % self.window
+        old = self.R[:, self.head]
+        self.sxy += np.outer(new, new) - np.outer(old, old)
+        self.sx += new - old
+        self.R[:, self.head] = new
+        self.stats["bars"] += 1
+        self.since_resum += 1
+
+    def _ring_order(self, obs):
+        # chronological [.., window] block -> ring layout ending at head
+        return np.roll(np.nan_to_num(obs), self.head + 1, axis=-1)
+
+    def _refresh(self, rows, obs):
+        if not len(rows):
+            return
+        self.R[rows] = self._ring_order(obs)
+        block = self.R @ self.R[rows].T
+        self.sxy[:, rows] = block
+        self.sxy[rows, :] = block.T
+        self.sx[rows] = self.R[rows].sum(axis=1)
+        self.stats["refreshed"] += len(rows)
+
+    def _rebuild(self, rows, obs, bar):
+        self.R[:] = 0
+        self.head = self.window - 1
+        self.bar = bar
+        self.R[rows] = self._ring_order(obs)
+        self._resum()
+        self.stats["rebuilds"] += 1
+
+    def _resum(self):
+        self.sxy = self.R @ self.R.T
+        self.sx = self.R.sum(axis=1)
+        self.since_resum = 0
+
+    def _prune(self):
+        # symbols without data for a whole window (delisted) leave the matrix
+        keep = self.seen >= self.bar - (self.window - 1) * self.step
+        if keep.all():
+            return
+        self.stats["pruned"] += int((~keep).sum())
+        self.symbols = [s for s, k in zip(self.symbols, keep) if k]
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.R, self.sx, self.seen, self.real = self.R[keep], self.sx[keep], self.seen[keep], self.real[keep]
+        self.sxy = self.sxy[np.ix_(keep, keep)]
+
+    # === CORRELATION ===
+    def corr(self, rows=None):
+        # Pearson correlation of the given rows (default: all), from the running sums
+        rows = np.arange(len(self.symbols)) if rows is None else np.asarray(rows, dtype=int)
+        mean = self.sx[rows] / self.window
+        cov = self.sxy[np.ix_(rows, rows)] / self.window - np.outer(mean, mean)
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        denom = np.outer(std, std)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = np.where(denom > 0, cov / denom, 0.0)
+        return np.clip(c, -1, 1)
+
+    # === SELECTION ===
+    def diversified(self, candidates, k=5, key=lambda s: field(s, "score", 0) or 0,
+                    symbol=lambda s: field(s, "symbol"), now_ms=None):
+        # candidates best first; greedy max(score - PENALTY * worst side-adjusted corr with picks)
+        self.update(now_ms)
+        m = len(candidates)
+        if m <= 1:
+            return list(candidates[:k])
+        scores = np.array([key(s) for s in candidates], dtype=float)
+        rows = np.array([self.index.get(symbol(s), -1) for s in candidates])
+        known = rows >= 0
+        known[known] &= self.real[rows[known]] >= MIN_BARS
+        c = np.zeros((m, m))
+        if known.sum() > 1:
+            c[np.ix_(known, known)] = self.corr(rows[known])
+        sides = np.array([side_sign(s) for s in candidates])
+        # long/long at +0.8 is one bet, and so is long/short at -0.8
+        exposure = c * np.outer(sides, sides)
+        np.fill_diagonal(exposure, 0)
+        worst = np.zeros(m)
+        taken = np.zeros(m, dtype=bool)
+        picks = []
+        for _ in range(min(k, m)):
+            adj = np.where(taken, -np.inf, scores - self.penalty * np.clip(worst, 0, None))
+            best = int(np.argmax(adj))   # ties go to the better-ranked candidate
+            taken[best] = True
+            picks.append(best)
+            worst = np.maximum(worst, exposure[:, best])
+        self.stats["swapped"] += int(sum(1 for i in picks if i >= k))
+        return [candidates[i] for i in picks]
+
+    def report(self):
+        st = self.stats
+        return (f"🧮 Correlation: {len(self.symbols)} symbols x {self.window} bars | {st['bars']} bar update(s), "
+                f"{st['refreshed']} row refresh(es), {st['rebuilds']} rebuild(s), {st['pruned']} pruned | "
+                f"{st['swapped']} correlated pick(s) swapped out of the top")
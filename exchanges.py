@@ -0,0 +1,100 @@
+# === Venue REST Helpers (Bybit v5 / Binance USDT-M) ===
+# Shared by multi_scanner.py, full_scan.py, funding.py and universe.py. Klines come back as
+# [start_ms, open, high, low, close, volume] rows, oldest first, on both venues.
+# Every call goes through rate_limiter so wide worker pools stay under the
+# venue's request-weight limits.
+from urllib.parse import quote
+
+import rate_limiter
+
+BYBIT_URL = "https://api.bybit.com"
+BINANCE_URL = "https://fapi.binance.com"
+REQUEST_TIMEOUT = 10
+BYBIT_INTERVALS = {'15m': '15', '1h': '60', '4h': '240'}
+INSTRUMENTS_PAGE = 1000     # Bybit instruments-info maximum
+
+def _num(v):
+    return float(v) if v not in (None, "") else None
+
+def to_candles(rows):
+    return [{'high': r[2], 'low': r[3], 'close': r[4], 'volume': r[5]} for r in rows]
+
+# === BYBIT ===
+def bybit_universe(session, limit=None):
+    data = rate_limiter.get(f"{BYBIT_URL}/v5/market/tickers?category=linear", session, timeout=REQUEST_TIMEOUT).json()
+    tickers = [t for t in data['result']['list'] if t['symbol'].endswith("USDT")]
+    tickers.sort(key=lambda x: float(x['turnover24h']), reverse=True)
+    return [t['symbol'] for t in tickers[:limit]]
+
+def bybit_instruments(session, etag=None):
+    # {symbol: metadata} over every cursor page; the paged endpoint has no ETag, so never (None, ...)
+    out, cursor = {}, ""
+    while True:
+        url = f"{BYBIT_URL}/v5/market/instruments-info?category=linear&limit={INSTRUMENTS_PAGE}"
+        if cursor:
+            url += f"&cursor={quote(cursor, safe='')}"
+        data = rate_limiter.get(url, session, timeout=REQUEST_TIMEOUT).json()
+        if data.get('retCode'):
+            raise RuntimeError(f"instruments-info: {data.get('retMsg')}")
+        for s in data['result']['list']:
+            price, lot = s.get('priceFilter', {}), s.get('lotSizeFilter', {})
+            out[s['symbol']] = {"tick": _num(price.get('tickSize')), "step": _num(lot.get('qtyStep')),
+                                "min_qty": _num(lot.get('minOrderQty')), "min_notional": _num(lot.get('minNotionalValue')),
+                                "type": s.get('contractType'), "status": s.get('status'), "quote": s.get('quoteCoin')}
+        cursor = data['result'].get('nextPageCursor')
+        if not cursor:
+            return out, None
+
+def bybit_klines(session, symbol, tf, limit=200):
+    url = f"{BYBIT_URL}/v5/market/kline?category=linear&symbol={symbol}&interval={BYBIT_INTERVALS[tf]}&limit={limit}"
+    rows = rate_limiter.get(url, session, timeout=REQUEST_TIMEOUT).json()['result']['list']
+    return [[int(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])] for c in reversed(rows)]
+
+def bybit_funding(session):
+    # {symbol: [funding_rate, open_interest, next_funding_ms]}, whole universe in one call
+    data = rate_limiter.get(f"{BYBIT_URL}/v5/market/tickers?category=linear", session, timeout=REQUEST_TIMEOUT).json()
+    return {t['symbol']: [float(t['fundingRate']), float(t.get('openInterest') or 0) or None,
+                          int(t.get('nextFundingTime') or 0)]
+            for t in data['result']['list'] if t['symbol'].endswith("USDT") and t.get('fundingRate')}
+
+# === BINANCE ===
+def binance_universe(session, limit=None):
+    data = rate_limiter.get(f"{BINANCE_URL}/fapi/v1/ticker/24hr", session, timeout=REQUEST_TIMEOUT).json()
+    tickers = [t for t in data if t['symbol'].endswith("USDT")]
+    tickers.sort(key=lambda x: float(x['quoteVolume']), reverse=True)
+    return [t['symbol'] for t in tickers[:limit]]
+
+def binance_instruments(session, etag=None):
+    # exchangeInfo in one request; (None, etag) when the server answers 304 to If-None-Match
+    headers = {"If-None-Match": etag} if etag else {}
+    r = rate_limiter.get(f"{BINANCE_URL}/fapi/v1/exchangeInfo", session, headers=headers, timeout=REQUEST_TIMEOUT)
+    if r.status_code == 304:
+        return None, etag
+    r.raise_for_status()
+    out = {}
+    for s in r.json()['symbols']:
+        f = {x['filterType']: x for x in s.get('filters', [])}
+        out[s['symbol']] = {"tick": _num(f.get('PRICE_FILTER', {}).get('tickSize')),
+                            "step": _num(f.get('LOT_SIZE', {}).get('stepSize')),
+                            "min_qty": _num(f.get('LOT_SIZE', {}).get('minQty')),
+                            "min_notional": _num(f.get('MIN_NOTIONAL', {}).get('notional')),
+                            "type": s.get('contractType'), "status": s.get('status'), "quote": s.get('quoteAsset')}
+    return out, r.headers.get("ETag")
+
+def binance_klines(session, symbol, tf, limit=200):
+    url = f"{BINANCE_URL}/fapi/v1/klines?symbol={symbol}&interval={tf}&limit={limit}"
+    rows = rate_limiter.get(url, session, timeout=REQUEST_TIMEOUT).json()
+    return [[int(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4]), float(c[5])] for c in rows]
+
+def binance_funding(session):
+    # premiumIndex covers funding for every symbol; open interest is per-symbol only there, so None
+    data = rate_limiter.get(f"{BINANCE_URL}/fapi/v1/premiumIndex", session, timeout=REQUEST_TIMEOUT).json()
+    return {t['symbol']: [float(t['lastFundingRate']), None, int(t.get('nextFundingTime') or 0)]
+            for t in data if t['symbol'].endswith("USDT") and t.get('lastFundingRate') not in (None, "")}
+
+VENUES = {
+    "Bybit": {"universe": bybit_universe, "instruments": bybit_instruments, "klines": bybit_klines,
+              "funding": bybit_funding},
+    "Binance": {"universe": binance_universe, "instruments": binance_instruments, "klines": binance_klines,
+                "funding": binance_funding},
+}
@@ -0,0 +1,147 @@
+# === Full-universe Scan Mode ===
+# Scans every listed linear USDT contract on a venue instead of the top
+# MAX_SYMBOLS. Three things keep it inside one candle period:
+#   - concurrent fetches: one (symbol, timeframe) job per request on a wide
+#     pool sharing a single keep-alive session per venue
+#   - incremental candles: after the first scan only the bars that opened
+#     since the last one (plus the still-open bar) are requested and merged
+#     into an in-memory cache of fixed-capacity ring buffers
+#   - batched indicators: batch_indicators computes every symbol of a
+#     timeframe in one numpy pass, then mtf_signals.evaluate_snapshots decides
+#   - optionally across cores: with PROCESSES > 1 that pass runs on a process
+#     pool over shared-memory candles, see parallel_scan.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import batch_indicators
+import mtf_signals
+import parallel_scan
+from ring_buffer import RingBuffer
+from candle_store import INTERVAL_MS
+from exchanges import VENUES
+
+# === CONFIGURATION ===
+INTERVALS = ['15m', '1h', '4h']
+MAIN_TF = '1h'
+MAX_BARS = 200
+MIN_BARS = 30
+WORKERS = 32
+PROCESSES = parallel_scan.PROCESSES
+PARALLEL_MIN_SYMBOLS = 200   # below this the pool's overhead outweighs the split
+# Binance weighs klines by limit (<100 bars = 1, <500 = 2 per request), so its
+# cold start stays at 99 bars to fit a full universe into the 2400/min budget
+COLD_LIMIT = {"Bybit": MAX_BARS, "Binance": 99}
+
+# === INCREMENTAL CANDLE CACHE ===
+class CandleCache:
+    def __init__(self, max_bars=MAX_BARS):
+        self.max_bars = max_bars
+        self.series = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "cold": 0, "bars": 0}
+
+    def limit_for(self, key, tf, cold_limit, now_ms):
+        rows = self.series.get(key)
+        if not rows:
+            return cold_limit
+        # bars opened since the last cached one, plus that one (it may have been open)
+        return max(2, min(self.max_bars, int(now_ms - rows.last()[0]) // INTERVAL_MS[tf] + 1))
+
+    def merge(self, key, fresh):
+        with self.lock:
+            rows = self.series.get(key)
+            if rows is None:
+                rows = self.series[key] = RingBuffer(self.max_bars, 6)
+            if fresh:
+                rows.truncate_from(fresh[0][0])
+                rows.extend(fresh)
+            self.stats["bars"] += len(fresh)
+
+    def prune(self, venue, listed):
+        with self.lock:
+            self.series = {k: v for k, v in self.series.items() if k[0] != venue or k[1] in listed}
+
+_cache = CandleCache()
+_sessions = {}
+
+def _session(venue):
+    if venue not in _sessions:
+        s = requests.Session()
+        s.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=WORKERS))
+        _sessions[venue] = s
+    return _sessions[venue]
+
+# === SCAN ===
+def _fetch(venue, session, symbol, tf, now_ms, sched):
+    if sched and sched.should_shed():
+        return None
+    key = (venue, symbol, tf)
+    cold = key not in _cache.series
+    limit = _cache.limit_for(key, tf, COLD_LIMIT.get(venue, MAX_BARS), now_ms)
+    try:
+        rows = VENUES[venue]["klines"](session, symbol, tf, limit)
+    except Exception as e:
+        print(f"[{venue}] {symbol} {tf}: {e}")
+        return False
+    _cache.merge(key, rows)
+    with _cache.lock:
+        _cache.stats["requests"] += 1
+        _cache.stats["cold"] += cold
+    return True
+
+def _evaluate(venue, symbols, fresh, intervals, main_tf):
+    snaps = {tf: batch_indicators.snapshots(
+        {sym: _cache.series[(venue, sym, tf)].array() for sym in symbols if (sym, tf) in fresh}, MIN_BARS)
+        for tf in intervals}
+    signals = []
+    for sym in symbols:
+        data = {tf: snaps[tf][sym] for tf in intervals if sym in snaps[tf]}
+        if len(data) != len(intervals):
+            continue
+        sig = mtf_signals.evaluate_snapshots(sym, data, main_tf)
+        if sig:
+            signals.append(sig)
+    return signals
+
+def closes(venue, symbol, tf):
+    # cached closes, oldest first (last one still open), or None
+    rows = _cache.series.get((venue, symbol, tf))
+    return rows.array()[:, 4] if rows else None
+
+def scan_venue(venue, sched=None, intervals=INTERVALS, main_tf=MAIN_TF):
+    started = perf_counter()
+    session = _session(venue)
+    try:
+        symbols = VENUES[venue]["universe"](session, None)
+    except Exception as e:
+        print(f"[{venue}] Failed to get USDT symbols: {e}")
+        return venue, [], [], perf_counter() - started
+    _cache.prune(venue, set(symbols))
+
+    now_ms = int(time() * 1000)
+    jobs = [(sym, tf) for sym in symbols for tf in intervals]
+    with ThreadPoolExecutor(WORKERS) as pool:
+        ok = list(pool.map(lambda j: _fetch(venue, session, j[0], j[1], now_ms, sched), jobs))
+    if sched:
+        sched.shed(ok.count(None))
+    fetched = perf_counter()
+
+    # stale series of a failed or shed fetch are not evaluated this cycle
+    fresh = {job for job, r in zip(jobs, ok) if r}
+    if PROCESSES > 1 and len(symbols) >= PARALLEL_MIN_SYMBOLS:
+        series = {sym: {tf: _cache.series[(venue, sym, tf)].array() for tf in intervals if (sym, tf) in fresh}
+                  for sym in symbols}
+        signals = parallel_scan.scan(series, intervals, main_tf, PROCESSES, MIN_BARS)
+    else:
+        signals = _evaluate(venue, symbols, fresh, intervals, main_tf)
+    for sig in signals:
+        sig['Venue'] = venue
+    done = perf_counter()
+
+    print(f"[{venue}] full universe: {len(symbols)} symbols, {len(jobs)} requests "
+          f"({ok.count(False)} failed, {ok.count(None)} shed) | fetch {fetched - started:.1f}s, indicators {done - fetched:.2f}s")
+    return venue, symbols, signals, done - started
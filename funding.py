@@ -0,0 +1,94 @@
+# === Funding Rate / Open Interest Enrichment ===
+# Adds funding_rate, open_interest and oi_change_pct to a scan's signals
+# before scoring, without a single per-symbol request: the whole universe
+# comes from one bulk call (Bybit tickers, Binance premiumIndex), and that
+# snapshot is reused until the venue's next funding time. The snapshot and
+# the previous one's open interest are kept in a JSON file, so the one-shot
+# bots share it across runs too. oi_change_pct compares open interest with
+# the snapshot of the previous funding interval.
+import json
+import os
+from time import time
+
+from exchanges import VENUES
+from signal_schema import field
+
+STATE_FILE = os.environ.get("FUNDING_STATE", "funding_state.json")
+DEFAULT_INTERVAL_MS = 8 * 3600 * 1000   # when the venue reports no next funding time
+VENUE_NAMES = {"bybit": "Bybit", "binance": "Binance"}
+
+class FundingCache:
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.state = {}
+        self.stats = {"requests": 0, "hits": 0, "errors": 0}
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self.state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[FUNDING] could not read {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "w") as f:
+                json.dump(self.state, f)
+        except OSError as e:
+            print(f"[FUNDING] could not write {self.path}: {e}")
+
+    def snapshot(self, venue, session=None, now_ms=None):
+        # {"rates": {symbol: [funding_rate, open_interest, next_ms]}, "previous_oi": {...}, ...}
+        name = VENUE_NAMES.get(venue.lower(), venue)
+        now_ms = now_ms or int(time() * 1000)
+        entry = self.state.get(name)
+        if entry and now_ms < entry["expires"]:
+            self.stats["hits"] += 1
+            return entry
+        fetch = VENUES.get(name, {}).get("funding")
+        if fetch is None:
+            return entry or {}
+        try:
+            rates = fetch(session)
+            self.stats["requests"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[FUNDING] {name}: {e}")
+            return entry or {}    # a stale snapshot beats no features
+        upcoming = [r[2] for r in rates.values() if r[2] > now_ms]
+        previous = {s: r[1] for s, r in (entry or {}).get("rates", {}).items() if r[1]}
+        entry = {"fetched": now_ms, "expires": min(upcoming) if upcoming else now_ms + DEFAULT_INTERVAL_MS,
+                 "rates": rates, "previous_oi": previous}
+        self.state[name] = entry
+        self._save()
+        return entry
+
+    def report(self):
+        st = self.stats
+        return f"💸 Funding: {st['requests']} bulk request(s), {st['hits']} cache hit(s), {st['errors']} error(s)"
+
+_cache = None
+
+def enrich(signals, venue, cache=None, session=None):
+    # fills funding_rate / open_interest / oi_change_pct in place where known
+    global _cache
+    if not signals:
+        return signals
+    if cache is None:
+        cache = _cache = _cache or FundingCache()
+    snap = cache.snapshot(venue, session)
+    rates, previous = snap.get("rates", {}), snap.get("previous_oi", {})
+    for s in signals:
+        sym = field(s, "symbol")
+        r = rates.get(sym)
+        if r is None:
+            continue
+        s["funding_rate"], s["open_interest"] = r[0], r[1]
+        if r[1] and previous.get(sym):
+            s["oi_change_pct"] = round((r[1] / previous[sym] - 1) * 100, 2)
+    return signals
@@ -0,0 +1,323 @@
+# === HTTP Record / Replay ===
+# Sits under requests (HTTPAdapter.send), so every bot is covered without
+# code changes. Record mode passes traffic through and appends each GET
+# exchange to a gzip JSONL archive, flushed per entry so a killed scan still
+# leaves a readable file. Replay mode answers from the archive only: same
+# URL, same responses in the recorded order, either at full speed or with
+# each response's recorded latency. Nothing leaves the machine during replay;
+# webhook posts get an empty 204.
+#
+# datetime.now() in a replayed bot returns the wall clock the last response
+# served to that thread was recorded at, so timestamps inside signals come
+# out byte-identical too. time() in the state modules (candle warm start,
+# caches, dedup) is pinned to the recording's start, and every state file
+# lives in a temp dir for both record and replay, so a replay asks for the
+# same URLs as the recording and never touches the production state.
+#   python http_replay.py record  scan.jsonl.gz bybit-bot-v1.py [args...]
+#   python http_replay.py replay  scan.jsonl.gz bybit-bot-v1.py [--recorded-timing]
+#   python http_replay.py analyze scan.jsonl.gz bybit-bot-v1.py BTCUSDT [...]
+#   python http_replay.py info    scan.jsonl.gz
+import base64
+import gzip
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from time import sleep, time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+FORMAT = "http-replay/1"
+RECORD_METHODS = ("GET",)
+DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+# env var -> file name of every piece of bot state, redirected by _offline_env()
+STATE_ENV = {"CANDLE_DB": "candles.db", "DEDUP_STATE": "dedup_state.json", "UNIVERSE_CACHE": "universe_cache.json",
+             "FUNDING_STATE": "funding_state.json", "REGIME_STATE": "regime_state.json"}
+CLOCK_MODULES = ("candle_store", "funding", "market_regime", "outcome_tracker", "signal_dedup", "universe")
+
+def _pack(data):
+    if data is None:
+        return None
+    if isinstance(data, str):
+        data = data.encode()
+    try:
+        return {"text": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(data).decode()}
+
+def _unpack(field):
+    if field is None:
+        return None
+    return field["text"].encode("utf-8") if "text" in field else base64.b64decode(field["b64"])
+
+def content(entry):
+    return _unpack(entry["content"])
+
+def load(path):
+    # -> (header, [entries]); a truncated tail from an interrupted recording is dropped
+    header, entries = {}, []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                obj = json.loads(line)
+                if obj.get("format") == FORMAT:
+                    header = obj
+                else:
+                    entries.append(obj)
+        except (EOFError, OSError):
+            pass
+    return header, entries
+
+# === RECORD ===
+class Recorder:
+    def __init__(self, path, methods=RECORD_METHODS):
+        self.path = path
+        self.methods = methods
+        self.count = 0
+        self.started = time()
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"format": FORMAT, "started": self.started})
+
+    def _write(self, obj):
+        self._file.write(json.dumps(obj, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def add(self, method, url, body, status, reason, headers, content, elapsed):
+        if method not in self.methods:
+            return
+        entry = {"t": round(time() - self.started, 4), "ts": time(), "method": method, "url": url,
+                 "body": _pack(body), "status": status, "reason": reason,
+                 "headers": {k: v for k, v in headers.items() if k.lower() not in DROP_HEADERS},
+                 "content": _pack(content), "elapsed": round(elapsed, 4)}
+        with self._lock:
+            self._write(entry)
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+# === REPLAY ===
+class Player:
+    def __init__(self, path, timing="fast", speed=1.0, loop=True):
+        # timing: "fast" answers at once, "recorded" sleeps each response's recorded latency
+        # loop: once a URL's responses are used up keep serving them round-robin (load tests)
+        self.header, entries = load(path)
+        self.timing = timing
+        self.speed = speed
+        self.loop = loop
+        self.queues = {}
+        for e in entries:
+            self.queues.setdefault(self._key(e["method"], e["url"], _unpack(e["body"])), []).append(e)
+        self.served = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _key(method, url, body):
+        return method, url, body or b""
+
+    def next(self, method, url, body=None):
+        if isinstance(body, str):
+            body = body.encode()
+        key = self._key(method, url, body)
+        with self._lock:
+            queue = self.queues.get(key)
+            if not queue:
+                self.misses += 1
+                return None
+            i = self.served.get(key, 0)
+            self.served[key] = i + 1
+            if i >= len(queue):
+                i = i % len(queue) if self.loop else len(queue) - 1
+            entry = queue[i]
+        if self.timing == "recorded":
+            sleep(entry["elapsed"] / self.speed)
+        self._local.ts = entry.get("ts")
+        return entry
+
+    def clock(self):
+        # recorded wall clock of the last response this thread received
+        return getattr(self._local, "ts", None) or self.header.get("started") or time()
+
+def _response(request, entry):
+    r = requests.Response()
+    r.status_code = entry["status"]
+    r.reason = entry.get("reason", "")
+    r.headers = CaseInsensitiveDict(entry["headers"])
+    r.encoding = get_encoding_from_headers(r.headers)
+    r._content = _unpack(entry["content"]) or b""
+    r._content_consumed = True
+    r.url = request.url
+    r.request = request
+    r.elapsed = timedelta(seconds=entry.get("elapsed", 0))
+    return r
+
+def _empty_response(request, status=204):
+    return _response(request, {"status": status, "headers": {}, "content": None})
+
+# === INSTALL ===
+_original_send = HTTPAdapter.send
+_active = {}
+
+def _send(adapter, request, **kwargs):
+    player, recorder = _active.get("player"), _active.get("recorder")
+    if player:
+        if request.method not in RECORD_METHODS:
+            return _empty_response(request)
+        entry = player.next(request.method, request.url, request.body)
+        if entry is None:
+            raise requests.ConnectionError(f"no recorded response for {request.method} {request.url}", request=request)
+        return _response(request, entry)
+    resp = _original_send(adapter, request, **kwargs)
+    if recorder:
+        recorder.add(request.method, request.url, request.body, resp.status_code, resp.reason,
+                     resp.headers, resp.content, resp.elapsed.total_seconds())
+    return resp
+
+@contextmanager
+def recording(path, methods=RECORD_METHODS):
+    rec = Recorder(path, methods)
+    _active["recorder"] = rec
+    HTTPAdapter.send = _send
+    try:
+        yield rec
+    finally:
+        HTTPAdapter.send = _original_send
+        _active.pop("recorder", None)
+        rec.close()
+
+@contextmanager
+def replaying(path, timing="fast", speed=1.0, loop=True):
+    player = Player(path, timing, speed, loop)
+    _active["player"] = player
+    HTTPAdapter.send = _send
+    try:
+        yield player
+    finally:
+        HTTPAdapter.send = _original_send
+        _active.pop("player", None)
+
+def replay_datetime(player):
+    class ReplayDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(player.clock(), tz)
+    return ReplayDateTime
+
+# === BOT HOOKS ===
+def patch_bot(mod):
+    # bots with their own stdlib client (termux-bot's http_get(path)) get wrapped too
+    if hasattr(mod, "http_get") and hasattr(mod, "HOST"):
+        base, raw_get = f"https://{mod.HOST}", mod.http_get
+
+        def http_get(path):
+            player, recorder = _active.get("player"), _active.get("recorder")
+            if player:
+                entry = player.next("GET", base + path)
+                if entry is None:
+                    raise RuntimeError(f"no recorded response for GET {base + path}")
+                return _unpack(entry["content"])
+            body = raw_get(path)
+            if recorder:
+                recorder.add("GET", base + path, None, 200, "OK", {}, body, 0.0)
+            return body
+        mod.http_get = http_get
+    if _active.get("player"):
+        player = _active["player"]
+        fake = replay_datetime(player)
+        for m in (mod, sys.modules.get("mtf_signals")):
+            if m is not None and getattr(m, "datetime", None) is datetime:
+                m.datetime = fake
+        started = player.header.get("started") or time()
+        for name in CLOCK_MODULES:
+            m = sys.modules.get(name)
+            if m is not None and getattr(m, "time", None) is time:
+                m.time = lambda: started
+
+def load_bot(filename, argv=()):
+    sys.argv = [filename] + list(argv)
+    name = os.path.basename(filename)[:-3].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, filename)
+    mod = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(filename)))
+    spec.loader.exec_module(mod)
+    return mod
+
+def _offline_env():
+    # keep bot side effects (termux response cache, candles, caches, dedup and
+    # outcome state) away from the real ones; must run before the bot is imported
+    tmp = tempfile.mkdtemp(prefix="http-replay-")
+    os.environ["TERMUX_BOT_CACHE"] = os.path.join(tmp, "termux-cache")
+    for var, name in STATE_ENV.items():
+        os.environ[var] = os.path.join(tmp, name)
+    return tmp
+
+def main(args):
+    mode, path = args[0], args[1]
+    if mode == "info":
+        header, entries = load(path)
+        hosts = {}
+        for e in entries:
+            host = e["url"].split("/")[2]
+            hosts[host] = hosts.get(host, 0) + 1
+        span = entries[-1]["t"] if entries else 0
+        print(f"📼 {path}: {len(entries)} responses over {span:.1f}s, recorded "
+              f"{datetime.fromtimestamp(header.get('started', 0)):%Y-%m-%d %H:%M:%S}")
+        for host, n in sorted(hosts.items()):
+            print(f"   {host}: {n}")
+        return
+
+    bot, rest = args[2], args[3:]
+    _offline_env()
+    if mode == "record":
+        with recording(path) as rec:
+            mod = load_bot(bot, rest)
+            patch_bot(mod)
+            try:
+                mod.main()
+            except KeyboardInterrupt:
+                pass
+        print(f"📼 {rec.count} responses recorded to {path}")
+        return
+
+    timing = "recorded" if "--recorded-timing" in rest else "fast"
+    rest = [a for a in rest if a != "--recorded-timing"]
+    with replaying(path, timing) as player:
+        if mode == "analyze":
+            mod = load_bot(bot)
+            patch_bot(mod)
+            for symbol in rest:
+                if hasattr(mod, "VENUES"):
+                    # multi_scanner: VENUE:SYMBOL, e.g. Bybit:BTCUSDT
+                    venue, sym = symbol.split(":")
+                    signals = mod.analyze(venue, requests.Session(), sym)
+                else:
+                    signals = mod.analyze(symbol)
+                if hasattr(mod, "compute_scores"):
+                    # scores are filled per scan; score this symbol's signals on their own
+                    mod.compute_scores([s for s in (signals if isinstance(signals, list) else [signals]) if s])
+                print(json.dumps({"symbol": symbol, "signals": signals}, sort_keys=True, default=str))
+        else:
+            mod = load_bot(bot, rest)
+            patch_bot(mod)
+            try:
+                mod.main()
+            except KeyboardInterrupt:
+                pass
+    if player.misses:
+        print(f"⚠️ {player.misses} request(s) had no recorded response")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,174 @@
+# === Universe-Level Market Regime ===
+# The list-based bots used to call detect_market_trend() for every symbol:
+# three kline requests per symbol, for a trend vote that is really about the
+# market. This computes the market context once per candle close instead:
+#   trend     BTC and ETH per timeframe (close vs MA50, EMA9 vs EMA21), one
+#             vote per timeframe, in the trend_info shape the bots and
+#             scoring.py already use
+#   breadth   % of the scanned universe closing above its MA50, tallied from
+#             what analyze() already computed (observe), taken from the
+#             previous bar's scan so every symbol of a scan sees one value
+# The context and the breadth tally are kept in a JSON file, so the one-shot
+# bots reuse them across runs within the same candle.
+#   regime.context()                      once per scan in main(), passed to
+#                                         analyze / is_trade_allowed so a scan
+#                                         crossing a 15m close keeps one value
+#   regime.observe(symbol, close, ma50)   from analyze(), any thread
+import atexit
+import json
+import os
+import threading
+from time import time
+
+from candle_store import INTERVAL_MS
+from exchanges import VENUES
+
+STATE_FILE = os.environ.get("REGIME_STATE", "regime_state.json")
+LEADERS = ("BTCUSDT", "ETHUSDT")
+TIMEFRAMES = ("1h", "4h", "15m")     # same labels detect_market_trend() used
+TREND_BARS = 60
+BREADTH_MIN = 20          # symbols a tally needs before its breadth is used
+BREADTH_WEAK = 25         # % above MA50; longs are not taken below this
+BREADTH_STRONG = 75       # shorts are not taken above this
+VENUE_NAMES = {"bybit": "Bybit", "binance": "Binance"}
+
+def ema_last(values, period):
+    k = 2 / (period + 1)
+    e = sum(values[:period]) / period
+    for v in values[period:]:
+        e = v * k + e * (1 - k)
+    return e
+
+def trend_of(closes):
+    if len(closes) < 50:
+        return 'neutral'
+    close, ma50 = closes[-1], sum(closes[-50:]) / 50
+    ema9, ema21 = ema_last(closes, 9), ema_last(closes, 21)
+    if close > ma50 and ema9 > ema21:
+        return 'bullish'
+    if close < ma50 and ema9 < ema21:
+        return 'bearish'
+    return 'neutral'
+
+def combine(states):
+    # leaders agreeing (or one neutral) carry the vote, a split is neutral
+    net = sum(1 if s == 'bullish' else -1 if s == 'bearish' else 0 for s in states)
+    return 'bullish' if net > 0 else 'bearish' if net < 0 else 'neutral'
+
+class MarketRegime:
+    def __init__(self, venue, interval="1h", path=STATE_FILE, session=None):
+        self.venue = VENUE_NAMES.get(venue.lower(), venue)
+        self.step = INTERVAL_MS[interval]
+        # the fastest trend timeframe sets how often the context can change
+        self.refresh = min(INTERVAL_MS[tf] for tf in TIMEFRAMES)
+        self.path = path
+        self.session = session
+        self.lock = threading.Lock()
+        self.state = {"context": None, "tally": {"bar": None, "above": {}}, "breadth": None}
+        self.stats = {"computed": 0, "hits": 0, "requests": 0, "errors": 0}
+        self._load()
+        atexit.register(self.save)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self.state.update(json.load(f).get(self.venue, {}))
+        except (OSError, ValueError) as e:
+            print(f"[REGIME] could not read {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        with self.lock:
+            data[self.venue] = self.state
+            try:
+                with open(self.path, "w") as f:
+                    json.dump(data, f)
+            except OSError as e:
+                print(f"[REGIME] could not write {self.path}: {e}")
+
+    # === BREADTH ===
+    def observe(self, symbol, close, ma, now_ms=None):
+        if close is None or ma is None:
+            return
+        bar = (now_ms or int(time() * 1000)) // self.step * self.step
+        with self.lock:
+            self._roll(bar)
+            self.state["tally"]["above"][symbol] = bool(close > ma)
+
+    def _roll(self, bar):
+        # a tally from an earlier bar becomes the breadth later scans use
+        tally = self.state["tally"]
+        if tally["bar"] is not None and tally["bar"] < bar:
+            above = tally["above"]
+            if len(above) >= BREADTH_MIN:
+                self.state["breadth"] = {"bar": tally["bar"], "pct": round(sum(above.values()) / len(above) * 100, 1),
+                                         "symbols": len(above)}
+        if tally["bar"] != bar:
+            self.state["tally"] = {"bar": bar, "above": {}}
+
+    # === CONTEXT ===
+    def context(self, now_ms=None):
+        now_ms = now_ms or int(time() * 1000)
+        bar = now_ms // self.refresh * self.refresh
+        with self.lock:
+            ctx = self.state["context"]
+            if ctx and ctx["bar"] == bar:
+                self.stats["hits"] += 1
+                return ctx
+            self._roll(now_ms // self.step * self.step)
+            leaders = {sym: {tf: trend_of(self._closes(sym, tf, now_ms)) for tf in TIMEFRAMES} for sym in LEADERS}
+            trend = {tf: combine([leaders[sym][tf] for sym in LEADERS]) for tf in TIMEFRAMES}
+            breadth = self.state["breadth"]
+            ctx = {"bar": bar, "trend": trend, "leaders": leaders,
+                   "breadth": breadth["pct"] if breadth else None, "bias": _bias(trend, breadth)}
+            self.state["context"] = ctx
+            self.stats["computed"] += 1
+        self.save()
+        return ctx
+
+    def _closes(self, symbol, tf, now_ms):
+        fetch = VENUES[self.venue]["klines"]
+        try:
+            rows = fetch(self.session, symbol, tf, TREND_BARS + 1)
+            self.stats["requests"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[REGIME] {symbol} {tf}: {e}")
+            return []
+        # closed bars only, so the context holds until the next close
+        return [r[4] for r in rows if r[0] + INTERVAL_MS[tf] <= now_ms]
+
+    def report(self):
+        ctx, st = self.state["context"] or {}, self.stats
+        breadth = f"{ctx['breadth']}% above MA50" if ctx.get("breadth") is not None else "breadth n/a"
+        return (f"🌐 Market: {ctx.get('bias', 'n/a')} ({breadth}) | computed {st['computed']}x, "
+                f"{st['hits']} cache hit(s), {st['requests']} request(s), {st['errors']} error(s)")
+
+def _bias(trend, breadth):
+    votes = list(trend.values())
+    bull, bear = votes.count('bullish'), votes.count('bearish')
+    pct = breadth["pct"] if breadth else 50
+    if bull > bear and pct >= 50:
+        return 'bullish'
+    if bear > bull and pct <= 50:
+        return 'bearish'
+    return 'neutral'
+
+def is_trade_allowed(side, market):
+    # breadth veto shared by the bots' is_trade_allowed()
+    pct = (market or {}).get("breadth")
+    if pct is None:
+        return True
+    if side == 'LONG' and pct < BREADTH_WEAK:
+        return False
+    if side == 'SHORT' and pct > BREADTH_STRONG:
+        return False
+    return True
@@ -0,0 +1,79 @@
+# === Long-running Memory Watch ===
+# Opt-in leak detection for the `while True` bots (LONG_RUNNING=1 or
+# --long-running). tracemalloc is started once and every EVERY cycles a
+# snapshot is compared with the previous one. If traced memory grew by more
+# than GROWTH_KB in between, the source lines that grew most are reported.
+# RSS is sampled every cycle either way, so a week-long run shows whether
+# the process stays flat. tracemalloc costs memory and CPU of its own, so it
+# is off unless asked for.
+import gc
+import os
+import sys
+import tracemalloc
+
+LONG_RUNNING = os.getenv("LONG_RUNNING") == "1" or "--long-running" in sys.argv
+EVERY = 4             # cycles between tracemalloc snapshots
+GROWTH_KB = 256       # traced growth between snapshots that gets flagged
+TOP = 5               # source lines listed per flag
+FRAMES = 1
+
+_IGNORE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+class MemoryWatch:
+    def __init__(self, every=EVERY, growth_kb=GROWTH_KB, top=TOP, enabled=None):
+        self.enabled = LONG_RUNNING if enabled is None else enabled
+        self.every = every
+        self.growth_kb = growth_kb
+        self.top = top
+        self.cycle = 0
+        self.previous = None
+        self.findings = []
+        self.stats = {"start_rss_kb": rss_kb(), "rss_kb": 0, "peak_rss_kb": 0, "traced_kb": 0,
+                      "snapshots": 0, "flags": 0}
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(FRAMES)
+
+    def end_cycle(self):
+        # -> report text on snapshot cycles, "" otherwise
+        self.cycle += 1
+        st = self.stats
+        st["rss_kb"] = rss_kb()
+        st["peak_rss_kb"] = max(st["peak_rss_kb"], st["rss_kb"])
+        if not self.enabled or self.cycle % self.every:
+            return ""
+        gc.collect()
+        snap = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        st["snapshots"] += 1
+        st["traced_kb"] = tracemalloc.get_traced_memory()[0] // 1024
+        self.findings = []
+        if self.previous is not None:
+            diffs = snap.compare_to(self.previous, "lineno")
+            if sum(d.size_diff for d in diffs) > self.growth_kb * 1024:
+                st["flags"] += 1
+                self.findings = [d for d in diffs if d.size_diff > 0][:self.top]
+        self.previous = snap
+        return self.report()
+
+    def report(self):
+        st = self.stats
+        lines = [f"🧠 Memory: RSS {st['rss_kb'] / 1024:.1f} MB (start {st['start_rss_kb'] / 1024:.1f}, "
+                 f"peak {st['peak_rss_kb'] / 1024:.1f}) | traced {st['traced_kb'] / 1024:.1f} MB | "
+                 f"{st['flags']} growth flag(s) in {st['snapshots']} snapshots"]
+        for d in self.findings:
+            frame = d.traceback[0]
+            lines.append(f"   ⚠️ +{d.size_diff / 1024:.1f} KB ({d.count_diff:+d} blocks) "
+                         f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        return "\n".join(lines)
@@ -0,0 +1,173 @@
+# === Shared Multi-Timeframe Signal Pipeline ===
+# Venue-independent version of the indicator + analyze logic used by
+# bybitbot.py / binancebot.py. Callers fetch candles however they like and
+# pass {timeframe: [candle dicts]} in; everything from here on is pure.
+# 'Score' is left empty here: scoring.score_mtf() fills it for a whole scan
+# in one pass from the 'RSI' / 'MACD' / 'BB Slope' / 'Type' fields.
+from datetime import datetime, timedelta, timezone
+
+# === CONFIGURATION ===
+RISK_PCT = 0.015
+ACCOUNT_BALANCE = 100
+LEVERAGE = 20
+ENTRY_BUFFER_PCT = 0.002
+MIN_VOLUME = 1000
+MIN_ATR_PCT = 0.001
+RSI_ZONE = (20, 80)
+
+tz_utc3 = timezone(timedelta(hours=3))
+
+# === INDICATORS ===
+def ema(prices, period):
+    if len(prices) < period:
+        return None
+    mult = 2 / (period + 1)
+    val = sum(prices[:period]) / period
+    for p in prices[period:]:
+        val = (p - val) * mult + val
+    return val
+
+def sma(prices, period):
+    if len(prices) < period:
+        return None
+    return sum(prices[-period:]) / period
+
+def rsi(prices, period=14):
+    if len(prices) < period + 1:
+        return None
+    gains = [max(prices[i] - prices[i - 1], 0) for i in range(1, period + 1)]
+    losses = [max(prices[i - 1] - prices[i], 0) for i in range(1, period + 1)]
+    ag, al = sum(gains) / period, sum(losses) / period
+    rs = ag / (al + 1e-10)
+    return 100 - (100 / (1 + rs))
+
+def bollinger(prices, period=20, sd=2):
+    mid = sma(prices, period)
+    if mid is None:
+        return None, None, None
+    var = sum((p - mid) ** 2 for p in prices[-period:]) / period
+    std = var ** 0.5
+    return mid + sd * std, mid, mid - sd * std
+
+def atr(highs, lows, closes, period=14):
+    if len(highs) < period + 1:
+        return None
+    trs = [max(h - l, abs(h - c), abs(l - c)) for h, l, c in zip(highs[1:], lows[1:], closes[:-1])]
+    val = sum(trs[:period]) / period
+    for t in trs[period:]:
+        val = (val * (period - 1) + t) / period
+    return val
+
+def macd(prices):
+    fast = ema(prices, 12)
+    slow = ema(prices, 26)
+    if fast is None or slow is None:
+        return None
+    return fast - slow
+
+def classify_trend(ema9, ema21, sma20):
+    if ema9 > ema21 > sma20:
+        return "Trend"
+    if ema9 > ema21:
+        return "Swing"
+    return "Scalp"
+
+# === PIPELINE ===
+def tf_snapshot(candles):
+    closes = [c['close'] for c in candles]
+    highs = [c['high'] for c in candles]
+    lows = [c['low'] for c in candles]
+    bb_up, bb_mid, bb_low = bollinger(closes)
+    return {
+        'close': closes[-1],
+        'ema9': ema(closes, 9),
+        'ema21': ema(closes, 21),
+        'sma20': sma(closes, 20),
+        'rsi': rsi(closes),
+        'macd': macd(closes),
+        'bb_up': bb_up,
+        'bb_mid': bb_mid,
+        'bb_low': bb_low,
+        'atr': atr(highs, lows, closes),
+        'volume': candles[-1]['volume']
+    }
+
+def evaluate(symbol, frames, main_tf):
+    # frames: {tf: [candle dicts, oldest first]} for every timeframe to confirm on
+    data = {}
+    for tf, candles in frames.items():
+        if len(candles) < 30:
+            return None
+        data[tf] = tf_snapshot(candles)
+    return evaluate_snapshots(symbol, data, main_tf)
+
+def evaluate_snapshots(symbol, data, main_tf):
+    # data: {tf: tf_snapshot(...)}, computed per symbol or in batch
+    tf = data[main_tf]
+    if (tf['volume'] < MIN_VOLUME or tf['atr'] / tf['close'] < MIN_ATR_PCT or
+            not (RSI_ZONE[0] < tf['rsi'] < RSI_ZONE[1])):
+        return None
+
+    sides = []
+    for d in data.values():
+        if d['close'] > d['bb_up']:
+            sides.append('LONG')
+        elif d['close'] < d['bb_low']:
+            sides.append('SHORT')
+        elif d['close'] > d['ema21']:
+            sides.append('LONG')
+        elif d['close'] < d['ema21']:
+            sides.append('SHORT')
+
+    if len(set(sides)) != 1:
+        return None
+
+    price = tf['close']
+    trend = classify_trend(tf['ema9'], tf['ema21'], tf['sma20'])
+    bb_dir = "Up" if price > tf['bb_up'] else "Down" if price < tf['bb_low'] else "No"
+    opts = [e for e in (tf['sma20'], tf['ema9'], tf['ema21']) if e]
+    entry = min(opts, key=lambda x: abs(x - price))
+
+    side = sides[0]
+    tp = round(entry * (1.015 if side == 'LONG' else 0.985), 6)
+    sl = round(entry * (0.985 if side == 'LONG' else 1.015), 6)
+    trail = round(entry * (1 - ENTRY_BUFFER_PCT) if side == 'LONG' else entry * (1 + ENTRY_BUFFER_PCT), 6)
+    liq = round(entry * (1 - 1 / LEVERAGE) if side == 'LONG' else entry * (1 + 1 / LEVERAGE), 6)
+    try:
+        risk_amt = ACCOUNT_BALANCE * RISK_PCT
+        sl_diff = abs(entry - sl)
+        margin = round((risk_amt / sl_diff) * entry / LEVERAGE, 6)
+    except ZeroDivisionError:
+        margin = 1
+
+    return {
+        'Symbol': symbol,
+        'Side': side,
+        'Type': trend,
+        'Score': None,
+        'Entry': round(entry, 6),
+        'TP': tp,
+        'SL': sl,
+        'Trail': trail,
+        'Margin': margin,
+        'Market': price,
+        'Liq': liq,
+        'BB Slope': bb_dir,
+        'RSI': tf['rsi'],
+        'MACD': tf['macd'],
+        'Time': datetime.now(tz_utc3).strftime("%Y-%m-%d %H:%M UTC+3")
+    }
+
+# === FORMATTER ===
+def format_signal_block(s):
+    venue = f" [{s['Venue']}]" if s.get('Venue') else ""
+    confirmed = " ✅ CROSS-VENUE" if s.get('Confirmed') else ""
+    return (
+        f"==================== {s['Symbol']}{venue}{confirmed} ====================\n"
+        f"📊 TYPE: {s['Type']}     📈 SIDE: {s['Side']}     🏆 SCORE: {s['Score']}%\n"
+        f"💵 ENTRY: {s['Entry']}   🎯 TP: {s['TP']}         🛡️ SL: {s['SL']}\n"
+        f"💱 MARKET: {s['Market']} 📍 BB: {s['BB Slope']}    🔄 Trail: {s['Trail']}\n"
+        f"⚖️ MARGIN: {s['Margin']} ⚠️ LIQ: {s['Liq']}\n"
+        f"⏰ TIME: {s['Time']}\n"
+        "=========================================================\n"
+    )
@@ -0,0 +1,184 @@
+# === Multi-exchange Scanner: Bybit + Binance in one run ===
+# Pulls both USDT perpetual universes concurrently (one worker pool per
+# venue), runs the shared mtf_signals pipeline on every symbol, ranks all
+# signals in one list and flags cross-venue confirmation, i.e. the same
+# side on the same underlying on both venues. Scan time is bounded by the
+# slower venue instead of the sum of both.
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import requests
+
+import full_scan
+import mtf_signals
+import scoring
+from diversify import ReturnsMatrix
+from exchanges import VENUES, to_candles
+from memwatch import MemoryWatch
+from precision import Precision
+from ranking import TopK
+from scheduler import CandleScheduler
+from signal_dedup import SignalDeduplicator
+
+# === CONFIGURATION ===
+INTERVALS = ['15m', '1h', '4h']
+MAIN_TF = '1h'
+MAX_SYMBOLS = 100
+WORKERS_PER_VENUE = 8
+CONFIRM_BONUS = 10
+FULL_UNIVERSE = "--full" in sys.argv   # every listed USDT contract, see full_scan.py
+
+DISCORD_WEBHOOK_URL = os.environ.get("DISCORD_WEBHOOK_URL", "")
+TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "")
+
+# === NOTIFICATIONS ===
+def send_discord(message):
+    if not DISCORD_WEBHOOK_URL:
+        return
+    try:
+        requests.post(DISCORD_WEBHOOK_URL, json={"content": message})
+    except Exception as e:
+        print(f"Discord error: {e}")
+
+def send_telegram(message):
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        return
+    try:
+        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+        requests.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": message, "parse_mode": "Markdown"})
+    except Exception as e:
+        print(f"Telegram error: {e}")
+
+# === SYMBOL MAPPING ===
+# 1000PEPEUSDT (both), SHIB1000USDT (Bybit) vs 1000SHIBUSDT (Binance), ...
+MULTIPLIER = re.compile(r"^(1000+)?(.+?)(1000+)?USDT$")
+
+def canonical(symbol):
+    m = MULTIPLIER.match(symbol)
+    return m.group(2) if m else symbol
+
+# main-timeframe returns per underlying (both venues share a row), see diversify.py
+returns = ReturnsMatrix(MAIN_TF)
+# per-venue tick size / lot step rounding, see precision.py
+ticks = {venue: Precision(venue) for venue in VENUES}
+
+def map_symbols(universes):
+    # canonical base -> {venue: venue symbol}
+    mapping = {}
+    for venue, symbols in universes.items():
+        for sym in symbols:
+            mapping.setdefault(canonical(sym), {})[venue] = sym
+    return mapping
+
+# === SCAN ===
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py
+    return scoring.score_mtf(signals)
+
+def analyze(venue, session, symbol, sched=None):
+    if sched and sched.should_shed():
+        sched.shed(1)
+        return None
+    fetch = VENUES[venue]["klines"]
+    try:
+        frames = {tf: to_candles(fetch(session, symbol, tf)) for tf in INTERVALS}
+    except Exception as e:
+        print(f"[{venue}] {symbol}: {e}")
+        return None
+    returns.observe(canonical(symbol), [c['close'] for c in frames[MAIN_TF]])
+    sig = mtf_signals.evaluate(symbol, frames, MAIN_TF)
+    if sig:
+        sig['Venue'] = venue
+    return sig
+
+def scan_venue(venue, sched=None):
+    started = perf_counter()
+    with requests.Session() as session:
+        try:
+            symbols = VENUES[venue]["universe"](session, MAX_SYMBOLS)
+        except Exception as e:
+            print(f"[{venue}] Failed to get USDT symbols: {e}")
+            return venue, [], [], perf_counter() - started
+        with ThreadPoolExecutor(WORKERS_PER_VENUE) as pool:
+            results = pool.map(lambda sym: analyze(venue, session, sym, sched), symbols)
+            signals = [s for s in results if s]
+    return venue, symbols, signals, perf_counter() - started
+
+def scan_all(sched=None):
+    started = perf_counter()
+    if FULL_UNIVERSE:
+        scan = lambda venue: full_scan.scan_venue(venue, sched, INTERVALS, MAIN_TF)
+    else:
+        scan = lambda venue: scan_venue(venue, sched)
+    with ThreadPoolExecutor(len(VENUES)) as pool:
+        results = list(pool.map(scan, VENUES))
+
+    universes, signals = {}, []
+    for venue, symbols, sigs, secs in results:
+        print(f"🏦 {venue}: {len(symbols)} symbols, {len(sigs)} signal(s) in {secs:.1f}s")
+        universes[venue] = symbols
+        signals.extend(ticks[venue].round_signals(sigs))
+        if FULL_UNIVERSE:
+            for sym in symbols:
+                closes = full_scan.closes(venue, sym, MAIN_TF)
+                if closes is not None:
+                    returns.observe(canonical(sym), closes)
+    mapping = map_symbols(universes)
+    both = sum(1 for venues in mapping.values() if len(venues) > 1)
+    print(f"🔗 {both} symbols listed on both venues | total scan {perf_counter() - started:.1f}s")
+
+    sides = {}
+    for s in signals:
+        sides.setdefault(canonical(s['Symbol']), {})[s['Venue']] = s['Side']
+    for s in signals:
+        venue_sides = sides[canonical(s['Symbol'])]
+        s['Confirmed'] = len(venue_sides) > 1 and len(set(venue_sides.values())) == 1
+
+    # both venues are scored together, so Score Pct / Score Z compare across them
+    compute_scores(signals)
+    ranker = TopK(20, key=lambda x: x['Score'] + (CONFIRM_BONUS if x['Confirmed'] else 0))
+    ranker.extend(signals)
+    return ranker
+
+# === MAIN LOOP ===
+def main():
+    dedup = SignalDeduplicator("multi_scanner")
+    sched = CandleScheduler()
+    mem = MemoryWatch()
+    while True:
+        sched.start_scan()
+        print("\n🔍 Scanning Bybit + Binance USDT Futures for filtered signals...\n")
+        ranker = scan_all(sched)
+        sched.end_scan()
+
+        if ranker:
+            top5 = returns.diversified(ranker.top(), 5, key=ranker.key, symbol=lambda s: canonical(s['Symbol']))
+            for s in top5:
+                print(mtf_signals.format_signal_block(s))
+
+            fresh = dedup.filter(top5)
+            if fresh:
+                msg = "\n".join(mtf_signals.format_signal_block(s) for s in fresh)
+                send_discord("📊 **Top 5 Bybit + Binance Signals**\n\n" + msg)
+                send_telegram("📊 *Top 5 Bybit + Binance Signals*\n\n" + msg)
+                print(f"✅ {len(fresh)} signal(s) sent to Discord & Telegram.\n")
+            else:
+                print("🔕 Top signals unchanged since last alert, nothing sent.\n")
+            print(dedup.report())
+        else:
+            print("⚠️ No valid signals found\n")
+
+        print(sched.report())
+        print(returns.report())
+        mem_report = mem.end_cycle()
+        if mem_report:
+            print(mem_report)
+        print("⏳ Rescanning after the next 15m candle close...")
+        sched.wait(countdown=True)
+
+if __name__ == "__main__":
+    main()
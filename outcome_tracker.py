@@ -0,0 +1,250 @@
+# === Signal Outcome Tracker ===
+# Records every emitted signal and resolves it against the candles that were
+# stored afterwards in candle_store: TP hit, SL hit, liquidated or expired,
+# together with how long it took. All open signals of one venue/interval are
+# resolved in a single vectorized first-touch pass, and the realized win rate
+# per (strategy, side) is fed back into ranking through adjust_score().
+import threading
+from time import sleep, time
+
+import numpy as np
+
+import candle_store
+from signal_schema import field
+
+EXPIRY_BARS = 48          # signal is void if nothing is touched within N bars
+FEEDBACK_WEIGHT = 20      # score points per unit of win-rate edge
+MIN_SAMPLES = 10          # resolved signals needed before feedback kicks in
+LOOKBACK_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signal_outcomes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venue TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    side TEXT NOT NULL,
+    strategy TEXT,
+    entry REAL, tp REAL, sl REAL, liquidation REAL,
+    created INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    resolved INTEGER,
+    bars INTEGER,
+    pnl_pct REAL
+)
+"""
+
+_schema_ready = set()
+
+def _conn(path=None):
+    conn = candle_store.connect(path)
+    key = path or candle_store.DB_PATH
+    if key not in _schema_ready:
+        with candle_store._lock:
+            conn.execute(SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outcomes_status ON signal_outcomes (status, venue, interval)")
+            conn.commit()
+        _schema_ready.add(key)
+    return conn
+
+def _now_ms():
+    return int(time() * 1000)
+
+# === RECORD ===
+def record_signals(venue, signals, interval=None, now_ms=None, path=None):
+    conn = _conn(path)
+    now_ms = now_ms or _now_ms()
+    with candle_store._lock:
+        open_keys = set(conn.execute(
+            "SELECT symbol, side, strategy, interval FROM signal_outcomes WHERE status='open' AND venue=?",
+            (venue,)
+        ).fetchall())
+    rows = []
+    for s in signals:
+        tf = str(field(s, "timeframe") or interval)
+        key = (field(s, "symbol"), field(s, "side").upper(), field(s, "strategy"), tf)
+        if key in open_keys:
+            continue  # the same setup is still being tracked from an earlier scan
+        open_keys.add(key)
+        rows.append((venue, *key[:3], tf, field(s, "entry"), field(s, "tp"), field(s, "sl"),
+                     field(s, "liquidation"), now_ms))
+    if rows:
+        with candle_store._lock:
+            conn.executemany(
+                "INSERT INTO signal_outcomes (venue, symbol, side, strategy, interval, entry, tp, sl, liquidation, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.commit()
+    return len(rows)
+
+# === RESOLVE ===
+def _first_true(mask, width):
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), width)
+
+def _resolve_group(conn, venue, interval, sigs, now_ms, expiry_bars, path):
+    bar_ms = candle_store.INTERVAL_MS.get(interval, 3_600_000)
+    symbols = sorted({r[1] for r in sigs})
+    sym_idx = {s: i for i, s in enumerate(symbols)}
+    since = min(r[8] for r in sigs)
+    candles = candle_store.load_many(venue, symbols, interval, since=since, path=path)
+
+    # flatten every symbol's candles into one array, keyed by (symbol, start)
+    keys, highs, lows, closes = [], [], [], []
+    for sym in symbols:
+        base = sym_idx[sym] << 42
+        for start, o, h, l, c, v in candles.get(sym, []):
+            keys.append(base + start)
+            highs.append(h)
+            lows.append(l)
+            closes.append(c)
+    if not keys:
+        keys, highs, lows, closes = [0], [np.nan], [np.nan], [np.nan]
+    keys = np.asarray(keys, dtype=np.int64)
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    starts = keys & ((1 << 42) - 1)
+
+    ids = np.array([r[0] for r in sigs])
+    sidx = np.array([sym_idx[r[1]] for r in sigs], dtype=np.int64)
+    is_long = np.array([r[2] == "LONG" for r in sigs])
+    entry, tp, sl, liq = (np.array([np.nan if r[k] is None else r[k] for r in sigs], dtype=float) for k in (3, 4, 5, 6))
+    created = np.array([r[8] for r in sigs], dtype=np.int64)
+
+    # only bars that open after the signal count, so the bar it fired on is skipped
+    first = np.searchsorted(keys, (sidx << 42) + created, side="left")
+    end = np.searchsorted(keys, (sidx + 1) << 42, side="left")
+    width = expiry_bars
+    idx = first[:, None] + np.arange(width)[None, :]
+    valid = idx < end[:, None]
+    idx = np.minimum(idx, len(keys) - 1)
+    hi, lo = highs[idx], lows[idx]
+
+    up = is_long[:, None]
+    with np.errstate(invalid="ignore"):
+        tp_hit = np.where(up, hi >= tp[:, None], lo <= tp[:, None]) & valid
+        sl_hit = np.where(up, lo <= sl[:, None], hi >= sl[:, None]) & valid
+        liq_hit = np.where(up, lo <= liq[:, None], hi >= liq[:, None]) & valid
+    t_tp = _first_true(tp_hit, width)
+    t_sl = _first_true(sl_hit, width)
+    t_liq = _first_true(liq_hit, width)
+    t_stop = np.minimum(t_sl, t_liq)
+
+    covered = (end - first) >= width
+    stale = now_ms >= created + (width + 1) * bar_ms
+    # a TP and a stop inside the same bar is booked as the stop
+    status = np.full(len(sigs), "open", dtype=object)
+    status[(t_stop < width) & (t_sl <= t_liq)] = "sl"
+    status[(t_stop < width) & (t_liq < t_sl)] = "liquidated"
+    status[t_tp < t_stop] = "tp"
+    status[(status == "open") & (covered | stale)] = "expired"
+
+    hit_bar = np.where(status == "tp", t_tp, np.where(status == "expired", width - 1, t_stop))
+    last_valid = np.minimum(first + hit_bar, np.maximum(end - 1, first))
+    last_valid = np.minimum(last_valid, len(keys) - 1)
+    has_bar = last_valid < end
+    exit_px = np.select(
+        [status == "tp", status == "sl", status == "liquidated"],
+        [tp, sl, liq],
+        default=np.where(has_bar, closes[last_valid], np.nan)
+    )
+    sign = np.where(is_long, 1.0, -1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pnl = (exit_px - entry) / entry * sign * 100
+    resolved = np.where(has_bar, starts[last_valid] + bar_ms, now_ms)
+
+    done = status != "open"
+    updates = [
+        (status[i], int(resolved[i]), int(hit_bar[i]) + 1,
+         None if np.isnan(pnl[i]) else round(float(pnl[i]), 4), int(ids[i]))
+        for i in np.flatnonzero(done)
+    ]
+    if updates:
+        with candle_store._lock:
+            conn.executemany(
+                "UPDATE signal_outcomes SET status=?, resolved=?, bars=?, pnl_pct=? WHERE id=?", updates
+            )
+            conn.commit()
+    return len(updates)
+
+def resolve_open_signals(now_ms=None, expiry_bars=EXPIRY_BARS, path=None):
+    conn = _conn(path)
+    now_ms = now_ms or _now_ms()
+    with candle_store._lock:
+        rows = conn.execute(
+            "SELECT id, symbol, side, entry, tp, sl, liquidation, venue, created, interval "
+            "FROM signal_outcomes WHERE status='open'"
+        ).fetchall()
+    groups = {}
+    for r in rows:
+        groups.setdefault((r[7], r[9]), []).append(r)
+    resolved = 0
+    for (venue, interval), sigs in groups.items():
+        resolved += _resolve_group(conn, venue, interval, sigs, now_ms, expiry_bars, path)
+    return resolved
+
+def start_background_resolver(every=60, path=None):
+    def loop():
+        while True:
+            try:
+                resolve_open_signals(path=path)
+            except Exception as e:
+                print(f"[OUTCOME] resolver error: {e}")
+            sleep(every)
+    t = threading.Thread(target=loop, name="outcome-resolver", daemon=True)
+    t.start()
+    return t
+
+# === FEEDBACK INTO RANKING ===
+def realized_stats(lookback_days=LOOKBACK_DAYS, path=None):
+    conn = _conn(path)
+    since = _now_ms() - lookback_days * 86_400_000
+    with candle_store._lock:
+        rows = conn.execute(
+            "SELECT strategy, side, status, COUNT(*), AVG(pnl_pct), AVG(bars) FROM signal_outcomes "
+            "WHERE status != 'open' AND created >= ? GROUP BY strategy, side, status",
+            (since,)
+        ).fetchall()
+    stats = {}
+    for strategy, side, status, n, avg_pnl, avg_bars in rows:
+        st = stats.setdefault((strategy, side), {"n": 0, "wins": 0, "pnl_sum": 0.0, "by_status": {}})
+        st["n"] += n
+        st["pnl_sum"] += (avg_pnl or 0) * n
+        st["by_status"][status] = {"n": n, "avg_pnl": avg_pnl, "avg_bars": avg_bars}
+        if status == "tp":
+            st["wins"] += n
+    for st in stats.values():
+        st["win_rate"] = st["wins"] / st["n"]
+        st["avg_pnl"] = st["pnl_sum"] / st["n"]
+    return stats
+
+def adjust_score(s, stats, weight=FEEDBACK_WEIGHT, min_samples=MIN_SAMPLES):
+    score = field(s, "score")
+    st = stats.get((field(s, "strategy"), field(s, "side", "").upper()))
+    if score is None or not st or st["n"] < min_samples:
+        return score
+    entry, tp, sl = field(s, "entry"), field(s, "tp"), field(s, "sl")
+    risk, reward = abs(entry - sl), abs(tp - entry)
+    breakeven = risk / (risk + reward) if risk + reward else 0.5
+    s["hit_rate"] = round(st["win_rate"] * 100, 1)
+    return round(score + weight * (st["win_rate"] - breakeven), 2)
+
+# === REPORT ===
+def print_report(stats=None):
+    stats = stats if stats is not None else realized_stats()
+    if not stats:
+        print("📭 No resolved signals yet.")
+        return
+    print(f"{'Strategy':<16}{'Side':<7}{'N':>5}{'Win%':>8}{'AvgPnL%':>10}  Outcomes")
+    for (strategy, side), st in sorted(stats.items(), key=lambda kv: -kv[1]["n"]):
+        outcomes = ", ".join(
+            f"{k}:{v['n']} ({(v['avg_bars'] or 0):.1f} bars)" for k, v in sorted(st["by_status"].items())
+        )
+        print(f"{str(strategy):<16}{side:<7}{st['n']:>5}{st['win_rate'] * 100:>8.1f}{st['avg_pnl']:>10.2f}  {outcomes}")
+
+if __name__ == "__main__":
+    while True:
+        n = resolve_open_signals()
+        print(f"\n🔎 Resolved {n} signal(s)")
+        print_report()
+        sleep(60)
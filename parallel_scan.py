@@ -0,0 +1,175 @@
+# === Multiprocess Indicator Pass ===
+# Spreads indicator computation and signal evaluation over a process pool
+# for universes (or backtests) too large for one core. Candle arrays are
+# not pickled to the workers: the parent packs every series into a single
+# shared-memory float64 block, and each task only carries (start, length)
+# spans into it. Workers attach to the block by name, run
+# batch_indicators.snapshots + mtf_signals.evaluate_snapshots on their chunk
+# and send back one compact tuple per signal, which the parent turns back
+# into the usual signal dict.
+#   scan(series, ...)          {symbol: {tf: rows}} -> signals, like full_scan
+#   walk_forward(series, ...)  same evaluation at every main-timeframe bar
+# SCAN_PROCESSES sets the pool size (0 / 1: evaluate in-process).
+import atexit
+import multiprocessing as mp
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import batch_indicators
+import mtf_signals
+from candle_store import INTERVAL_MS
+
+# === CONFIGURATION ===
+PROCESSES = int(os.getenv("SCAN_PROCESSES", "0") or 0)
+MIN_BARS = 30
+TASKS_PER_PROCESS = 2    # few big chunks keep batch_indicators' numpy blocks wide
+ATTACHED = 2             # blocks a worker keeps mapped, one per concurrently scanned venue
+# forked children would inherit the fetch threads' locks and sessions
+START_METHOD = "forkserver" if sys.platform.startswith("linux") else "spawn"
+
+# signal fields sent back by the workers; 'Symbol' is filled in by the parent
+FIELDS = ('Side', 'Type', 'Score', 'Entry', 'TP', 'SL', 'Trail', 'Margin', 'Market',
+          'Liq', 'BB Slope', 'RSI', 'MACD', 'Time')
+
+# === SHARED CANDLES ===
+class SharedCandles:
+    # every series in one [total_rows, 6] block; spans[key] = (start_row, n_rows)
+    def __init__(self, series):
+        total = sum(len(rows) for rows in series.values())
+        self.shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 6 * 8)
+        self.rows = total
+        self.data = np.ndarray((total, 6), dtype=float, buffer=self.shm.buf)
+        self.spans = {}
+        pos = 0
+        for key, rows in series.items():
+            n = len(rows)
+            if n:
+                self.data[pos:pos + n] = rows
+            self.spans[key] = (pos, n)
+            pos += n
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.data = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# === WORKER ===
+_attached = {}   # name -> (shm, data), oldest first
+
+def _attach(name, rows):
+    # blocks of finished scans are unmapped once newer ones push them out
+    if name not in _attached:
+        while len(_attached) >= ATTACHED:
+            shm, data = _attached.pop(next(iter(_attached)))
+            del data
+            shm.close()
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = (shm, np.ndarray((rows, 6), dtype=float, buffer=shm.buf))
+    return _attached[name][1]
+
+def _view(data, span):
+    start, n = span
+    return data[start:start + n]
+
+def _evaluate(data, jobs, intervals, main_tf, min_bars):
+    # jobs: [(key, ((start, n) per interval))] -> [(key, record)]
+    snaps = {tf: batch_indicators.snapshots({key: _view(data, spans[i]) for key, spans in jobs}, min_bars)
+             for i, tf in enumerate(intervals)}
+    out = []
+    for key, _ in jobs:
+        frames = {tf: snaps[tf][key] for tf in intervals if key in snaps[tf]}
+        if len(frames) != len(intervals):
+            continue
+        sig = mtf_signals.evaluate_snapshots(key, frames, main_tf)
+        if sig:
+            out.append((key, tuple(sig[k] for k in FIELDS)))
+    return out
+
+def _task(name, rows, jobs, intervals, main_tf, min_bars):
+    return _evaluate(_attach(name, rows), jobs, intervals, main_tf, min_bars)
+
+# === POOL ===
+_pool = None
+_pool_lock = threading.Lock()
+
+def pool(processes):
+    # one pool for the whole run, shared by the venue threads
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._max_workers != processes:
+            shutdown()
+            _pool = ProcessPoolExecutor(processes, mp_context=mp.get_context(START_METHOD))
+        return _pool
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+atexit.register(shutdown)
+
+def _run(shared, jobs, intervals, main_tf, processes, min_bars):
+    if processes <= 1:
+        return _evaluate(shared.data, jobs, intervals, main_tf, min_bars)
+    size = -(-len(jobs) // (processes * TASKS_PER_PROCESS)) or 1
+    chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+    ex = pool(processes)
+    futures = [ex.submit(_task, shared.name, shared.rows, c, intervals, main_tf, min_bars) for c in chunks]
+    return [r for f in futures for r in f.result()]
+
+def _signal(symbol, record):
+    return {'Symbol': symbol, **dict(zip(FIELDS, record))}
+
+# === SCAN ===
+def scan(series, intervals, main_tf, processes=PROCESSES, min_bars=MIN_BARS):
+    # series: {symbol: {tf: rows oldest first}}; symbols missing a timeframe are skipped
+    flat = {(sym, tf): rows for sym, frames in series.items() for tf, rows in frames.items()}
+    with SharedCandles(flat) as shared:
+        jobs = [(sym, tuple(shared.spans[(sym, tf)] for tf in intervals))
+                for sym, frames in series.items() if all(tf in frames for tf in intervals)]
+        return [_signal(sym, rec) for sym, rec in _run(shared, jobs, intervals, main_tf, processes, min_bars)]
+
+# === WALK-FORWARD ===
+def walk_forward(series, intervals, main_tf, window=200, step=1, processes=PROCESSES, min_bars=MIN_BARS):
+    # evaluates every step-th main-timeframe bar on the last `window` bars of
+    # each timeframe that had closed by then, so higher timeframes never see
+    # the future; signals get 'Bar' = open time of the main-timeframe bar
+    flat = {(sym, tf): rows for sym, frames in series.items() for tf, rows in frames.items()}
+    main_ms = INTERVAL_MS[main_tf]
+    with SharedCandles(flat) as shared:
+        jobs = []
+        for sym, frames in series.items():
+            if not all(tf in frames for tf in intervals):
+                continue
+            starts = {tf: _view(shared.data, shared.spans[(sym, tf)])[:, 0].copy() for tf in intervals}
+            for i in range(min_bars - 1, len(frames[main_tf]), step):
+                closed_by = starts[main_tf][i] + main_ms
+                spans = []
+                for tf in intervals:
+                    pos = shared.spans[(sym, tf)][0]
+                    end = int(np.searchsorted(starts[tf], closed_by - INTERVAL_MS[tf], side="right"))
+                    n = min(end, window)
+                    spans.append((pos + end - n, n))
+                jobs.append(((sym, int(starts[main_tf][i])), tuple(spans)))
+        signals = []
+        for (sym, bar), rec in _run(shared, jobs, intervals, main_tf, processes, min_bars):
+            sig = _signal(sym, rec)
+            sig['Bar'] = bar
+            signals.append(sig)
+        return signals
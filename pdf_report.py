@@ -0,0 +1,103 @@
+# === Daily PDF Report ===
+# The looping bots used to build a fresh PDF every cycle under names like
+# signals_HHMM.pdf, which collide from one day to the next. Here every scan
+# renders only its own page(s), with the bot's own FPDF subclass (fonts,
+# header, layout unchanged), into a per-day folder:
+#   reports/<prefix>/<YYYY-MM-DD>/<HHMMSS>.pdf
+# so a scan costs the same at 23:45 as at 00:00. Days are merged lazily:
+# the first scan of a new day turns the previous days' folders into one
+# archive each, a single PDF with compressed streams when the optional
+# `pypdf` package is installed, a zip of the scan pages otherwise.
+# Archives older than REPORT_KEEP_DAYS are deleted.
+#   daily = DailyReport("signals", SignalPDF, tz=tz_utc3)
+#   daily.write(lambda pdf: pdf.add_signals(top20))   -> path of the scan's file
+import os
+import re
+import shutil
+import zipfile
+from datetime import datetime, timedelta
+
+REPORT_DIR = os.environ.get("REPORT_DIR", "reports")
+KEEP_DAYS = int(os.environ.get("REPORT_KEEP_DAYS", "7"))
+DAY = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+def cutoff(today, keep_days=KEEP_DAYS):
+    return (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=keep_days)).strftime("%Y-%m-%d")
+
+def expire(folder, today, keep_days=KEEP_DAYS):
+    # deletes day-named files / folders older than keep_days, returns how many
+    if not os.path.isdir(folder):
+        return 0
+    old = [n for n in os.listdir(folder) if DAY.match(n) and n[:10] < cutoff(today, keep_days)]
+    for name in old:
+        path = os.path.join(folder, name)
+        shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+    return len(old)
+
+class DailyReport:
+    def __init__(self, prefix, pdf_class, tz=None, directory=REPORT_DIR, keep_days=KEEP_DAYS):
+        self.root = os.path.join(directory, prefix)
+        self.pdf_class = pdf_class
+        self.tz = tz
+        self.keep_days = keep_days
+        self.day = None
+        self.stats = {"scans": 0, "archived": 0, "deleted": 0}
+
+    def write(self, render, now=None):
+        # render(pdf) fills a fresh document whose first page is already added
+        now = now or datetime.now(self.tz)
+        day = now.strftime("%Y-%m-%d")
+        if day != self.day:
+            self.day = day
+            self.rotate(day)
+        folder = os.path.join(self.root, day)
+        os.makedirs(folder, exist_ok=True)
+        pdf = self.pdf_class()
+        pdf.add_page()
+        render(pdf)
+        path = os.path.join(folder, now.strftime("%H%M%S") + ".pdf")
+        pdf.output(path)
+        self.stats["scans"] += 1
+        return path
+
+    # === ROTATION ===
+    def rotate(self, today):
+        self.stats["deleted"] += expire(self.root, today, self.keep_days)
+        if not os.path.isdir(self.root):
+            return
+        for name in sorted(os.listdir(self.root)):
+            if DAY.match(name) and name < today and os.path.isdir(os.path.join(self.root, name)):
+                self.archive(name)
+
+    def archive(self, day):
+        folder = os.path.join(self.root, day)
+        pages = sorted(f for f in os.listdir(folder) if f.endswith(".pdf"))
+        try:
+            from pypdf import PdfReader, PdfWriter   # only needed once a day
+        except ImportError:
+            PdfWriter = None
+        if PdfWriter is not None:
+            writer = PdfWriter()
+            for name in pages:
+                for page in PdfReader(os.path.join(folder, name)).pages:
+                    writer.add_page(page)
+            for page in writer.pages:
+                page.compress_content_streams()
+            target = os.path.join(self.root, day + ".pdf")
+            with open(target + ".tmp", "wb") as f:
+                writer.write(f)
+        else:
+            target = os.path.join(self.root, day + ".zip")
+            with zipfile.ZipFile(target + ".tmp", "w", zipfile.ZIP_DEFLATED) as z:
+                for name in pages:
+                    z.write(os.path.join(folder, name), name)
+        # the folder only goes once the archive is complete
+        os.replace(target + ".tmp", target)
+        shutil.rmtree(folder)
+        self.stats["archived"] += 1
+        return target
+
+    def report(self):
+        st = self.stats
+        return (f"🗂️ Reports: {st['scans']} scan page(s) in {self.root}, "
+                f"{st['archived']} day(s) archived, {st['deleted']} expired")
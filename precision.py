@@ -0,0 +1,101 @@
+# === Tick-Size Precision ===
+# build_signal() rounded every price to a fixed 6 decimals (4 in places), so
+# low-priced coins and coarse-tick contracts got prices the venue rejects.
+# Prices are snapped to the instrument's tickSize and sizes to its qtyStep
+# here, from the metadata universe.py already caches (one bulk instruments
+# call per UNIVERSE_TTL):
+#   prices          entry, tp, sl, trail, liquidation, Market: nearest tick
+#   position_size   down to the lot step; a size below the venue minimum
+#                   (minOrderQty, minNotional at the entry) is kept and the
+#                   signal marked unplaceable=True, never enlarged past the
+#                   bot's RISK_AMOUNT sizing
+# A whole scan is rounded in one numpy pass with a dict lookup per symbol;
+# symbols without metadata keep the bot's own rounding.
+#   ticks = Precision("bybit", symbol_universe)
+#   ticks.round_signals(signals)    in place, returns signals
+#   ticks.fmt(symbol, price)        price text with the tick's decimals
+import numpy as np
+
+from signal_schema import field, set_field
+from universe import Universe
+
+PRICE_FIELDS = ("entry", "tp", "sl", "trail", "liquidation", "market")
+SIZE_FIELD = "position_size"
+FALLBACK_DECIMALS = 8
+
+def decimals(step):
+    if not step:
+        return FALLBACK_DECIMALS
+    return len(f"{step:.12f}".rstrip("0").split(".")[1])
+
+def _column(signals, name):
+    values = (field(s, name) for s in signals)
+    return np.array([v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan for v in values],
+                    dtype=float)
+
+def _meta_column(metas, key, default=np.nan):
+    return np.array([m.get(key) or default for m in metas], dtype=float)
+
+class Precision:
+    def __init__(self, venue, universe=None):
+        self.universe = universe or Universe(venue)
+        self.instruments = {}
+        self.stats = {"rounded": 0, "unplaceable": 0, "unknown": 0}
+
+    def _load(self):
+        try:
+            self.instruments = self.universe.instruments()
+        except Exception as e:
+            if not self.instruments:
+                print(f"[PRECISION] {self.universe.venue}: {e}, keeping fixed decimals")
+        return self.instruments
+
+    def meta(self, symbol):
+        return self.instruments.get(symbol) or {}
+
+    # === ROUNDING ===
+    def round_signals(self, signals):
+        if not signals:
+            return signals
+        instruments = self._load()
+        metas = [instruments.get(field(s, "symbol")) or {} for s in signals]
+        tick = _meta_column(metas, "tick")
+        known = ~np.isnan(tick)
+        self.stats["unknown"] += int((~known).sum())
+        if not known.any():
+            return signals
+        for name in PRICE_FIELDS:
+            values = _column(signals, name)
+            ok = known & ~np.isnan(values)
+            if ok.any():
+                # the second round drops float noise like 0.30000000000000004
+                snapped = np.round(np.rint(values / tick) * tick, 12)
+                for i in np.flatnonzero(ok):
+                    set_field(signals[i], name, float(snapped[i]))
+
+        sizes, step = _column(signals, SIZE_FIELD), _meta_column(metas, "step")
+        ok = ~np.isnan(step) & (np.nan_to_num(sizes) > 0)
+        if ok.any():
+            entry = _column(signals, "entry")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                floor = np.floor(sizes / step + 1e-9) * step
+                least = np.maximum(_meta_column(metas, "min_qty", 0),
+                                   np.nan_to_num(_meta_column(metas, "min_notional", 0) / entry, posinf=0))
+            snapped = np.round(floor, 12)
+            short = ok & (snapped < least * (1 - 1e-9))
+            self.stats["unplaceable"] += int(short.sum())
+            for i in np.flatnonzero(ok):
+                set_field(signals[i], SIZE_FIELD, float(snapped[i]))
+                signals[i]["unplaceable"] = bool(short[i])
+        self.stats["rounded"] += int(known.sum())
+        return signals
+
+    def fmt(self, symbol, price):
+        if price is None:
+            return "n/a"
+        return f"{price:.{decimals(self.meta(symbol).get('tick'))}f}"
+
+    def report(self):
+        st = self.stats
+        return (f"📏 Precision: {st['rounded']} signal(s) snapped to tick size, "
+                f"{st['unplaceable']} size(s) below the venue minimum, {st['unknown']} without metadata")
@@ -0,0 +1,56 @@
+# === Incremental Top-K Ranking ===
+# Keeps only the best K signals in a bounded min-heap while analyze() results
+# stream in, instead of collecting everything and running sorted(...)[:5].
+# The ranking key is computed once per signal at push time; ties keep the
+# earlier signal ahead, same as a stable sort would.
+import heapq
+from itertools import count
+
+def by_score(s):
+    return s.get('score', s.get('Score', 0))
+
+class TopK:
+    def __init__(self, k=20, key=by_score, accept=None):
+        self.k = k
+        self.key = key
+        self.accept = accept
+        self.seen = 0
+        self._heap = []
+        self._seq = count()
+        self._sorted = None
+
+    def push(self, s):
+        if s is None or (self.accept and not self.accept(s)):
+            return False
+        self.seen += 1
+        item = (self.key(s), -next(self._seq), s)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+        else:
+            return False
+        self._sorted = None
+        return True
+
+    def extend(self, signals):
+        for s in signals:
+            self.push(s)
+
+    def top(self, n=None):
+        # the K kept items are ordered lazily once and reused until the next push
+        if self._sorted is None:
+            self._sorted = [item[2] for item in sorted(self._heap, key=lambda x: x[:2], reverse=True)]
+        return self._sorted[:n] if n else list(self._sorted)
+
+    def threshold(self):
+        # key a new signal has to beat once the heap is full
+        return self._heap[0][0] if len(self._heap) >= self.k else None
+
+    def clear(self):
+        self._heap.clear()
+        self._sorted = None
+        self.seen = 0
+
+    def __len__(self):
+        return len(self._heap)
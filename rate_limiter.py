@@ -0,0 +1,165 @@
+# === Adaptive Rate Limiter ===
+# One token bucket per venue, charged with each request's weight and shared
+# by every thread in the process:
+#   - Binance USDT-M: 2400 request weight per clock minute per IP; klines
+#     cost 1/2/5/10 by limit, the all-symbol 24hr ticker 40, exchangeInfo 1.
+#     The window is fixed, so the bucket refills to SAFETY of the limit at
+#     each minute boundary and a short scan can spend it in one burst.
+#   - Bybit v5: 600 requests per 5 s per IP, 1 per market request. Treated
+#     as a rolling window: half the budget as burst, the other half refilled
+#     continuously, so no 5 s span can exceed SAFETY of the limit.
+# The exchange's own count wins over ours: X-MBX-USED-WEIGHT-1M (Binance)
+# shrinks the bucket to what is really left, so other processes on the same
+# IP are accounted for. Bybit's X-Bapi-Limit-Status is a per-endpoint count
+# against X-Bapi-Limit, not the IP budget, so it only pauses the venue until
+# X-Bapi-Limit-Reset-Timestamp once that endpoint is nearly spent.
+# A 429 that still slips through blocks the venue for Retry-After and is
+# retried. A ban (Binance 418, Bybit 403, about 10 minutes) blocks it for
+# Retry-After or BAN_SECONDS and is not retried, so a banned IP is left alone.
+import threading
+from time import sleep, time
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+SAFETY = 0.9          # never plan to use more than this share of a limit
+RETRIES = 2
+BAN_SECONDS = 600     # Bybit's 403 IP ban carries no Retry-After
+
+def binance_weight(path, query):
+    if path.endswith("/klines"):
+        limit = int(query.get("limit", 500))
+        return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    if path.endswith("/ticker/24hr") or path.endswith("/ticker/price"):
+        return 1 if "symbol" in query else 40
+    if path.endswith("/premiumIndex"):
+        return 1 if "symbol" in query else 10
+    if path.endswith("/depth"):
+        limit = int(query.get("limit", 500))
+        return 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+    return 1
+
+def bybit_weight(path, query):
+    return 1
+
+class VenueLimiter:
+    def __init__(self, name, limit, window, weight, retry_statuses, fixed_window, ban_statuses=(),
+                 ban_seconds=BAN_SECONDS, clock=time, sleeper=sleep):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.weight = weight
+        self.retry_statuses = retry_statuses
+        self.ban_statuses = ban_statuses
+        self.ban_seconds = ban_seconds
+        self.fixed_window = fixed_window
+        budget = limit * SAFETY
+        self.capacity = budget if fixed_window else budget / 2
+        self.rate = 0 if fixed_window else budget / 2 / window
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleeper = sleeper
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "weight": 0, "waited": 0.0, "pauses": 0, "rejected": 0}
+
+    # === BUCKET ===
+    def _refill(self, now):
+        if self.fixed_window:
+            if now // self.window != self.updated // self.window:
+                self.tokens = self.capacity
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _next_window(self, now):
+        return (now // self.window + 1) * self.window
+
+    def acquire(self, cost=1):
+        cost = min(cost, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= cost:
+                        self.tokens -= cost
+                        self.stats["requests"] += 1
+                        self.stats["weight"] += cost
+                        self.stats["waited"] += waited
+                        return waited
+                    if self.fixed_window:
+                        wait = self._next_window(now) - now
+                    else:
+                        wait = (cost - self.tokens) / self.rate
+            self.sleeper(wait)
+            waited += wait
+
+    def block(self, until):
+        with self._lock:
+            if until > self.blocked_until:
+                self.blocked_until = until
+                self.tokens = 0
+                self.stats["pauses"] += 1
+
+    # === RESPONSE FEEDBACK ===
+    def observe(self, status, headers):
+        now = self.clock()
+        retry = headers.get("Retry-After")
+        if status in self.ban_statuses:
+            self.stats["rejected"] += 1
+            self.block(now + (float(retry) if retry else self.ban_seconds))
+            return
+        if status in self.retry_statuses:
+            self.stats["rejected"] += 1
+            self.block(now + float(retry) if retry else self._next_window(now))
+            return
+        left = None
+        if self.name == "binance":
+            used = headers.get("X-MBX-USED-WEIGHT-1M")
+            left = self.limit * SAFETY - int(used) if used else None
+        else:
+            remaining, cap = headers.get("X-Bapi-Limit-Status"), headers.get("X-Bapi-Limit")
+            if remaining and cap and int(remaining) <= int(cap) * (1 - SAFETY):
+                reset = headers.get("X-Bapi-Limit-Reset-Timestamp")
+                until = int(reset) / 1000 if reset else self._next_window(now)
+                self.block(min(until, now + self.window))
+        if left is not None:
+            with self._lock:
+                self._refill(now)
+                self.tokens = max(min(self.tokens, left), 0)
+
+    def report(self):
+        st = self.stats
+        return (f"🚦 {self.name}: {st['requests']} requests, weight {st['weight']:.0f}, "
+                f"waited {st['waited']:.1f}s (summed over threads), {st['pauses']} pause(s), {st['rejected']} rejected")
+
+LIMITERS = {
+    "fapi.binance.com": VenueLimiter("binance", 2400, 60, binance_weight, (429,), fixed_window=True, ban_statuses=(418,)),
+    "api.bybit.com": VenueLimiter("bybit", 600, 5, bybit_weight, (429,), fixed_window=False, ban_statuses=(403,)),
+}
+
+def limiter_for(url):
+    return LIMITERS.get(urlsplit(url).hostname)
+
+# === DROP-IN GET ===
+def get(url, session=None, **kwargs):
+    http = session or requests
+    lim = limiter_for(url)
+    if lim is None:
+        return http.get(url, **kwargs)
+    parts = urlsplit(url)
+    cost = lim.weight(parts.path, {k: v[0] for k, v in parse_qs(parts.query).items()})
+    for attempt in range(RETRIES + 1):
+        lim.acquire(cost)
+        r = http.get(url, **kwargs)
+        lim.observe(r.status_code, r.headers)
+        if r.status_code not in lim.retry_statuses:
+            break
+    return r
+
+def report():
+    return "\n".join(lim.report() for lim in LIMITERS.values() if lim.stats["requests"])
@@ -0,0 +1,190 @@
+# === Report Sinks ===
+# Where a scan's signals go, chosen by REPORT_SINKS (comma separated, default
+# "pdf"). Everything is written under reports/<prefix>/, one file per day,
+# so consumers that only want machine-readable output can skip the PDF
+# entirely:
+#   jsonl     jsonl/<day>.jsonl, appended per scan, one signal per line
+#   csv       csv/<day>.csv, appended per scan (header from the day's first scan)
+#   parquet   parquet/<day>/<HHMMSS>.parquet per scan, needs `pyarrow`
+#   html      index.html, a static dashboard of the latest scan
+#   pdf       the bot's FPDF layout through pdf_report.DailyReport
+# fpdf and pyarrow are only imported on the first write of a sink that
+# needs them. Every signal gets a 'scan' timestamp and a 'bot' column (the
+# prefix, one per bot so venues never share a file); nested values
+# (trend_info) are stored as JSON text in the flat formats.
+#   reports = ReportSinks("signals", layout=signal_pdf, render=lambda pdf, s: pdf.add_signals(s))
+#   reports.write(signals)   -> paths written
+import csv
+import html
+import json
+import os
+from datetime import datetime
+from time import perf_counter
+
+from pdf_report import KEEP_DAYS, REPORT_DIR, DailyReport, expire
+
+REPORT_SINKS = [k.strip() for k in os.environ.get("REPORT_SINKS", "pdf").split(",") if k.strip()]
+HTML_ROWS = 200
+
+def _flat(value):
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str)
+    return value
+
+def _rows(signals, stamp, bot):
+    return [{"scan": stamp, "bot": bot, **{k: _flat(v) for k, v in s.items()}} for s in signals]
+
+def _columns(rows):
+    cols = {}
+    for r in rows:
+        cols.update(dict.fromkeys(r))
+    return list(cols)
+
+# === SINKS ===
+class DaySink:
+    # one folder per sink kind, day-named entries inside, expired like the PDFs
+    kind = None
+
+    def __init__(self, root, keep_days=KEEP_DAYS):
+        self.folder = os.path.join(root, self.kind)
+        self.bot = os.path.basename(root)
+        self.keep_days = keep_days
+        self.day = None
+
+    def write(self, signals, now):
+        day = now.strftime("%Y-%m-%d")
+        if day != self.day:
+            self.day = day
+            os.makedirs(self.folder, exist_ok=True)
+            expire(self.folder, day, self.keep_days)
+        return self.write_day(_rows(signals, now.isoformat(timespec="seconds"), self.bot), day, now)
+
+class JsonlSink(DaySink):
+    kind = "jsonl"
+
+    def write_day(self, rows, day, now):
+        path = os.path.join(self.folder, day + ".jsonl")
+        with open(path, "a") as f:
+            f.writelines(json.dumps(r, default=str) + "\n" for r in rows)
+        return path
+
+class CsvSink(DaySink):
+    kind = "csv"
+
+    def write_day(self, rows, day, now):
+        path = os.path.join(self.folder, day + ".csv")
+        if os.path.exists(path):
+            with open(path, newline="") as f:
+                header = next(csv.reader(f), None)
+        else:
+            header = None
+        with open(path, "a", newline="") as f:
+            # later scans keep the day's columns; new keys are dropped, missing ones left empty
+            w = csv.DictWriter(f, header or _columns(rows), extrasaction="ignore")
+            if header is None:
+                w.writeheader()
+            w.writerows(rows)
+        return path
+
+class ParquetSink(DaySink):
+    kind = "parquet"
+
+    def write_day(self, rows, day, now):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        folder = os.path.join(self.folder, day)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, now.strftime("%H%M%S") + ".parquet")
+        cols = _columns(rows)
+        pq.write_table(pa.table({c: [r.get(c) for r in rows] for c in cols}), path)
+        return path
+
+SINKS = {"jsonl": JsonlSink, "csv": CsvSink, "parquet": ParquetSink}
+
+class HtmlSink:
+    kind = "html"
+
+    def __init__(self, root, title):
+        self.path = os.path.join(root, "index.html")
+        self.bot = os.path.basename(root)
+        self.title = title
+
+    def write(self, signals, now):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        rows = _rows(signals[:HTML_ROWS], now.strftime("%Y-%m-%d %H:%M:%S"), self.bot)
+        cols = [c for c in _columns(rows) if c not in ("scan", "bot")]
+        side = lambda r: str(r.get("side") or r.get("Side") or "").lower()
+        body = "\n".join(
+            f'<tr class="{side(r)}">' + "".join(f"<td>{html.escape(str(r.get(c, '')))}</td>" for c in cols) + "</tr>"
+            for r in rows)
+        page = (f"<!doctype html><html><head><meta charset=\"utf-8\"><title>{html.escape(self.title)}</title>"
+                "<style>body{font:13px sans-serif;margin:16px}table{border-collapse:collapse}"
+                "td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}th{background:#eee}"
+                "tr.long td{background:#eefaee}tr.short td{background:#fbeeee}</style></head><body>"
+                f"<h2>{html.escape(self.title)}</h2><p>Scan {now.strftime('%Y-%m-%d %H:%M:%S')}, "
+                f"{len(signals)} signal(s)</p><table><tr>"
+                + "".join(f"<th>{html.escape(c)}</th>" for c in cols) + f"</tr>\n{body}\n</table></body></html>")
+        # written aside and swapped in, so a browser never sees half a page
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(page)
+        os.replace(self.path + ".tmp", self.path)
+        return self.path
+
+class PdfSink:
+    kind = "pdf"
+
+    def __init__(self, prefix, layout, render, tz, directory):
+        # layout() returns the bot's FPDF subclass; it is only called (and
+        # fpdf only imported) on the first PDF write
+        self.prefix, self.layout, self.render, self.tz, self.directory = prefix, layout, render, tz, directory
+        self.daily = None
+
+    def write(self, signals, now):
+        if self.daily is None:
+            self.daily = DailyReport(self.prefix, self.layout(), tz=self.tz, directory=self.directory)
+        return self.daily.write(lambda pdf: self.render(pdf, signals), now)
+
+# === FAN-OUT ===
+class ReportSinks:
+    def __init__(self, prefix, layout=None, render=None, tz=None, kinds=None, directory=REPORT_DIR):
+        # without a layout the bot writes its own PDF when wants("pdf") says so
+        self.kinds = REPORT_SINKS if kinds is None else kinds
+        self.tz = tz
+        root = os.path.join(directory, prefix)
+        self.sinks = []
+        for kind in self.kinds:
+            if kind == "pdf":
+                if layout is not None:
+                    self.sinks.append(PdfSink(prefix, layout, render, tz, directory))
+            elif kind == "html":
+                self.sinks.append(HtmlSink(root, prefix.replace("_", " ").title()))
+            elif kind in SINKS:
+                self.sinks.append(SINKS[kind](root))
+            else:
+                print(f"[REPORT] unknown sink '{kind}', expected one of pdf, {', '.join(SINKS)}, html")
+        self.timing = {s.kind: [0, 0.0] for s in self.sinks}
+
+    def wants(self, kind):
+        return kind in self.kinds
+
+    def write(self, signals, now=None):
+        now = now or datetime.now(self.tz)
+        paths = []
+        for sink in list(self.sinks):
+            started = perf_counter()
+            try:
+                paths.append(sink.write(signals, now))
+            except ImportError as e:
+                print(f"[REPORT] {sink.kind} sink disabled: {e}")
+                self.sinks.remove(sink)
+                continue
+            except Exception as e:
+                print(f"[REPORT] {sink.kind}: {e}")
+            t = self.timing[sink.kind]
+            t[0] += 1
+            t[1] += perf_counter() - started
+        return paths
+
+    def report(self):
+        parts = [f"{k} {t[1] / t[0] * 1000:.1f} ms" for k, t in self.timing.items() if t[0]]
+        return f"🗂️ Reports: {', '.join(parts) or 'none written'} per scan"
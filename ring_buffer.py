@@ -0,0 +1,49 @@
+# === Fixed-capacity Ring Buffer ===
+# Preallocated numpy rows that are overwritten in place once full, for
+# per-symbol state that lives for the whole run (the full-scan candle cache).
+# Memory per buffer is fixed at creation, whatever the run length. A
+# list-of-lists series would instead be rebuilt on every merge and cost one
+# Python object per value.
+import numpy as np
+
+class RingBuffer:
+    def __init__(self, capacity, width, dtype=float):
+        self.capacity = capacity
+        self.data = np.empty((capacity, width), dtype=dtype)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _slot(self, i):
+        return (self.start + i) % self.capacity
+
+    def last(self):
+        return self.data[self._slot(self.size - 1)] if self.size else None
+
+    def truncate_from(self, key, col=0):
+        # drop newest rows whose key column is >= key (rows are sorted by it)
+        while self.size and self.data[self._slot(self.size - 1), col] >= key:
+            self.size -= 1
+
+    def extend(self, rows):
+        rows = np.asarray(rows, dtype=self.data.dtype)
+        if len(rows) >= self.capacity:
+            self.data[:] = rows[-self.capacity:]
+            self.start, self.size = 0, self.capacity
+            return
+        for row in rows:
+            if self.size < self.capacity:
+                self.data[self._slot(self.size)] = row
+                self.size += 1
+            else:
+                self.data[self.start] = row
+                self.start = (self.start + 1) % self.capacity
+
+    def array(self):
+        # rows oldest first; a view when the window doesn't wrap, else one copy
+        end = self.start + self.size
+        if end <= self.capacity:
+            return self.data[self.start:end]
+        return np.concatenate((self.data[self.start:], self.data[:end - self.capacity]))
@@ -0,0 +1,83 @@
+# === Rolling Window Statistics ===
+# Mean / variance / std / z-score over the last N values with an O(1) push,
+# for sweeping a whole series (bollinger_bands) or a window kept across bars.
+# A single read of the last N values is cheaper as a plain slice.
+# Variance is kept with a sliding Welford update. The window is re-summed
+# exactly once every N evictions, which keeps float drift bounded on long
+# streams without giving up the amortized O(1) update.
+from collections import deque
+
+class RollingStats:
+    def __init__(self, n):
+        self.n = n
+        self.values = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._evicted = 0
+
+    @classmethod
+    def of(cls, values, n):
+        stats = cls(n)
+        for x in values:
+            stats.push(x)
+        return stats
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def full(self):
+        return len(self.values) == self.n
+
+    def push(self, x):
+        values = self.values
+        if len(values) < self.n:
+            values.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(values)
+            self._m2 += delta * (x - self.mean)
+            return
+        old = values.popleft()
+        values.append(x)
+        self._evicted += 1
+        if self._evicted >= self.n:
+            self._resum()
+            return
+        mean = self.mean + (x - old) / self.n
+        self._m2 += (x - old) * (x - mean + old - self.mean)
+        self.mean = mean
+
+    def _resum(self):
+        self._evicted = 0
+        self.mean = sum(self.values) / len(self.values)
+        self._m2 = sum((v - self.mean) ** 2 for v in self.values)
+
+    @property
+    def var(self):
+        return max(self._m2, 0.0) / len(self.values) if self.values else 0.0
+
+    @property
+    def std(self):
+        return self.var ** 0.5
+
+    def zscore(self, x=None):
+        # z-score of x (default: the newest value); 0 until the window is full
+        if not self.full:
+            return 0
+        std = self.std
+        x = self.values[-1] if x is None else x
+        return (x - self.mean) / std if std != 0 else 0
+
+# === SERIES HELPERS ===
+def bollinger_bands(values, period=20, std_dev=2):
+    # [(upper, mid, lower)] per bar, (None, None, None) until the window fills
+    stats = RollingStats(period)
+    bands = []
+    for x in values:
+        stats.push(x)
+        if stats.full:
+            mean, std = stats.mean, stats.std
+            bands.append((mean + std_dev * std, mean, mean - std_dev * std))
+        else:
+            bands.append((None, None, None))
+    return bands
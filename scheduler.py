@@ -0,0 +1,111 @@
+# === Candle-close Aligned Scheduler ===
+# Replaces the fixed sleep(900) after each scan. Scans start OFFSET seconds
+# after every exchange candle boundary (UTC-aligned multiples of PERIOD), so
+# the schedule never drifts by the scan duration and always evaluates freshly
+# closed bars. Each scan gets a deadline just before the next boundary;
+# symbols that would run past it are shed. Wake-up jitter, overruns, skipped
+# boundaries and shed symbols are tracked in .metrics.
+import sys
+from time import sleep, time
+
+PERIOD = 900          # 15m candles
+OFFSET = 5            # let the exchange publish the closed bar first
+SAFETY = 10           # stop scanning this many seconds before the next boundary
+LATE_GRACE = 60       # still run a boundary we overran by less than this
+
+class CandleScheduler:
+    def __init__(self, period=PERIOD, offset=OFFSET, safety=SAFETY, late_grace=LATE_GRACE, clock=time, sleeper=sleep):
+        self.period = period
+        self.offset = offset
+        self.safety = safety
+        self.late_grace = late_grace
+        self.clock = clock
+        self.sleeper = sleeper
+        self.deadline = None
+        self.scan_started = None
+        self._target = None
+        self._jitter_sum = 0.0
+        self._waits = 0
+        self.metrics = {
+            "cycles": 0,
+            "last_jitter": 0.0,
+            "max_jitter": 0.0,
+            "mean_jitter": 0.0,
+            "last_scan_seconds": 0.0,
+            "overruns": 0,
+            "skipped_boundaries": 0,
+            "shed_symbols": 0,
+        }
+
+    # === BOUNDARIES ===
+    def next_target(self, now=None):
+        now = self.clock() if now is None else now
+        boundary = (now - self.offset) // self.period * self.period + self.period
+        return boundary + self.offset
+
+    # === SCAN BUDGET ===
+    def start_scan(self):
+        self.scan_started = self.clock()
+        self.deadline = self.next_target(self.scan_started) - self.offset - self.safety
+        if self.deadline <= self.scan_started:
+            # started inside the safety margin (first scan after startup): budget up to the following boundary
+            self.deadline += self.period
+        return self.deadline - self.scan_started
+
+    def time_left(self):
+        return self.deadline - self.clock() if self.deadline else float("inf")
+
+    def should_shed(self):
+        return self.time_left() <= 0
+
+    def shed(self, n):
+        self.metrics["shed_symbols"] += n
+
+    def end_scan(self):
+        now = self.clock()
+        self.metrics["cycles"] += 1
+        self.metrics["last_scan_seconds"] = round(now - self.scan_started, 2)
+        if now > self.deadline:
+            self.metrics["overruns"] += 1
+
+    # === WAIT ===
+    def wait(self, countdown=False):
+        now = self.clock()
+        target = self.next_target(now)
+        if self._target is not None:
+            missed = int((target - self._target) // self.period) - 1
+            if missed > 0 and now - (target - self.period) <= self.late_grace:
+                # overran by a little: evaluate the boundary we just passed right away
+                target -= self.period
+                missed -= 1
+            self.metrics["skipped_boundaries"] += max(missed, 0)
+        while True:
+            left = target - self.clock()
+            if left <= 0:
+                break
+            if countdown:
+                secs = int(left + 0.999)
+                sys.stdout.write(f"\r⏱️  Next scan in {secs // 60:02d}:{secs % 60:02d}")
+                sys.stdout.flush()
+            self.sleeper(min(1.0, left) if countdown else left)
+        if countdown:
+            print()
+        self._record_jitter(self.clock() - target)
+        self._target = target
+        return target
+
+    def _record_jitter(self, jitter):
+        m = self.metrics
+        m["last_jitter"] = round(jitter, 3)
+        m["max_jitter"] = round(max(m["max_jitter"], jitter), 3)
+        self._jitter_sum += jitter
+        self._waits += 1
+        m["mean_jitter"] = round(self._jitter_sum / self._waits, 3)
+
+    def report(self):
+        m = self.metrics
+        return (
+            f"🕒 Scan {m['last_scan_seconds']}s | jitter {m['last_jitter']}s "
+            f"(max {m['max_jitter']}s, mean {m['mean_jitter']}s) | overruns {m['overruns']} | "
+            f"skipped {m['skipped_boundaries']} | shed {m['shed_symbols']} symbols"
+        )
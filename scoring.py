@@ -0,0 +1,135 @@
+# === Cross-sectional Signal Scoring ===
+# Scores a whole scan in one numpy pass instead of one signal dict at a
+# time. Every rule of the bots' old compute_score / inline score becomes a
+# masked add over feature arrays (RSI, MACD hist, BB breakout, volume spike,
+# ATR z-score, orderbook bias, trend votes, confidence), added up in the
+# same order, so the original rules score exactly as the scalar versions
+# did. Funding rate and open-interest change (funding.py) are added on top
+# of those, so final scores differ wherever they apply:
+#   funding  crowded opposite side (|rate| >= FUNDING_EXTREME) adds, own side subtracts
+#   oi       open interest up OI_RISE_PCT+ since the last funding interval adds
+# The same pass normalizes across symbols:
+#   score_pct / 'Score Pct'  share of this scan's signals scoring <= this one
+#   score_z   / 'Score Z'    standard deviations from this scan's mean score
+import numpy as np
+
+from signal_schema import field
+
+# points per rule of the list-based bots; rr bonus comes from the bot's TP/SL
+PROFILES = {
+    "binance": {"votes": (10, 5), "rsi_long": (45, 70), "rsi_short": (30, 55), "macd": 10,
+                "bb": ("YES",), "bb_pts": 5, "vol_spike": 10, "atr_z": 0, "atr": 0,
+                "orderbook": 0, "confidence": 0.3, "aligned": 0, "funding": 5, "oi": 5},
+    "v1": {"votes": (20, 10), "rsi_long": (50, 65), "rsi_short": (35, 50), "macd": 10,
+           "bb": ("YES",), "bb_pts": 5, "vol_spike": 10, "atr_z": 0, "atr": 0,
+           "orderbook": 0, "confidence": 0.4, "aligned": 10, "funding": 5, "oi": 5},
+}
+PROFILES["v2"] = dict(PROFILES["v1"], bb=("UP", "DOWN"), atr_z=10, atr=5)
+PROFILES["v3"] = dict(PROFILES["v2"], orderbook=10)
+
+ATR_Z_MIN = 1.5
+FUNDING_EXTREME = 0.0005   # 0.05% per interval, five times the usual base rate
+OI_RISE_PCT = 5
+
+# === FEATURES ===
+def _floats(signals, name):
+    vals = (field(s, name) for s in signals)
+    return np.array([np.nan if v is None else v for v in vals], dtype=float)
+
+def _labels(signals, name):
+    return np.array([str(field(s, name, "")) for s in signals])
+
+def features(signals):
+    votes = [list((field(s, "trend_info") or {}).values()) for s in signals]
+    return {
+        "side": np.char.upper(_labels(signals, "side")),
+        "trend": _labels(signals, "trend"),
+        "rsi": _floats(signals, "rsi"),
+        "macd_hist": _floats(signals, "macd_hist"),
+        "bb_breakout": _labels(signals, "bb_breakout"),
+        "vol_spike": np.array([bool(field(s, "vol_spike")) for s in signals]),
+        "atr": _floats(signals, "atr"),
+        "atr_z": _floats(signals, "atr_z"),
+        "orderbook_bias": _labels(signals, "orderbook_bias"),
+        "bull": np.array([v.count("bullish") for v in votes]),
+        "bear": np.array([v.count("bearish") for v in votes]),
+        "confidence": _floats(signals, "confidence"),
+        "funding": _floats(signals, "funding_rate"),
+        "oi_change": _floats(signals, "oi_change_pct"),
+    }
+
+def rr_bonus(rr):
+    return 10 if rr >= 2 else 5 if rr >= 1.5 else 0
+
+# === SCORE ===
+def normalize(scores):
+    n = len(scores)
+    pct = np.searchsorted(np.sort(scores), scores, side="right") / n * 100
+    std = scores.std()
+    z = (scores - scores.mean()) / std if std > 0 else np.zeros(n)
+    return pct, z
+
+def list_scores(f, profile, rr):
+    p = PROFILES[profile]
+    long, short = f["side"] == "LONG", f["side"] == "SHORT"
+    bull, bear = f["bull"], f["bear"]
+    score = np.where((bull == 3) | (bear == 3), p["votes"][0],
+                     np.where((bull == 2) | (bear == 2), p["votes"][1], 0)).astype(float)
+    rsi = f["rsi"]
+    score += np.where(long & (p["rsi_long"][0] < rsi) & (rsi < p["rsi_long"][1]) |
+                      short & (p["rsi_short"][0] < rsi) & (rsi < p["rsi_short"][1]), 10, 0)
+    score += np.where(long & (f["macd_hist"] > 0) | short & (f["macd_hist"] < 0), p["macd"], 0)
+    score += np.where(np.isin(f["bb_breakout"], p["bb"]), p["bb_pts"], 0)
+    score += np.where(f["vol_spike"], p["vol_spike"], 0)
+    if p["atr_z"]:
+        score += np.where(np.abs(f["atr_z"]) > ATR_Z_MIN, p["atr_z"], 0)
+    if p["atr"]:
+        score += np.where(f["atr"] > 0, p["atr"], 0)
+    if p["orderbook"]:
+        bias = f["orderbook_bias"]
+        score += np.where(long & (bias == "buy") | short & (bias == "sell"), p["orderbook"], 0)
+    score += f["confidence"] * p["confidence"]
+    score += rr_bonus(rr)
+    if p["aligned"]:
+        aligned = (bull == 3) & (f["trend"] == "bullish") | (bear == 3) & (f["trend"] == "bearish")
+        score += np.where(aligned, p["aligned"], 0)
+    if p["funding"]:
+        fr = f["funding"]
+        # longs paying heavy funding are crowded; shorts paying it favour longs
+        score += np.where(long & (fr <= -FUNDING_EXTREME) | short & (fr >= FUNDING_EXTREME), p["funding"], 0)
+        score -= np.where(long & (fr >= FUNDING_EXTREME) | short & (fr <= -FUNDING_EXTREME), p["funding"], 0)
+    if p["oi"]:
+        score += np.where(f["oi_change"] >= OI_RISE_PCT, p["oi"], 0)
+    return score
+
+def score_signals(signals, profile, rr):
+    # list-based bots: fills score / score_pct / score_z in place
+    if not signals:
+        return signals
+    scores = np.array([round(x, 2) for x in list_scores(features(signals), profile, rr).tolist()])
+    pct, z = normalize(scores)
+    for s, sc, p, zz in zip(signals, scores.tolist(), pct.tolist(), z.tolist()):
+        s["score"] = sc
+        s["score_pct"] = round(p, 1)
+        s["score_z"] = round(zz, 2)
+    return signals
+
+def score_mtf(signals):
+    # multi-timeframe bots: main-timeframe RSI / MACD, 'BB Slope' and 'Type'
+    if not signals:
+        return signals
+    rsi = np.array([s['RSI'] for s in signals], dtype=float)
+    macd = np.array([s['MACD'] for s in signals], dtype=float)
+    bb = np.array([s['BB Slope'] for s in signals])
+    trend = np.array([s['Type'] for s in signals])
+    score = np.where(macd > 0, 0.3, 0)
+    score = score + np.where((rsi < 30) | (rsi > 70), 0.2, 0)
+    score = score + np.where(bb != "No", 0.3, 0.1)
+    score = score + np.where(trend == "Trend", 0.2, 0.1)
+    scores = np.array([round(x * 100, 1) for x in score.tolist()])
+    pct, z = normalize(scores)
+    for s, sc, p, zz in zip(signals, scores.tolist(), pct.tolist(), z.tolist()):
+        s['Score'] = sc
+        s['Score Pct'] = round(p, 1)
+        s['Score Z'] = round(zz, 2)
+    return signals
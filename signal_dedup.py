@@ -0,0 +1,114 @@
+# === Cross-scan Signal Deduplication ===
+# Suppresses notifications for signals that were already sent recently.
+# A signal is identified by (symbol, side, type, entry bucket); the key lives
+# for TTL seconds and is only re-sent early when the score moves by at least
+# SCORE_DELTA points. State and counters survive restarts in a JSON file,
+# one per bot (dedup_state_<name>.json next to DEDUP_STATE), so bots running
+# side by side never overwrite each other's entries.
+#   python signal_dedup.py bybitbot   prints that bot's counters
+import json
+import math
+import os
+import sys
+from time import time
+
+from signal_schema import field
+
+STATE_FILE = os.environ.get("DEDUP_STATE", "dedup_state.json")
+TTL = 4 * 3600            # seconds a sent signal stays suppressed
+ENTRY_BUCKET_PCT = 0.005  # entries within ~0.5% of each other share a bucket
+SCORE_DELTA = 10          # score change that counts as a material update
+
+def state_path(name, base=STATE_FILE):
+    root, ext = os.path.splitext(base)
+    return f"{root}_{name}{ext}"
+
+def entry_bucket(entry, pct=ENTRY_BUCKET_PCT):
+    if not entry or entry <= 0:
+        return 0
+    return int(math.floor(math.log(entry) / math.log1p(pct)))
+
+def signal_key(s, pct=ENTRY_BUCKET_PCT):
+    parts = [
+        str(field(s, "symbol")),
+        str(field(s, "side", "")).upper(),
+        str(field(s, "strategy")),
+        str(entry_bucket(field(s, "entry"), pct)),
+    ]
+    venue = field(s, "venue")
+    if venue:
+        # multi-venue scans keep the same setup on each exchange apart
+        parts.insert(0, venue)
+    return "|".join(parts)
+
+class SignalDeduplicator:
+    def __init__(self, name=None, path=STATE_FILE, ttl=TTL, score_delta=SCORE_DELTA, bucket_pct=ENTRY_BUCKET_PCT):
+        self.path = state_path(name, path) if name and path else path
+        self.ttl = ttl
+        self.score_delta = score_delta
+        self.bucket_pct = bucket_pct
+        self.entries = {}
+        self.stats = {"seen": 0, "sent": 0, "suppressed": 0, "updated": 0, "scans": 0}
+        self.load()
+
+    # === PERSISTENCE ===
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            self.entries = state.get("entries", {})
+            self.stats.update(state.get("stats", {}))
+        except Exception as e:
+            print(f"[DEDUP] Could not load {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"entries": self.entries, "stats": self.stats}, f)
+        os.replace(tmp, self.path)
+
+    def purge(self, now=None):
+        now = now or time()
+        for k in [k for k, v in self.entries.items() if v["expires"] <= now]:
+            del self.entries[k]
+
+    # === FILTER ===
+    def filter(self, signals, now=None):
+        now = now or time()
+        self.purge(now)
+        fresh = []
+        for s in signals:
+            self.stats["seen"] += 1
+            key = signal_key(s, self.bucket_pct)
+            score = field(s, "score") or 0
+            prev = self.entries.get(key)
+            if prev is not None:
+                if abs(score - prev["score"]) < self.score_delta:
+                    self.stats["suppressed"] += 1
+                    continue
+                self.stats["updated"] += 1
+            self.entries[key] = {"score": score, "sent": now, "expires": now + self.ttl}
+            self.stats["sent"] += 1
+            fresh.append(s)
+        self.stats["scans"] += 1
+        self.save()
+        return fresh
+
+    # === REPORT ===
+    def suppression_rate(self):
+        return self.stats["suppressed"] / self.stats["seen"] if self.stats["seen"] else 0.0
+
+    def report(self):
+        st = self.stats
+        return (
+            f"🔁 Dedup: {st['scans']} scans | seen {st['seen']} | sent {st['sent']} "
+            f"({st['updated']} updates) | suppressed {st['suppressed']} "
+            f"({self.suppression_rate() * 100:.1f}%) | tracking {len(self.entries)} keys"
+        )
+
+if __name__ == "__main__":
+    print(SignalDeduplicator(sys.argv[1] if len(sys.argv) > 1 else None).report())
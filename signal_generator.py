@@ -1,8 +1,14 @@
 import requests
-from fpdf import FPDF
 from datetime import datetime, timedelta, timezone
-from time import sleep
-import pytz
+
+import rate_limiter
+import scoring
+import signal_monitor
+from memwatch import MemoryWatch
+from precision import Precision
+from ranking import TopK
+from scheduler import CandleScheduler
+from signal_dedup import SignalDeduplicator
 
 # === CONFIGURATION ===
 RISK_PCT = 0.15
@@ -19,6 +25,8 @@ TELEGRAM_BOT_TOKEN = "8160938302:AAFUmPahGk14OY8F1v5FLHGoVRD-pGTvSOY"
 TELEGRAM_CHAT_ID = "5852301284"
 
 tz_utc3 = timezone(timedelta(hours=3))
+# prices and sizes snapped to each contract's tick size / lot step, see precision.py
+ticks = Precision("bybit")
 
 # === DISCORD / TELEGRAM NOTIFY ===
 def send_discord(message):
@@ -42,6 +50,10 @@ def send_telegram(message):
     except:
         pass
 
+def send_alert(message):
+    send_discord(message)
+    send_telegram(message)
+
 # === BYBIT CANDLES FETCH ===
 def get_candles(sym, interval):
     interval_map = {
@@ -52,7 +64,7 @@ def get_candles(sym, interval):
     bybit_interval = interval_map.get(interval, "60")
     url = f"https://api.bybit.com/v5/market/kline?category=linear&symbol={sym}&interval={bybit_interval}&limit=200"
     try:
-        res = requests.get(url)
+        res = rate_limiter.get(url)
         data = res.json().get('result', {}).get('list', [])
         return [{
             'high': float(c[3]),
@@ -180,17 +192,11 @@ def analyze(symbol):
     liq = round(entry * (1 - 1 / LEVERAGE) if side == 'LONG' else entry * (1 + 1 / LEVERAGE), 6)
     margin = round((ACCOUNT_BALANCE * RISK_PCT) / LEVERAGE, 6)
 
-    score = 0
-    score += 0.3 if tf['macd'] > 0 else 0
-    score += 0.2 if tf['rsi'] < 30 or tf['rsi'] > 70 else 0
-    score += 0.3 if bb_dir != "No" else 0.1
-    score += 0.2 if trend == "Trend" else 0.1
-
     return {
         'Symbol': symbol,
         'Side': side,
         'Type': trend,
-        'Score': round(score * 100, 1),
+        'Score': None,
         'Entry': round(entry, 6),
         'TP': tp,
         'SL': sl,
@@ -199,14 +205,21 @@ def analyze(symbol):
         'Market': price,
         'Liq': liq,
         'BB Slope': bb_dir,
+        'RSI': tf['rsi'],
+        'MACD': tf['macd'],
         'Time': datetime.now(tz_utc3).strftime("%Y-%m-%d %H:%M UTC+3")
     }
 
+# === SCORING ===
+def compute_scores(signals):
+    # whole scan in one vectorized pass, see scoring.py
+    return scoring.score_mtf(signals)
+
 # === GET BYBIT SYMBOLS ===
 def get_usdt_symbols():
     try:
         url = "https://api.bybit.com/v5/market/tickers?category=linear"
-        res = requests.get(url)
+        res = rate_limiter.get(url)
         data = res.json().get('result', {}).get('list', [])
         tickers = [x for x in data if x['symbol'].endswith("USDT")]
         sorted_tickers = sorted(tickers, key=lambda x: float(x['turnover24h']), reverse=True)
@@ -217,20 +230,31 @@ def get_usdt_symbols():
 
 # === MAIN LOOP ===
 def main():
+    dedup = SignalDeduplicator("signal_generator")
+    sched = CandleScheduler()
+    mem = MemoryWatch()
+    # follows sent signals between scans: entry fills, TP / SL, invalidations
+    monitor = signal_monitor.SignalMonitor(notify=send_alert).start() if signal_monitor.ENABLED else None
     while True:
+        sched.start_scan()
         print("\n🔍 Scanning Bybit USDT Perpetuals for filtered signals...\n")
         syms = get_usdt_symbols()
+        ranker = TopK(20, key=lambda x: x['Score'])
         signals = []
 
-        for sym in syms:
+        for i, sym in enumerate(syms):
+            if sched.should_shed():
+                sched.shed(len(syms) - i)
+                print(f"⏰ Scan budget used up, shedding {len(syms) - i} lowest-turnover symbols")
+                break
             sig = analyze(sym)
             if sig:
                 signals.append(sig)
-            sleep(0.3)
+        sched.end_scan()
+        ranker.extend(compute_scores(ticks.round_signals(signals)))
 
-        if signals:
-            signals.sort(key=lambda x: x['Score'], reverse=True)
-            top5 = signals[:5]
+        if ranker:
+            top5 = ranker.top(5)
 
             for s in top5:
                 print(f"""
@@ -242,6 +266,7 @@ def main():
 ⏰ TIME: {s['Time']}
 =========================================================
 """)
+            fresh = dedup.filter(top5)
             top_msg = "\n\n".join([f"""
 ==================== {s['Symbol']} ====================
 📊 TYPE: {s['Type']}     📈 SIDE: {s['Side']}     🏆 SCORE: {s['Score']}%
@@ -249,16 +274,29 @@ def main():
 💱 MARKET: {s['Market']} 📍 BB: {s['BB Slope']}    🔄 Trail: {s['Trail']}
 ⚖️ MARGIN: {s['Margin']} ⚠️ LIQ: {s['Liq']}
 ⏰ TIME: {s['Time']}
-=========================================================""" for s in top5])
+=========================================================""" for s in fresh])
 
-            send_discord(f"📊 **Latest Signals**\n\n{top_msg}")
-            send_telegram(f"📊 **Latest Signals**\n\n{top_msg}")
-            print("♻️ Signals Sent to Discord & Telegram...\n")
+            if fresh:
+                send_discord(f"📊 **Latest Signals**\n\n{top_msg}")
+                send_telegram(f"📊 **Latest Signals**\n\n{top_msg}")
+                print(f"♻️ {len(fresh)} Signal(s) Sent to Discord & Telegram...\n")
+                if monitor:
+                    monitor.watch(fresh)
+            else:
+                print("🔕 Top signals unchanged since last alert, nothing sent\n")
+            print(dedup.report())
         else:
             print("⚠️ No valid signals found")
 
-        print("♻️ Rescanning in 15 minutes...\n")
-        sleep(900)
+        print(sched.report())
+        print(rate_limiter.report())
+        if monitor:
+            print(monitor.report())
+        mem_report = mem.end_cycle()
+        if mem_report:
+            print(mem_report)
+        print("♻️ Rescanning after the next 15m candle close...\n")
+        sched.wait()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,306 @@
+# === Live Signal Monitor ===
+# Follows emitted signals between scans instead of forgetting them until
+# the next candle. One asyncio loop (own daemon thread) streams Bybit linear
+# tickers for the symbols with active signals and checks every tick against
+# the signals' price levels:
+#   pending  trailing entry ('Trail') touched -> fill
+#            TP reached first, or EXPIRY_S passed -> invalidated
+#   filled   TP / SL crossed -> closed
+# Levels live in per-symbol sorted books, so a tick costs one bisect plus
+# the levels it actually crosses, however many signals are watched. Events
+# go through a notification queue; a sender thread batches them to the
+# bot's notify callback so a slow webhook never stalls the price loop.
+# The stream needs the optional `websockets` package; without it the
+# bulk tickers endpoint is polled every POLL_S seconds instead.
+import asyncio
+import bisect
+import heapq
+import json
+import os
+import queue
+import threading
+from functools import partial
+from time import perf_counter, time
+
+import rate_limiter
+from signal_dedup import signal_key
+from signal_schema import field
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# === CONFIGURATION ===
+ENABLED = os.getenv("SIGNAL_MONITOR", "1") != "0"
+WS_URL = "wss://stream.bybit.com/v5/public/linear"
+TICKERS_URL = "https://api.bybit.com/v5/market/tickers?category=linear"
+PRICE_FIELD = "lastPrice"   # Bybit triggers TP/SL on last price by default
+POLL_S = 1.0
+PING_S = 20
+RECONNECT_S = 5
+SUBSCRIBE_BATCH = 10        # topics per subscribe request
+EXPIRY_S = 4 * 3600         # pending entries not filled within this are dropped
+
+# === PRICE LEVELS ===
+class LevelBook:
+    # sorted keys with ids; pop_from(x) removes and returns ids of all keys >= x
+    def __init__(self):
+        self.keys = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, ident):
+        i = bisect.bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.ids.insert(i, ident)
+
+    def remove(self, key, ident):
+        i = bisect.bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.ids[i] == ident:
+                del self.keys[i], self.ids[i]
+                return
+            i += 1
+
+    def pop_from(self, x):
+        i = bisect.bisect_left(self.keys, x)
+        hit = self.ids[i:]
+        del self.keys[i:], self.ids[i:]
+        return hit
+
+# price falling to a level: keys = level, query price
+# price rising to a level:  keys = -level, query -price
+FALLS, RISES = 0, 1
+
+def _levels(w):
+    # (book, price, action) the signal waits for in its current state
+    long = w["side"] == "LONG"
+    down, up = (FALLS, RISES) if long else (RISES, FALLS)
+    if w["state"] == "pending":
+        return [(down, w["trail"], "fill"), (up, w["tp"], "missed")]
+    return [(down, w["sl"], "sl"), (up, w["tp"], "tp")]
+
+# === MONITOR ===
+class SignalMonitor:
+    def __init__(self, notify=print, expiry_s=EXPIRY_S, transport=None):
+        self.notify = notify
+        self.expiry_s = expiry_s
+        self.transport = transport or ("websocket" if websockets else "poll")
+        self.active = {}       # id -> watched signal
+        self.books = {}        # symbol -> (falls, rises)
+        self.expiries = []     # heap of (deadline, id)
+        self.events = queue.Queue()
+        self.loop = None
+        self.stats = {"ticks": 0, "fill": 0, "tp": 0, "sl": 0, "missed": 0, "expired": 0,
+                      "tick_us_max": 0.0, "lag_ms_sum": 0.0, "lag_ms_max": 0.0, "lagged": 0}
+
+    def start(self):
+        ready = threading.Event()
+        threading.Thread(target=self._run_loop, args=(ready,), name="signal-monitor", daemon=True).start()
+        threading.Thread(target=self._send_loop, name="signal-monitor-notify", daemon=True).start()
+        ready.wait()
+        return self
+
+    def watch(self, signals):
+        # thread-safe; signals already watched are ignored
+        items = [dict(s) for s in signals]
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._add, items)
+        else:
+            self._add(items)
+
+    # --- price loop side ---
+    def _add(self, signals):
+        now = time()
+        for s in signals:
+            ident = signal_key(s)
+            if ident in self.active:
+                continue
+            w = {"id": ident, "symbol": field(s, "symbol"), "side": str(field(s, "side")).upper(),
+                 "entry": field(s, "entry"), "trail": field(s, "trail") or field(s, "entry"),
+                 "tp": field(s, "tp"), "sl": field(s, "sl"), "state": "pending", "armed": [], "fill": None}
+            if None in (w["trail"], w["tp"], w["sl"]):
+                continue
+            w["expires"] = now + self.expiry_s
+            self.active[ident] = w
+            self._arm(w)
+            heapq.heappush(self.expiries, (w["expires"], ident))
+        if self.loop:
+            self._changed.set()
+
+    def _arm(self, w):
+        books = self.books.setdefault(w["symbol"], (LevelBook(), LevelBook()))
+        for book, price, action in _levels(w):
+            key = price if book == FALLS else -price
+            books[book].add(key, (w["id"], action))
+            w["armed"].append((book, key, (w["id"], action)))
+
+    def _disarm(self, w):
+        books = self.books[w["symbol"]]
+        for book, key, ident in w["armed"]:
+            books[book].remove(key, ident)
+        w["armed"] = []
+        if not len(books[FALLS]) and not len(books[RISES]):
+            del self.books[w["symbol"]]
+            if self.loop:
+                self._changed.set()
+
+    def on_price(self, symbol, price, ts_ms=None):
+        books = self.books.get(symbol)
+        if books is None:
+            return
+        started = perf_counter()
+        st = self.stats
+        st["ticks"] += 1
+        while symbol in self.books:
+            books = self.books[symbol]
+            hits = books[FALLS].pop_from(price) + books[RISES].pop_from(-price)
+            if not hits:
+                break
+            for ident, action in hits:
+                w = self.active.get(ident)
+                if w is None or w["state"] == ("pending" if action in ("tp", "sl") else "filled"):
+                    continue
+                w["armed"] = [a for a in w["armed"] if a[2] != (ident, action)]
+                self._disarm(w)
+                if action == "fill":
+                    w["state"], w["fill"] = "filled", price
+                    self._arm(w)     # a gap through SL / TP resolves on this same tick
+                else:
+                    del self.active[ident]
+                self._emit(action, w, price, ts_ms)
+        st["tick_us_max"] = max(st["tick_us_max"], (perf_counter() - started) * 1e6)
+
+    def expire(self, now=None):
+        now = time() if now is None else now
+        while self.expiries and self.expiries[0][0] <= now:
+            _, ident = heapq.heappop(self.expiries)
+            w = self.active.get(ident)
+            # the id may belong to a later signal by now, re-sent after this one resolved
+            if w is not None and w["state"] == "pending" and w["expires"] <= now:
+                self._disarm(w)
+                del self.active[ident]
+                self._emit("expired", w, None, None)
+
+    def _emit(self, action, w, price, ts_ms):
+        st = self.stats
+        st[action] += 1
+        if ts_ms:
+            lag = max(time() * 1000 - ts_ms, 0)
+            st["lag_ms_sum"] += lag
+            st["lag_ms_max"] = max(st["lag_ms_max"], lag)
+            st["lagged"] += 1
+        self.events.put(format_event(action, w, price))
+
+    # --- transports ---
+    def _run_loop(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._changed = asyncio.Event()
+        ready.set()
+        feed = self._stream() if self.transport == "websocket" else self._poll()
+        self.loop.run_until_complete(asyncio.gather(feed, self._expire_loop()))
+
+    async def _expire_loop(self):
+        while True:
+            self.expire()
+            await asyncio.sleep(1)
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        fetch = partial(rate_limiter.get, TICKERS_URL, timeout=10)
+        while True:
+            if self.books:
+                try:
+                    res = await loop.run_in_executor(None, fetch)
+                    body = res.json()
+                    for t in body.get('result', {}).get('list', []):
+                        if t['symbol'] in self.books and t.get(PRICE_FIELD):
+                            self.on_price(t['symbol'], float(t[PRICE_FIELD]), body.get('time'))
+                except Exception as e:
+                    print(f"📡 Monitor poll error: {e}")
+            await asyncio.sleep(POLL_S)
+
+    async def _stream(self):
+        while True:
+            try:
+                async with websockets.connect(WS_URL, ping_interval=None) as ws:
+                    tasks = [asyncio.create_task(self._ping(ws)), asyncio.create_task(self._subscribe(ws))]
+                    try:
+                        async for raw in ws:
+                            self._on_message(raw)
+                    finally:
+                        for t in tasks:
+                            t.cancel()
+            except Exception as e:
+                print(f"📡 Monitor websocket error: {e}, reconnecting in {RECONNECT_S}s")
+            await asyncio.sleep(RECONNECT_S)
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(PING_S)
+            await ws.send(json.dumps({"op": "ping"}))
+
+    async def _subscribe(self, ws):
+        # keeps the subscriptions in step with the symbols that have armed levels
+        subscribed = set()
+        self._changed.set()
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            wanted = set(self.books)
+            for op, symbols in (("unsubscribe", subscribed - wanted), ("subscribe", wanted - subscribed)):
+                topics = [f"tickers.{s}" for s in sorted(symbols)]
+                for i in range(0, len(topics), SUBSCRIBE_BATCH):
+                    await ws.send(json.dumps({"op": op, "args": topics[i:i + SUBSCRIBE_BATCH]}))
+            subscribed = wanted
+
+    def _on_message(self, raw):
+        msg = json.loads(raw)
+        if not msg.get("topic", "").startswith("tickers."):
+            return
+        data = msg.get("data", {})
+        # deltas only carry changed fields
+        if data.get(PRICE_FIELD):
+            self.on_price(data.get("symbol") or msg["topic"][8:], float(data[PRICE_FIELD]), msg.get("ts"))
+
+    # --- notification side ---
+    def _send_loop(self):
+        while True:
+            batch = [self.events.get()]
+            while not self.events.empty():
+                batch.append(self.events.get_nowait())
+            try:
+                self.notify("\n".join(batch))
+            except Exception as e:
+                print(f"📡 Monitor notify error: {e}")
+
+    def report(self):
+        st = self.stats
+        filled = sum(1 for w in list(self.active.values()) if w["state"] == "filled")
+        lag = (f" | lag avg {st['lag_ms_sum'] / st['lagged']:.0f} ms, max {st['lag_ms_max']:.0f} ms"
+               if st["lagged"] else "")
+        return (f"📡 Monitor ({self.transport}): {len(self.active)} watched ({filled} filled) on "
+                f"{len(self.books)} symbols | {st['ticks']} ticks, slowest {st['tick_us_max']:.0f} µs | "
+                f"{st['fill']} fills, {st['tp']} TP, {st['sl']} SL, "
+                f"{st['missed'] + st['expired']} invalidated{lag}")
+
+# === MESSAGES ===
+def _pnl(w, price):
+    move = (price - w["fill"]) / w["fill"] * 100
+    return move if w["side"] == "LONG" else -move
+
+def format_event(action, w, price):
+    head = f"{w['symbol']} {w['side']}"
+    if action == "fill":
+        return f"🎯 {head} entry filled at {price} (trail {w['trail']}, TP {w['tp']}, SL {w['sl']})"
+    if action == "tp":
+        return f"✅ {head} TP hit at {price} ({_pnl(w, price):+.2f}%)"
+    if action == "sl":
+        return f"🛑 {head} SL hit at {price} ({_pnl(w, price):+.2f}%)"
+    if action == "missed":
+        return f"🚫 {head} invalidated: TP {w['tp']} reached before the entry filled"
+    return f"⌛ {head} invalidated: entry {w['trail']} not reached before expiry"
@@ -0,0 +1,36 @@
+# === Signal field access shared by both signal layouts ===
+# The multi-timeframe bots (signal_generator.py, bybitbot.py, ...) emit
+# 'Symbol' / 'Side' / 'TP' / 'Liq' keys, the list-based bots (binance-bot.py,
+# bybit-bot-v1..v4) emit 'symbol' / 'side' / 'tp' / 'liquidation'.
+
+ALIASES = {
+    "venue": ("venue", "Venue"),
+    "symbol": ("symbol", "Symbol"),
+    "side": ("side", "Side"),
+    "strategy": ("strategy", "Type"),
+    "timeframe": ("timeframe",),
+    "entry": ("entry", "Entry"),
+    "tp": ("tp", "TP"),
+    "sl": ("sl", "SL"),
+    "liquidation": ("liquidation", "Liq"),
+    "trail": ("trail", "Trail"),
+    "market": ("market", "Market"),
+    "score": ("score", "Score"),
+    "score_pct": ("score_pct", "Score Pct"),
+    "score_z": ("score_z", "Score Z"),
+    "position_size": ("position_size",),
+}
+
+def field(s, name, default=None):
+    for key in ALIASES.get(name, (name,)):
+        if key in s:
+            return s[key]
+    return default
+
+def set_field(s, name, value):
+    keys = ALIASES.get(name, (name,))
+    for key in keys:
+        if key in s:
+            s[key] = value
+            return
+    s[keys[0]] = value
@@ -1,12 +1,95 @@
-import requests
+# === Termux Low-Resource Profile ===
+# Phone-friendly build of binance-bot.py: stdlib HTTP with one keep-alive
+# connection per worker (2-4 workers), the bulk 24h ticker instead of
+# exchangeInfo, array-backed candles, trend klines fetched only for symbols
+# that already produced a setup, a small gzip response cache on disk and no
+# PDF unless --pdf is passed. Peak RSS and scan time are printed per run.
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from fpdf import FPDF
+from time import perf_counter, time
+
+import rolling
+from ranking import TopK
 
 # === CONFIG ===
 RISK_AMOUNT = 2
 LEVERAGE = 20
 TP_PERCENT = 0.25
 SL_PERCENT = 0.10
+MAX_SYMBOLS = 100
+MAX_CONNECTIONS = 3
+HOST = "fapi.binance.com"
+WRITE_PDF = "--pdf" in sys.argv
+
+CACHE_DIR = os.environ.get("TERMUX_BOT_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "termux-bot"))
+CACHE_MAX_BYTES = 4 * 1024 * 1024
+CACHE_TTL = {"15m": 60, "1h": 300, "4h": 900, "ticker": 300}
+
+RSS_BUDGET_MB = 50
+TIME_BUDGET_S = 60
+
+# === HTTP ===
+_local = threading.local()
+
+def _connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = http.client.HTTPSConnection(HOST, timeout=10)
+    return conn
+
+def http_get(path):
+    for attempt in range(2):
+        conn = _connection()
+        try:
+            conn.request("GET", path, headers={"Accept-Encoding": "gzip", "User-Agent": "termux-bot"})
+            res = conn.getresponse()
+            body = res.read()
+            if res.getheader("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            if res.status != 200:
+                raise RuntimeError(f"HTTP {res.status}: {body[:120]!r}")
+            return body
+        except (http.client.HTTPException, OSError):
+            # stale keep-alive socket: reconnect once
+            conn.close()
+            _local.conn = None
+            if attempt:
+                raise
+
+# === RESPONSE CACHE ===
+def cached_get(path, ttl):
+    fn = os.path.join(CACHE_DIR, hashlib.sha1(path.encode()).hexdigest()[:20] + ".json.gz")
+    try:
+        if time() - os.path.getmtime(fn) < ttl:
+            with gzip.open(fn, "rb") as f:
+                return json.loads(f.read())
+    except (OSError, ValueError):
+        pass
+    body = http_get(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with gzip.open(fn, "wb", compresslevel=3) as f:
+        f.write(body)
+    return json.loads(body)
+
+def prune_cache():
+    try:
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(CACHE_DIR)]
+    except FileNotFoundError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        os.remove(path)
+        total -= size
 
 # === INDICATORS ===
 def ema(values, period):
@@ -44,46 +127,28 @@ def calculate_macd(values, fast=12, slow=26, signal=9):
     return macd_line, signal_line, histogram
 
 def calculate_bollinger_bands(values, period=20, std_dev=2):
-    sma_vals = sma(values, period)
-    bands = []
-    for i in range(len(values)):
-        if i < period - 1:
-            bands.append((None, None, None))
-        else:
-            mean = sma_vals[i]
-            std = (sum((x - mean) ** 2 for x in values[i + 1 - period:i + 1]) / period) ** 0.5
-            upper = mean + std_dev * std
-            lower = mean - std_dev * std
-            bands.append((upper, mean, lower))
-    return bands
+    return rolling.bollinger_bands(values, period, std_dev)
 
 # === TREND ===
-def detect_market_trend(symbol):
-    def fetch_closes(symbol, tf):
-        url = f"https://fapi.binance.com/fapi/v1/klines?symbol={symbol}&interval={tf}&limit=60"
-        try:
-            r = requests.get(url, timeout=5)
-            return [float(x[4]) for x in r.json()]
-        except:
-            return []
-
-    trend_info = {}
-    for tf in ['1h', '4h', '15m']:
-        closes = fetch_closes(symbol, tf)
-        if len(closes) < 50:
-            trend_info[tf] = 'neutral'
-            continue
-        ema9 = ema(closes, 9)[-1]
-        ema21 = ema(closes, 21)[-1]
-        ma200 = sma(closes, 50)[-1]
-        close = closes[-1]
-
-        if close > ma200 and ema9 > ema21:
-            trend_info[tf] = 'bullish'
-        elif close < ma200 and ema9 < ema21:
-            trend_info[tf] = 'bearish'
-        else:
-            trend_info[tf] = 'neutral'
+def trend_of(closes):
+    if len(closes) < 50:
+        return 'neutral'
+    ema9 = ema(closes, 9)[-1]
+    ema21 = ema(closes, 21)[-1]
+    ma200 = sma(closes, 50)[-1]
+    close = closes[-1]
+    if close > ma200 and ema9 > ema21:
+        return 'bullish'
+    if close < ma200 and ema9 < ema21:
+        return 'bearish'
+    return 'neutral'
+
+def detect_market_trend(symbol, closes_1h):
+    # the 1h vote reuses the series analyze() already has
+    trend_info = {'1h': trend_of(closes_1h[-60:])}
+    for tf in ['4h', '15m']:
+        data = fetch_ohlcv(symbol, tf, limit=60)
+        trend_info[tf] = trend_of(data[2]) if data else 'neutral'
     return trend_info
 
 def is_trade_allowed(side, trend_info):
@@ -97,9 +162,8 @@ def is_trade_allowed(side, trend_info):
     return True
 
 # === SIGNAL SCORE ===
-def compute_score(s):
+def compute_score(s, trend_info):
     score = 0
-    trend_info = detect_market_trend(s['symbol'])
     bull = list(trend_info.values()).count('bullish')
     bear = list(trend_info.values()).count('bearish')
     score += 10 if bull == 3 or bear == 3 else 5 if bull == 2 or bear == 2 else 0
@@ -118,7 +182,7 @@ def compute_score(s):
     return round(score, 2)
 
 # === SIGNAL BUILDER ===
-def build_signal(name, condition, confidence, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes):
+def build_signal(name, condition, confidence, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike):
     if not condition:
         return None
     side = "long" if name != "Short Reversal" else "short"
@@ -148,20 +212,16 @@ def build_signal(name, condition, confidence, regime, trend_info, close, symbol,
         "forecast_pnl": forecast_pnl,
         "strategy": name,
         "timestamp": (datetime.now(timezone.utc) + timedelta(hours=3)).strftime("%Y-%m-%d %H:%M UTC+3"),
-        "vol_spike": volumes[-1] > sum(volumes[-20:]) / 20 * 1.5
+        "vol_spike": vol_spike
     }
-    signal["score"] = compute_score(signal)
+    signal["score"] = compute_score(signal, trend_info)
     return signal
 
 # === ANALYZE ===
 def analyze(symbol, tf="1h"):
     data = fetch_ohlcv(symbol, tf)
-    if len(data) < 60: return []
-    highs = [x[0] for x in data]
-    lows = [x[1] for x in data]
-    closes = [x[2] for x in data]
-    volumes = [x[3] for x in data]
-    open_prices = [x[4] for x in data]
+    if not data or len(data[2]) < 60: return []
+    highs, lows, closes, volumes = data
     close = closes[-1]
     ema9 = ema(closes, 9)
     ema21 = ema(closes, 21)
@@ -170,48 +230,58 @@ def analyze(symbol, tf="1h"):
     rsi = compute_rsi(closes)
     bb_upper, bb_mid, bb_lower = zip(*calculate_bollinger_bands(closes))
     macd_line, macd_signal, macd_hist = calculate_macd(closes)
-    trend_info = detect_market_trend(symbol)
+    vol_spike = volumes[-1] > sum(volumes[-20:]) / 20 * 1.5
 
     regime = "trend" if ma20[-1] > ma200[-1] else (
         "mean_reversion" if rsi < 35 or rsi > 65 else "scalp"
     )
 
-    signals = []
+    setups = []
     if regime == "trend":
-        sig = build_signal("Trend", ema9[-1] > ema21[-1], 90, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
-        if sig: signals.append(sig)
-
+        setups.append(("Trend", ema9[-1] > ema21[-1], 90, regime))
     if regime == "mean_reversion":
-        sig = build_signal("Mean-Reversion", rsi < 40 or close < ma20[-1], 85, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
-        if sig: signals.append(sig)
-
-    if regime == "scalp" and volumes[-1] > sum(volumes[-20:]) / 20 * 1.5:
-        sig = build_signal("Scalp Breakout", True, 80, regime, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
-        if sig: signals.append(sig)
-
+        setups.append(("Mean-Reversion", rsi < 40 or close < ma20[-1], 85, regime))
+    if regime == "scalp" and vol_spike:
+        setups.append(("Scalp Breakout", True, 80, regime))
     if rsi > 65 and close > bb_upper[-1]:
-        sig = build_signal("Short Reversal", True, 75, "reversal", trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, volumes)
-        if sig: signals.append(sig)
+        setups.append(("Short Reversal", True, 75, "reversal"))
+    setups = [x for x in setups if x[1]]
+    if not setups:
+        return []
 
+    # the two extra trend requests are only spent on symbols with a setup
+    trend_info = detect_market_trend(symbol, closes)
+    signals = []
+    for name, condition, confidence, reg in setups:
+        sig = build_signal(name, condition, confidence, reg, trend_info, close, symbol, tf, rsi, macd_hist, bb_upper, bb_lower, vol_spike)
+        if sig: signals.append(sig)
     return signals
 
 # === SYMBOLS ===
 def fetch_ohlcv(symbol, interval='1h', limit=100):
-    url = f"https://fapi.binance.com/fapi/v1/klines?symbol={symbol}&interval={interval}&limit={limit}"
     try:
-        r = requests.get(url, timeout=5)
-        return [[float(x[2]), float(x[3]), float(x[4]), float(x[5]), float(x[1])] for x in r.json()]
+        rows = cached_get(f"/fapi/v1/klines?symbol={symbol}&interval={interval}&limit={limit}", CACHE_TTL[interval])
     except Exception as e:
         print(f"[ERROR] {symbol}: {e}")
-        return []
-
-def get_symbols(limit=100):
+        return None
+    # four flat C-double columns instead of a list of 5-float lists per bar
+    highs, lows, closes, volumes = array('d'), array('d'), array('d'), array('d')
+    for x in rows:
+        highs.append(float(x[2]))
+        lows.append(float(x[3]))
+        closes.append(float(x[4]))
+        volumes.append(float(x[5]))
+    return highs, lows, closes, volumes
+
+def get_symbols(limit=MAX_SYMBOLS):
     try:
-        r = requests.get("https://fapi.binance.com/fapi/v1/exchangeInfo", timeout=5)
-        return [s['symbol'] for s in r.json()['symbols'] if s['contractType'] == 'PERPETUAL' and 'USDT' in s['symbol']][:limit]
+        data = cached_get("/fapi/v1/ticker/24hr", CACHE_TTL["ticker"])
     except Exception as e:
         print(f"[ERROR] Symbols: {e}")
         return []
+    tickers = [t for t in data if t['symbol'].endswith('USDT')]
+    tickers.sort(key=lambda t: float(t['quoteVolume']), reverse=True)
+    return [t['symbol'] for t in tickers[:limit]]
 
 # === DISPLAY ===
 def score_label(score):
@@ -239,7 +309,19 @@ def format_signal(s, i=None):
 
 # === PDF EXPORT ===
 
+def save_text(all_signals, top5, filename="top_signals.txt"):
+    with open(filename, "w") as f:
+        f.write("Top 5 Signals\n\n")
+        for i, s in enumerate(top5, 1):
+            f.write(format_signal(s, i) + "\n\n")
+        f.write("All Signals\n\n")
+        for i, s in enumerate(all_signals, 1):
+            f.write(format_signal(s, i) + "\n\n")
+    print(f"✅ Report saved as '{filename}'")
+
 def save_pdf(all_signals, top5):
+    from fpdf import FPDF  # only paid for when --pdf is given
+
     pdf = FPDF()
 
     # First page - Top 5 Signals
@@ -265,25 +347,49 @@ def save_pdf(all_signals, top5):
     pdf.output("top_signals.pdf")
     print("✅ PDF saved successfully as 'top_signals.pdf'")
 
+# === RESOURCES ===
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux / Android
+
+def report_resources(n_symbols, elapsed):
+    rss = peak_rss_mb()
+    ok = elapsed <= TIME_BUDGET_S and (rss is None or rss <= RSS_BUDGET_MB)
+    rss_txt = f"{rss:.1f} MB" if rss is not None else "n/a"
+    print(f"{'✅' if ok else '⚠️'} {n_symbols} symbols in {elapsed:.1f}s | peak RSS {rss_txt} "
+          f"(budget {RSS_BUDGET_MB} MB / {TIME_BUDGET_S}s)")
+
 # === MAIN ===
 def main():
-    print("📊 Scanning Binance Futures Signals...\n")
+    started = perf_counter()
+    print("📊 Scanning Binance Futures Signals (low-resource mode)...\n")
+    symbols = get_symbols()
+    ranker = TopK(20, key=lambda x: (x['score'], x['forecast_pnl']),
+                  accept=lambda s: s['rsi'] > 45 and s['regime'] in ['trend', 'scalp', 'mean_reversion'])
     all_signals = []
-    for symbol in get_symbols():
-        all_signals.extend(analyze(symbol))
+    with ThreadPoolExecutor(MAX_CONNECTIONS) as pool:
+        for signals in pool.map(analyze, symbols):
+            for s in signals:
+                ranker.push(s)
+                all_signals.append(s)
 
     if not all_signals:
         print("❌ No signals found.")
-        return
-
-    filtered = [s for s in all_signals if s['rsi'] > 45 and s['regime'] in ['trend', 'scalp', 'mean_reversion']]
-    top5 = sorted(filtered, key=lambda x: (x['score'], x['forecast_pnl']), reverse=True)[:5]
-
-    for i, s in enumerate(top5, 1):
-        print(format_signal(s, i))
-        print()
+    else:
+        top5 = ranker.top(5)
+        for i, s in enumerate(top5, 1):
+            print(format_signal(s, i))
+            print()
+        if WRITE_PDF:
+            save_pdf(all_signals, top5)
+        else:
+            save_text(all_signals, top5)
 
-    save_pdf(all_signals, top5)
+    prune_cache()
+    report_resources(len(symbols), perf_counter() - started)
 
 if __name__ == "__main__":
     main()
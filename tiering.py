@@ -0,0 +1,109 @@
+# === Priority-tiered Symbol Refresh ===
+# Spreads a fixed per-cycle request budget over a much larger universe.
+# Symbols are ranked by volatility (ATR%, or the 24h range from the bulk
+# tickers call until a real ATR is observed), by 24h turnover and by whether
+# they signalled recently. Hot symbols are analyzed every candle, warm ones
+# every WARM_EVERY cycles and cold ones as often as the leftover budget
+# allows, most overdue first. Symbols skipped this cycle keep their cached
+# result for up to one warm period so they still take part in ranking; older
+# results (cold symbols) are dropped rather than re-sent as fresh. A cycle
+# whose tickers call failed (empty list) keeps the previous ordering; only a
+# successful response prunes symbols that are no longer listed.
+from math import ceil
+
+BUDGET = 100          # symbols analyzed per cycle, same as the old MAX_SYMBOLS
+HOT = 40
+WARM = 80
+WARM_EVERY = 2
+SIGNAL_MEMORY = 8     # cycles a fresh signal keeps its symbol in the hot tier
+W_ATR = 0.5
+W_TURNOVER = 0.5
+
+def _pct_ranks(values):
+    # 0..1 percentile rank per key, ties share the lower rank
+    order = sorted(values, key=values.get)
+    n = max(len(order) - 1, 1)
+    return {k: i / n for i, k in enumerate(order)}
+
+class SymbolTiers:
+    def __init__(self, budget=BUDGET, hot=HOT, warm=WARM, warm_every=WARM_EVERY, signal_memory=SIGNAL_MEMORY):
+        self.budget = budget
+        self.hot = hot
+        self.warm = warm
+        self.warm_every = warm_every
+        self.signal_memory = signal_memory
+        self.cycle = 0
+        self.atr_pct = {}
+        self.last_scan = {}
+        self.last_signal = {}
+        self.cache = {}
+        self.ordered = []
+        self.stats = {"universe": 0, "scanned": 0, "hot": 0, "warm": 0, "cold": 0, "cold_every": 1}
+
+    def observe_atr(self, symbol, atr_pct):
+        self.atr_pct[symbol] = atr_pct
+
+    # === RANKING ===
+    def priority(self, tickers):
+        # tickers: [{'symbol', 'turnover', 'range_pct'}] from the bulk tickers call
+        vol = {t['symbol']: self.atr_pct.get(t['symbol'], t['range_pct']) for t in tickers}
+        turn = {t['symbol']: t['turnover'] for t in tickers}
+        vol_rank, turn_rank = _pct_ranks(vol), _pct_ranks(turn)
+        prio = {}
+        for sym in vol:
+            p = W_ATR * vol_rank[sym] + W_TURNOVER * turn_rank[sym]
+            if self.cycle - self.last_signal.get(sym, -10 ** 9) <= self.signal_memory:
+                p += 1  # recent signallers outrank everything else
+            prio[sym] = p
+        return sorted(prio, key=prio.get, reverse=True)
+
+    # === PLAN ONE CYCLE ===
+    def plan(self, tickers):
+        self.cycle += 1
+        if tickers:
+            ordered = self.ordered = self.priority(tickers)
+            listed = set(ordered)
+            # delisted symbols drop out of every per-symbol map, so a long run stays bounded
+            for name in ("cache", "last_scan", "last_signal", "atr_pct"):
+                setattr(self, name, {k: v for k, v in getattr(self, name).items() if k in listed})
+        else:
+            # failed tickers call: keep the last ordering and every symbol's state
+            ordered = self.ordered
+        hot = ordered[:self.hot]
+        warm = ordered[self.hot:self.hot + self.warm]
+        cold = ordered[self.hot + self.warm:]
+
+        slots = max(self.budget - len(hot), 0)
+        cold_slots = max(slots - ceil(len(warm) / self.warm_every), 1)
+        cold_every = max(1, ceil(len(cold) / cold_slots))
+
+        def overdue(sym, every):
+            return (self.cycle - self.last_scan.get(sym, -10 ** 9)) / every
+
+        rest = [(overdue(s, self.warm_every), s) for s in warm] + [(overdue(s, cold_every), s) for s in cold]
+        rest = [x for x in rest if x[0] >= 1]
+        rest.sort(key=lambda x: -x[0])  # stable: equal lateness keeps priority order
+        due = hot + [s for _, s in rest[:slots]]
+
+        self.stats.update(universe=len(ordered), scanned=len(due), hot=len(hot),
+                          warm=len(warm), cold=len(cold), cold_every=cold_every)
+        return due
+
+    def record(self, symbol, result):
+        self.last_scan[symbol] = self.cycle
+        self.cache[symbol] = result
+        if result:
+            self.last_signal[symbol] = self.cycle
+
+    def cached(self, max_age=None):
+        # last known result of every symbol not refreshed this cycle, at most max_age cycles old
+        max_age = self.warm_every if max_age is None else max_age
+        return [r for sym, r in self.cache.items()
+                if r and 0 < self.cycle - self.last_scan.get(sym, self.cycle) <= max_age]
+
+    def report(self):
+        st = self.stats
+        return (
+            f"🎚️ Tiers: hot {st['hot']} (every cycle), warm {st['warm']} (every {self.warm_every}), "
+            f"cold {st['cold']} (every ~{st['cold_every']}) | analyzed {st['scanned']}/{st['universe']} symbols"
+        )
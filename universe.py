@@ -0,0 +1,141 @@
+# === Symbol Universe ===
+# The one-shot bots used to download the venue's whole instrument list on
+# every run (Binance exchangeInfo alone is several megabytes, Bybit's
+# instruments-info only its first page) and scan it in listing order. The
+# instrument metadata is kept on disk instead, per venue:
+#   instruments   {symbol: tick, step, min_qty, min_notional, type, status,
+#                 quote}, refreshed after UNIVERSE_TTL (6h). Bybit is read
+#                 over every cursor page; Binance is asked with If-None-Match
+#                 so an unchanged exchangeInfo comes back as an empty 304.
+#   turnover      symbol order from the bulk 24h tickers call (Bybit
+#                 turnover24h, Binance quoteVolume), refreshed after
+#                 UNIVERSE_TURNOVER_TTL (15 min)
+#   changes       listings / delistings seen between two refreshes, the last
+#                 CHANGES_KEPT of them, also printed when they happen
+# A failed refresh falls back to the stale copy.
+#   symbols = Universe("binance")
+#   symbols.ranked(100)   trading USDT perpetuals, highest turnover first
+import json
+import os
+from time import time
+
+from exchanges import VENUES
+
+CACHE_FILE = os.environ.get("UNIVERSE_CACHE", "universe_cache.json")
+UNIVERSE_TTL = int(os.environ.get("UNIVERSE_TTL", str(6 * 3600)))
+TURNOVER_TTL = int(os.environ.get("UNIVERSE_TURNOVER_TTL", "900"))
+CHANGES_KEPT = 50
+PERPETUAL = ("LinearPerpetual", "PERPETUAL")
+TRADING = ("Trading", "TRADING")
+VENUE_NAMES = {"bybit": "Bybit", "binance": "Binance"}
+
+def _load(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[UNIVERSE] could not read {path}: {e}")
+        return {}
+
+def _save(path, state):
+    if not path:
+        return
+    try:
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"[UNIVERSE] could not write {path}: {e}")
+
+def _names(symbols, shown=10):
+    more = f" (+{len(symbols) - shown} more)" if len(symbols) > shown else ""
+    return (", ".join(symbols[:shown]) or "-") + more
+
+def tradable(meta):
+    return meta.get("type") in PERPETUAL and meta.get("status") in TRADING and meta.get("quote") == "USDT"
+
+class Universe:
+    def __init__(self, venue, path=CACHE_FILE, ttl=UNIVERSE_TTL, turnover_ttl=TURNOVER_TTL, session=None):
+        self.venue = VENUE_NAMES.get(venue.lower(), venue)
+        self.path = path
+        self.ttl = ttl
+        self.turnover_ttl = turnover_ttl
+        self.session = session
+        self.state = _load(path).get(self.venue, {})
+        self.stats = {"refreshed": 0, "not_modified": 0, "hits": 0, "stale": 0, "listed": 0, "delisted": 0}
+
+    def save(self):
+        data = _load(self.path)
+        data[self.venue] = self.state
+        _save(self.path, data)
+
+    # === INSTRUMENTS ===
+    def instruments(self, now=None):
+        now = now or time()
+        entry = self.state.get("instruments")
+        if entry and now - entry["fetched"] < self.ttl:
+            self.stats["hits"] += 1
+            return entry["symbols"]
+        try:
+            symbols, etag = VENUES[self.venue]["instruments"](self.session, entry and entry.get("etag"))
+        except Exception as e:
+            if entry:
+                self.stats["stale"] += 1
+                print(f"[UNIVERSE] {self.venue}: {e}, using the instruments from {int(now - entry['fetched'])}s ago")
+                return entry["symbols"]
+            raise
+        if symbols is None:
+            entry["fetched"] = now
+            self.stats["not_modified"] += 1
+        else:
+            if entry:
+                self._diff(entry["symbols"], symbols, now)
+            entry = self.state["instruments"] = {"fetched": now, "etag": etag, "symbols": symbols}
+            self.stats["refreshed"] += 1
+        self.save()
+        return entry["symbols"]
+
+    def _diff(self, old, new, now):
+        # a contract leaving Trading (settling, delivering) counts as a delisting
+        before = {s for s, m in old.items() if tradable(m)}
+        after = {s for s, m in new.items() if tradable(m)}
+        listed, delisted = sorted(after - before), sorted(before - after)
+        if not listed and not delisted:
+            return
+        self.stats["listed"] += len(listed)
+        self.stats["delisted"] += len(delisted)
+        changes = self.state.get("changes", []) + [{"time": int(now), "listed": listed, "delisted": delisted}]
+        self.state["changes"] = changes[-CHANGES_KEPT:]
+        print(f"🆕 [UNIVERSE] {self.venue}: listed {_names(listed)} | delisted {_names(delisted)}")
+
+    def changes(self):
+        return self.state.get("changes", [])
+
+    # === RANKING ===
+    def ranked(self, limit=None, now=None):
+        now = now or time()
+        instruments = self.instruments(now)
+        entry = self.state.get("turnover")
+        if not entry or now - entry["fetched"] >= self.turnover_ttl:
+            try:
+                entry = self.state["turnover"] = {"fetched": now,
+                                                  "order": VENUES[self.venue]["universe"](self.session, None)}
+                self.save()
+            except Exception as e:
+                print(f"[UNIVERSE] {self.venue} turnover: {e}")
+                if not entry:
+                    entry = {"order": []}
+        ranked = [s for s in entry["order"] if s in instruments and tradable(instruments[s])]
+        # contracts the ticker call has not seen yet (fresh listings) go last, in listing order
+        seen = set(ranked)
+        ranked += [s for s, m in instruments.items() if s not in seen and tradable(m)]
+        return ranked[:limit]
+
+    def report(self):
+        st = self.stats
+        n = len((self.state.get("instruments") or {}).get("symbols", {}))
+        return (f"🪐 Universe: {self.venue} {n} instruments | {st['refreshed']} refresh(es), "
+                f"{st['not_modified']} not modified, {st['hits']} cache hit(s), {st['stale']} stale | "
+                f"+{st['listed']} listed, -{st['delisted']} delisted")